@@ -42,6 +42,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'website.middleware.request_timing_middleware.RequestTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -118,6 +119,32 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# Uploaded product and comparison images
+MEDIA_URL = 'media/'
+MEDIA_ROOT = BASE_DIR / 'media'
+
+# Uploads are stored under content-hashed names (website.storages.content_addressed_storage),
+# so identical files are stored once and a stored file never changes
+STORAGES = {
+    'default': {
+        'BACKEND': 'website.storages.content_addressed_storage.ContentAddressedStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+}
+# Cache-Control sent with content-addressed media files
+MEDIA_IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+# Cache-Control of other media files (revalidated with their ETag)
+MEDIA_CACHE_CONTROL = 'no-cache'
+# Hand media transfers to the front server (website.views.media_view):
+# None (Django streams the file), 'x-sendfile' (Apache / lighttpd) or 'x-accel-redirect' (nginx)
+MEDIA_SENDFILE = None
+# nginx internal location aliasing MEDIA_ROOT, used with 'x-accel-redirect'
+MEDIA_ACCEL_REDIRECT_LOCATION = '/protected-media/'
+# Unreferenced media files younger than this are kept by collect_media_garbage
+MEDIA_GC_GRACE_HOURS = 24
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -134,3 +161,134 @@ DEFAULT_FROM_EMAIL = 'info@rainy.com.co'
 
 # Email settings for notifications
 CONTACT_EMAIL_RECIPIENT = 'info@rainy.com.co'
+
+# Cache configuration
+# The catalog version and payloads live here; use a shared backend (Redis,
+# Memcached) in production so every worker sees the same catalog version.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'rainy-default',
+    }
+}
+
+# Seconds a rendered catalog version stays cached
+CATALOG_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Static catalog snapshots (python manage.py export_catalog_snapshot)
+# current.json (+ .gz/.br) in this directory can be served directly by nginx or a CDN
+CATALOG_SNAPSHOT_ROOT = BASE_DIR / 'catalog_snapshots'
+# Scheme and host used to build absolute image URLs in the snapshot
+CATALOG_SNAPSHOT_BASE_URL = 'http://localhost:8000'
+# Number of snapshot versions kept on disk
+CATALOG_SNAPSHOT_KEEP = 5
+# Republish the snapshot after every catalog change
+CATALOG_SNAPSHOT_AUTO_PUBLISH = False
+
+# Catalog serialization engine: 'fast' builds the payload from values() rows,
+# 'drf' uses ProductSerializer / ProductSeriesComparisonImageSerializer.
+# Both produce identical JSON.
+CATALOG_SERIALIZER_ENGINE = 'fast'
+
+# Django REST Framework
+# FastJSONRenderer uses orjson when installed (pip install orjson) and falls
+# back to the stdlib json module otherwise.
+REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': [
+        'website.renderers.fast_json_renderer.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+}
+
+# JSON bodies at least this large are precompressed (gzip, and brotli when installed)
+API_COMPRESSION_MIN_SIZE = 1024
+
+# Products API keyset pagination (?limit=&cursor=)
+PRODUCTS_PAGE_SIZE = 20
+PRODUCTS_MAX_PAGE_SIZE = 100
+
+# Incremental catalog sync (/api/products/?since_version=)
+# Deletion tombstones are kept this long; older clients get a full resync
+CATALOG_TOMBSTONE_RETENTION_DAYS = 30
+# Changes this close before the requested sync point are sent again
+CATALOG_SYNC_OVERLAP_SECONDS = 5
+
+# Filter sizing recommender (/api/products/recommend/?area=&intensity=)
+# Specification types holding each product's rated capacity
+RECOMMENDER_SPEC_NAMES = {
+    'area': 'Área máxima de la cubierta',
+    'intensity': 'Máxima Intensidad de la lluvia',
+    'flow': 'Caudal máximo',
+}
+# Rain intensity (mm/h) assumed when the request does not give one
+RECOMMENDER_DEFAULT_INTENSITY = 75
+RECOMMENDER_MAX_RESULTS = 5
+
+# Most products /api/products/compare/?slugs= accepts in one request
+COMPARE_MAX_PRODUCTS = 10
+
+# Responsive image variants (website.services.image_variants)
+IMAGE_VARIANT_WIDTHS = (320, 640, 960, 1280, 1920)
+# Preferred first; formats the installed Pillow cannot encode are skipped
+IMAGE_VARIANT_FORMATS = ('avif', 'webp', 'jpeg')
+IMAGE_VARIANT_QUALITY = {'avif': 50, 'webp': 75, 'jpeg': 80}
+# Also encode the variants right after an image is saved, in the saving request
+# (its size, placeholder and colour are always filled in then). Off by default:
+# encoding every width and format of a large upload takes seconds of CPU, so run
+# generate_image_variants from cron or a worker instead
+IMAGE_VARIANTS_ON_SAVE = False
+# Larger images (width x height) are not decoded and get no variants
+IMAGE_VARIANT_MAX_PIXELS = 40_000_000
+
+# Request instrumentation (website.middleware.request_timing_middleware)
+# Fraction of requests timed in detail (Server-Timing header, JSON log line)
+REQUEST_TIMING_SAMPLE_RATE = 0.01
+# Requests at least this slow are logged as warnings with their queries, sampled or not
+REQUEST_TIMING_SLOW_MS = 500
+# Who gets the Server-Timing header of sampled requests: 'staff' (staff users,
+# everyone when DEBUG), True (everyone) or False (nobody)
+REQUEST_TIMING_SERVER_TIMING = 'staff'
+
+# Budgets enforced by python manage.py benchmark_api. Query counts must not
+# grow with the catalog; the latency budget is base_ms + per_product_ms * size
+API_BENCHMARK_BUDGETS = {
+    'products_list_cold': {'queries': 3, 'base_ms': 100, 'per_product_ms': 0.5},
+    'products_list_warm': {'queries': 0, 'base_ms': 25, 'per_product_ms': 0.05},
+    'products_list_drf': {'queries': 5, 'base_ms': 200, 'per_product_ms': 1.5},
+    'products_page': {'queries': 1, 'base_ms': 50, 'per_product_ms': 0.05},
+    'new_contact': {'queries': 4, 'base_ms': 50, 'per_product_ms': 0},
+}
+
+# Rows per INSERT ... ON CONFLICT statement in python manage.py import_catalog
+CATALOG_IMPORT_BATCH_SIZE = 500
+
+# Contact notification outbox (python manage.py send_contact_notifications)
+CONTACT_NOTIFICATION_BATCH_SIZE = 50
+CONTACT_NOTIFICATION_MAX_ATTEMPTS = 5
+# Retries wait base * 2 ** (attempt - 1) seconds
+CONTACT_NOTIFICATION_RETRY_BASE_SECONDS = 60
+# How long a claimed notification is hidden from other workers
+CONTACT_NOTIFICATION_LEASE_SECONDS = 300
+# Wait until the oldest pending notification is this old (or a full batch is
+# due) before sending, so bursts share one SMTP session; 0 sends immediately
+CONTACT_NOTIFICATION_BATCH_WINDOW_SECONDS = 0
+# 'individual' (one e-mail per contact) or 'digest' (one e-mail per batch)
+CONTACT_NOTIFICATION_DELIVERY = 'individual'
+# The worker logs a warning when the oldest pending notification is older than
+# this; contact stats also report the backlog so a stopped worker is noticed
+CONTACT_NOTIFICATION_BACKLOG_WARNING_SECONDS = 3600
+
+# Contact endpoint token buckets: (burst capacity, seconds to refill it)
+CONTACT_THROTTLE_RATES = {
+    'ip': (5, 600),
+    'email': (3, 3600),
+}
+# Identical (email, message) resubmits within this window are dropped
+CONTACT_DUPLICATE_WINDOW_SECONDS = 600
+# Rows fetched per database round trip by the streaming contact export
+CONTACT_EXPORT_CHUNK_SIZE = 2000
+
+# Contact retention (python manage.py archive_contacts)
+CONTACT_RETENTION_MONTHS = 24
+CONTACT_ARCHIVE_BATCH_SIZE = 1000
+CONTACT_ARCHIVE_ROOT = BASE_DIR / 'contact_archives'
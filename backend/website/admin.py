@@ -1,6 +1,8 @@
 from django.contrib import admin
 from django.utils.translation import gettext_lazy as _
 from .models.contact_model import Contact
+from .models.contact_notification_model import ContactNotification
+from .models.contact_archive_model import ContactArchive
 from .models.product_model import Product
 from .models.product_specification_model import ProductSpecification
 from .models.specification_type_model import SpecificationType
@@ -17,6 +19,32 @@ class ContactAdmin(admin.ModelAdmin):
     readonly_fields = ('created_at',)
     ordering = ('-created_at',)
 
+class ContactNotificationAdmin(admin.ModelAdmin):
+    """
+    Custom admin configuration for the ContactNotification outbox.
+    Shows the delivery state and the last error of each notification.
+    """
+    list_display = ('contact', 'status', 'attempts', 'next_attempt_at', 'sent_at')
+    list_filter = ('status',)
+    search_fields = ('contact__email', 'last_error')
+    readonly_fields = ('contact', 'attempts', 'last_error', 'created_at', 'sent_at')
+    list_select_related = ('contact',)
+
+class ContactArchiveAdmin(admin.ModelAdmin):
+    """
+    Read-only admin for contacts moved out by the archive_contacts command.
+    """
+    list_display = ('name', 'email', 'phone', 'created_at', 'archived_at')
+    list_filter = ('created_at',)
+    search_fields = ('name', 'email', 'message')
+    ordering = ('-created_at',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
 class ProductSpecificationInline(admin.TabularInline):
     """
     Inline admin for ProductSpecification to be shown in Product admin.
@@ -100,7 +128,7 @@ class RainyProjectAdminSite(admin.AdminSite):
                 'app_label': 'contact_management',
                 'models': [
                     model for model in app_dict.get('website', {}).get('models', [])
-                    if model['object_name'] == 'Contact'
+                    if model['object_name'] in ['Contact', 'ContactNotification', 'ContactArchive']
                 ]
             },
             {
@@ -126,6 +154,8 @@ admin_site = RainyProjectAdminSite(name='rainyadmin')
 
 # Register models with custom admin site
 admin_site.register(Contact, ContactAdmin)
+admin_site.register(ContactNotification, ContactNotificationAdmin)
+admin_site.register(ContactArchive, ContactArchiveAdmin)
 admin_site.register(Product, ProductAdmin)
 admin_site.register(ProductSpecification, ProductSpecificationAdmin)
 admin_site.register(SpecificationType, SpecificationTypeAdmin)
@@ -133,6 +163,8 @@ admin_site.register(ProductSeriesComparisonImage, ProductSeriesComparisonImageAd
 
 # Also register with default admin site for compatibility
 admin.site.register(Contact, ContactAdmin)
+admin.site.register(ContactNotification, ContactNotificationAdmin)
+admin.site.register(ContactArchive, ContactArchiveAdmin)
 admin.site.register(Product, ProductAdmin)
 admin.site.register(ProductSpecification, ProductSpecificationAdmin)
 admin.site.register(SpecificationType, SpecificationTypeAdmin)
@@ -5,3 +5,7 @@ class WebsiteConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'website'
     verbose_name = 'Gestión del Sitio Web'  # Spanish name for the admin
+
+    def ready(self):
+        # Connect the catalog cache invalidation signals
+        from website import signals  # noqa: F401
@@ -0,0 +1,49 @@
+import os
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from website.services.contact_retention import (
+    ARCHIVE_DESTINATIONS,
+    archive_contacts,
+    default_archive_path,
+    get_archivable_contacts,
+    retention_cutoff,
+)
+
+class Command(BaseCommand):
+    help = (
+        'Move contact submissions older than the retention period into the ContactArchive table '
+        'or a gzip-compressed JSONL file, in batches, to keep the Contact table small'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--months', type=int, default=settings.CONTACT_RETENTION_MONTHS,
+                            help='Keep submissions from the last N months in the Contact table')
+        parser.add_argument('--to', choices=ARCHIVE_DESTINATIONS, default='table', dest='destination',
+                            help='Archive into the ContactArchive table or a .jsonl.gz file')
+        parser.add_argument('--output', help='Archive file for --to file (default: contacts-<cutoff month>.jsonl.gz '
+                                              'in CONTACT_ARCHIVE_ROOT, appended to by every run that month)')
+        parser.add_argument('--batch-size', type=int, default=settings.CONTACT_ARCHIVE_BATCH_SIZE,
+                            help='Submissions moved per transaction')
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many submissions would be moved')
+
+    def handle(self, *args, **options):
+        cutoff = retention_cutoff(options['months'])
+        if options['dry_run']:
+            count = get_archivable_contacts(cutoff).count()
+            self.stdout.write(f'{count} submissions created before {cutoff:%Y-%m-%d %H:%M} would be archived')
+            return
+
+        path = None
+        if options['destination'] == 'file':
+            path = options['output']
+            if not path:
+                os.makedirs(settings.CONTACT_ARCHIVE_ROOT, exist_ok=True)
+                path = default_archive_path(cutoff)
+
+        result = archive_contacts(cutoff, options['destination'], path, options['batch_size'])
+
+        target = path or 'the ContactArchive table'
+        self.stdout.write(self.style.SUCCESS(
+            f"Archived {result['rows']} submissions created before {cutoff:%Y-%m-%d %H:%M} "
+            f"into {target} in {result['batches']} batches ({result['seconds']:.2f} s)"
+        ))
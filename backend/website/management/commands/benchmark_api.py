@@ -0,0 +1,173 @@
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+import django
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+from website.services.synthetic_catalog import generate_synthetic_catalog
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _products_list_cold(client, iteration):
+    cache.clear()
+    return client.get('/api/products/')
+
+
+def _products_list_warm(client, iteration):
+    return client.get('/api/products/')
+
+
+def _products_list_drf(client, iteration):
+    cache.clear()
+    with override_settings(CATALOG_SERIALIZER_ENGINE='drf'):
+        return client.get('/api/products/')
+
+
+def _products_page(client, iteration):
+    return client.get('/api/products/', {'limit': 20, 'expand': 'specifications'})
+
+
+def _new_contact(client, iteration):
+    return client.post('/api/contact/', {
+        'name': 'Benchmark',
+        'email': f'benchmark{iteration}@example.com',
+        'message': f'Mensaje de prueba {iteration}',
+    })
+
+
+# name -> request function(client, iteration) returning the response
+SCENARIOS = {
+    'products_list_cold': _products_list_cold,
+    'products_list_warm': _products_list_warm,
+    'products_list_drf': _products_list_drf,
+    'products_page': _products_page,
+    'new_contact': _new_contact,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark products_list and new_contact against synthetic catalogs of several sizes, '
+        'write the results to JSON and fail when API_BENCHMARK_BUDGETS is exceeded (nothing is kept in the database)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='10,100,1000', help='Comma separated catalog sizes (products)')
+        parser.add_argument('--spec-types', type=int, default=15, help='Specification types per product')
+        parser.add_argument('--iterations', type=int, default=5, help='Timed requests per scenario and size')
+        parser.add_argument('--output', default='api_benchmark.json', help='JSON file the results are written to')
+        parser.add_argument('--no-budgets', action='store_true', help='Only record the results, never fail')
+
+    def handle(self, *args, **options):
+        try:
+            sizes = sorted({int(size) for size in options['sizes'].split(',') if size.strip()})
+        except ValueError:
+            raise CommandError('--sizes must be a comma separated list of integers')
+
+        results = []
+        benchmark_settings = {
+            'ALLOWED_HOSTS': [*settings.ALLOWED_HOSTS, 'testserver'],
+            # Every benchmark contact comes from the same client
+            'CONTACT_THROTTLE_RATES': {scope: (10 ** 9, 1) for scope in settings.CONTACT_THROTTLE_RATES},
+        }
+        for size in sizes:
+            try:
+                with override_settings(**benchmark_settings), transaction.atomic():
+                    generate_synthetic_catalog(products=size, spec_types=options['spec_types'], comparison_images=3)
+                    for name, scenario in SCENARIOS.items():
+                        result = self.measure(scenario, options['iterations'])
+                        result.update(scenario=name, size=size)
+                        results.append(result)
+                        self.stdout.write(
+                            f"{name:>19} @ {size:>6}: {result['median_ms']:9.2f} ms median, {result['max_ms']:9.2f} ms max, "
+                            f"{result['queries']:3d} queries, {result['bytes']:>10} bytes, "
+                            f"{result['peak_memory'] / 1024:9.1f} KiB peak"
+                        )
+                    raise _Rollback
+            except _Rollback:
+                pass
+            cache.clear()
+
+        violations = [] if options['no_budgets'] else self.check_budgets(results)
+        report = {
+            'created_at': timezone.now().isoformat(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'spec_types': options['spec_types'],
+            'iterations': options['iterations'],
+            'budgets': settings.API_BENCHMARK_BUDGETS,
+            'results': results,
+            'violations': violations,
+        }
+        with open(options['output'], 'w', encoding='utf-8') as output:
+            json.dump(report, output, indent=2)
+        self.stdout.write(f"Results written to {options['output']}")
+
+        if violations:
+            raise CommandError('Benchmark budgets exceeded:\n  ' + '\n  '.join(violations))
+        self.stdout.write(self.style.SUCCESS('All benchmark budgets met'))
+
+    def measure(self, scenario, iterations):
+        """
+        Time `iterations` requests, count the queries of the slowest-path run
+        and measure peak Python memory in one extra, untimed run.
+        """
+        client = Client()
+        # Warm-up run, also used for the query count and the response size
+        with CaptureQueriesContext(connection) as queries:
+            response = scenario(client, 0)
+        if response.status_code >= 400:
+            raise CommandError(f'{scenario.__name__} returned HTTP {response.status_code}')
+        query_count = len(queries)
+
+        timings = []
+        for iteration in range(1, iterations + 1):
+            start = time.perf_counter()
+            with CaptureQueriesContext(connection) as queries:
+                scenario(client, iteration)
+            timings.append((time.perf_counter() - start) * 1000)
+            query_count = max(query_count, len(queries))
+
+        tracemalloc.start()
+        try:
+            scenario(client, iterations + 1)
+            peak_memory = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        return {
+            'median_ms': round(statistics.median(timings), 3),
+            'max_ms': round(max(timings), 3),
+            'queries': query_count,
+            'bytes': len(response.content),
+            'peak_memory': peak_memory,
+        }
+
+    def check_budgets(self, results):
+        """
+        Return a message for every result over its query or latency budget.
+        The latency budget grows linearly with the catalog size.
+        """
+        violations = []
+        for result in results:
+            budget = settings.API_BENCHMARK_BUDGETS.get(result['scenario'])
+            if budget is None:
+                continue
+            label = f"{result['scenario']} @ {result['size']} products"
+            if result['queries'] > budget['queries']:
+                violations.append(f"{label}: {result['queries']} queries (budget {budget['queries']})")
+            max_ms = budget['base_ms'] + budget['per_product_ms'] * result['size']
+            if result['median_ms'] > max_ms:
+                violations.append(f"{label}: {result['median_ms']:.1f} ms median (budget {max_ms:.1f} ms)")
+        return violations
@@ -0,0 +1,47 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.renderers import JSONRenderer
+from website.services.catalog_snapshot import build_catalog_request
+from website.views.product_view import build_catalog_data
+
+ENGINES = ('drf', 'fast')
+
+class Command(BaseCommand):
+    help = 'Compare the DRF and fast catalog serialization engines on the current database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20, help='Number of timed runs per engine')
+        parser.add_argument('--base-url', help='Scheme and host used for absolute image URLs (default: CATALOG_SNAPSHOT_BASE_URL)')
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        renderer = JSONRenderer()
+        request = build_catalog_request(options['base_url'] or settings.CATALOG_SNAPSHOT_BASE_URL)
+
+        outputs = {}
+        timings = {}
+        for engine in ENGINES:
+            # Warm-up run, also used for the query count and the parity check
+            with CaptureQueriesContext(connection) as queries:
+                outputs[engine] = renderer.render(build_catalog_data(request, engine=engine))
+
+            start = time.perf_counter()
+            for _ in range(iterations):
+                renderer.render(build_catalog_data(request, engine=engine))
+            timings[engine] = (time.perf_counter() - start) / iterations
+
+            self.stdout.write(
+                f'{engine:>4}: {timings[engine] * 1000:8.2f} ms/run, '
+                f'{len(queries)} queries, {len(outputs[engine])} bytes'
+            )
+
+        if outputs['drf'] != outputs['fast']:
+            # A non-zero exit, so a CI job running the benchmark fails on a parity regression
+            raise CommandError('Outputs differ between the drf and fast engines')
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Outputs identical; fast engine is {timings['drf'] / timings['fast']:.1f}x faster"
+        ))
@@ -0,0 +1,125 @@
+import socketserver
+import threading
+import time
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test.utils import override_settings
+from website.models.contact_model import Contact
+from website.models.contact_notification_model import ContactNotification
+from website.services.contact_notifications import build_contact_email, deliver_notifications
+
+
+class _SMTPSinkHandler(socketserver.StreamRequestHandler):
+    """
+    Minimal SMTP server session that accepts and discards every message,
+    optionally sleeping before each reply to imitate a remote server.
+    """
+
+    def reply(self, line):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        self.wfile.write(line.encode() + b'\r\n')
+
+    def handle(self):
+        self.server.connections += 1
+        self.reply('220 localhost benchmark sink')
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line[:4].upper()
+            if command == b'EHLO':
+                self.wfile.write(b'250-localhost\r\n')
+                self.reply('250 8BITMIME')
+            elif command == b'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                while self.rfile.readline() not in (b'.\r\n', b''):
+                    pass
+                self.server.messages += 1
+                self.reply('250 OK')
+            elif command == b'QUIT':
+                self.reply('221 Bye')
+                return
+            else:
+                self.reply('250 OK')
+
+
+class _SMTPSink(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, latency):
+        super().__init__(('127.0.0.1', 0), _SMTPSinkHandler)
+        self.latency = latency
+        self.connections = 0
+        self.messages = 0
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure contact notification throughput against a local SMTP stand-in: one connection '
+        'per e-mail versus the batched and digest delivery modes (nothing is kept in the database)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=200, help='Number of queued notifications per run')
+        parser.add_argument('--latency', type=float, default=5.0,
+                            help='Milliseconds the stand-in server waits before each reply')
+
+    def handle(self, *args, **options):
+        sink = _SMTPSink(options['latency'] / 1000)
+        threading.Thread(target=sink.serve_forever, daemon=True).start()
+        email_settings = {
+            'EMAIL_BACKEND': 'django.core.mail.backends.smtp.EmailBackend',
+            'EMAIL_HOST': '127.0.0.1',
+            'EMAIL_PORT': sink.server_address[1],
+            'EMAIL_USE_TLS': False,
+            'EMAIL_USE_SSL': False,
+            'EMAIL_HOST_USER': '',
+            'EMAIL_HOST_PASSWORD': '',
+        }
+        try:
+            with override_settings(**email_settings), transaction.atomic():
+                self.run_benchmark(sink, options['count'])
+                raise _Rollback
+        except _Rollback:
+            pass
+        finally:
+            sink.shutdown()
+            sink.server_close()
+
+    def run_benchmark(self, sink, count):
+        contacts = Contact.objects.bulk_create(
+            Contact(name=f'Benchmark {i}', email=f'benchmark{i}@example.com', message='Mensaje de prueba')
+            for i in range(count)
+        )
+        ContactNotification.objects.bulk_create(ContactNotification(contact=contact) for contact in contacts)
+
+        def per_message(notifications):
+            # What a request-time send_mail() did: a new SMTP session per e-mail
+            for notification in notifications:
+                build_contact_email(notification.contact, get_connection()).send()
+
+        runs = (
+            ('per-message', per_message),
+            ('batched', lambda notifications: deliver_notifications(notifications, 'individual')),
+            ('digest', lambda notifications: deliver_notifications(notifications, 'digest')),
+        )
+        for name, deliver in runs:
+            ContactNotification.objects.update(status=ContactNotification.PENDING, attempts=0)
+            notifications = list(ContactNotification.objects.select_related('contact'))
+            sink.connections = sink.messages = 0
+
+            start = time.perf_counter()
+            deliver(notifications)
+            elapsed = time.perf_counter() - start
+
+            self.stdout.write(
+                f'{name:>11}: {elapsed * 1000:9.1f} ms, {count / elapsed:8.1f} notifications/s, '
+                f'{sink.connections} connections, {sink.messages} messages'
+            )
@@ -0,0 +1,43 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from website.models.product_model import Product
+from website.services.specs_cache import find_stale_specs_caches, rebuild_specs_cache
+from website.signals import catalog_bulk_changed
+
+class Command(BaseCommand):
+    help = (
+        'Compare the denormalized Product.specs_cache column with the ProductSpecification rows '
+        'and report (or, with --fix, rebuild) the products that drifted'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fix', action='store_true', help='Rebuild the stale caches')
+        parser.add_argument('--rebuild-all', action='store_true', help='Rebuild the cache of every product')
+        parser.add_argument('--batch-size', type=int, default=settings.CATALOG_IMPORT_BATCH_SIZE,
+                            help='Products compared or rebuilt per query')
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        if options['rebuild_all']:
+            product_ids = list(Product.objects.values_list('pk', flat=True))
+            rebuild_specs_cache(product_ids, options['batch_size'], touch=True)
+            catalog_bulk_changed(product_ids)
+            self.stdout.write(self.style.SUCCESS(
+                f'Rebuilt the specifications cache of {len(product_ids)} products in {time.perf_counter() - start:.2f} s'
+            ))
+            return
+
+        stale = find_stale_specs_caches(options['batch_size'])
+        if not stale:
+            self.stdout.write(self.style.SUCCESS(
+                f'Specifications cache is consistent ({time.perf_counter() - start:.2f} s)'
+            ))
+            return
+
+        self.stdout.write(f"Stale specifications cache: product {', '.join(str(pk) for pk in stale)}")
+        if not options['fix']:
+            raise CommandError(f'{len(stale)} products have a stale specifications cache; run with --fix')
+        rebuild_specs_cache(stale, options['batch_size'], touch=True)
+        catalog_bulk_changed(stale)
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt the specifications cache of {len(stale)} products'))
@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from website.services.media_gc import collect_media_garbage
+
+class Command(BaseCommand):
+    help = (
+        'Delete product and comparison image files (including variants) that no Product or '
+        'ProductSeriesComparisonImage row references any more'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--grace-hours', type=float, default=settings.MEDIA_GC_GRACE_HOURS,
+                            help='Keep unreferenced files modified in the last N hours')
+        parser.add_argument('--dry-run', action='store_true', help='Only list the files that would be deleted')
+
+    def handle(self, *args, **options):
+        result = collect_media_garbage(options['grace_hours'], dry_run=options['dry_run'])
+        if options['dry_run']:
+            for name in result['names']:
+                self.stdout.write(name)
+
+        action = 'Would delete' if options['dry_run'] else 'Deleted'
+        self.stdout.write(self.style.SUCCESS(
+            f"{action} {result['deleted']} of {result['scanned']} files ({result['bytes'] / 1024:.1f} KiB), "
+            f"kept {result['recent']} recent unreferenced files ({result['seconds']:.2f} s)"
+        ))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from website.services.catalog_snapshot import publish_catalog_snapshot
+
+class Command(BaseCommand):
+    help = (
+        'Render the products API payload to a versioned JSON snapshot (plus .gz/.br) '
+        'and atomically point current.json at it, so the catalog can be served statically'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--publish-dir', help='Directory to publish to (default: CATALOG_SNAPSHOT_ROOT)')
+        parser.add_argument('--base-url', help='Scheme and host used for absolute image URLs (default: CATALOG_SNAPSHOT_BASE_URL)')
+        parser.add_argument('--keep', type=int, help='Number of snapshot versions to keep (default: CATALOG_SNAPSHOT_KEEP)')
+
+    def handle(self, *args, **options):
+        result = publish_catalog_snapshot(
+            publish_dir=options['publish_dir'],
+            base_url=options['base_url'],
+            keep=options['keep'],
+        )
+
+        self.stdout.write(f"Rendered catalog in {result['render_time'] * 1000:.1f} ms")
+        for suffix, size in result['sizes'].items():
+            self.stdout.write(f'  {suffix}: {size} bytes')
+        self.stdout.write(self.style.SUCCESS(f"Published catalog snapshot {result['version']} at {result['path']}"))
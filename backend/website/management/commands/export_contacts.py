@@ -0,0 +1,49 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.exceptions import ValidationError
+from website.services.contact_export import (
+    CONTACT_EXPORT_FORMATS,
+    get_export_queryset,
+    iter_contact_export,
+    parse_export_bound,
+)
+
+class Command(BaseCommand):
+    help = 'Stream contact form submissions, oldest first, as CSV or JSON lines'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=CONTACT_EXPORT_FORMATS, default='csv', dest='export_format',
+                            help='Output format')
+        parser.add_argument('--since', help='Only submissions created at or after this ISO 8601 date/datetime')
+        parser.add_argument('--until', help='Only submissions created before this ISO 8601 date/datetime')
+        parser.add_argument('--output', help='File to write to (default: standard output)')
+        parser.add_argument('--chunk-size', type=int, default=settings.CONTACT_EXPORT_CHUNK_SIZE,
+                            help='Rows fetched from the database per round trip')
+
+    def handle(self, *args, **options):
+        try:
+            since = parse_export_bound('since', options['since'])
+            until = parse_export_bound('until', options['until'])
+        except ValidationError as error:
+            raise CommandError(error.detail)
+
+        stats = {}
+        lines = iter_contact_export(
+            get_export_queryset(since, until),
+            options['export_format'],
+            chunk_size=options['chunk_size'],
+            stats=stats,
+        )
+        if options['output']:
+            newline = '' if options['export_format'] == 'csv' else None
+            with open(options['output'], 'w', encoding='utf-8', newline=newline) as output:
+                output.writelines(lines)
+        else:
+            for line in lines:
+                self.stdout.write(line, ending='')
+
+        # Keep the report off stdout so it does not end up in the export
+        self.stderr.write(
+            f"Exported {stats['rows']} contacts in {stats['seconds']:.2f} s ({stats['rows_per_second']:.0f} rows/s)",
+            style_func=self.style.SUCCESS,
+        )
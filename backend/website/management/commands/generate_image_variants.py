@@ -0,0 +1,27 @@
+import time
+from django.core.management.base import BaseCommand
+from website.services.image_variants import IMAGE_VARIANT_FIELDS, image_metadata_columns, refresh_instance_variants
+
+class Command(BaseCommand):
+    help = (
+        'Create the resized AVIF/WebP/JPEG variants, stored dimensions, inline placeholder and dominant '
+        'colour of product and comparison images that do not have them yet (use --force to rebuild all)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Regenerate the derived data of every image')
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        updated = 0
+        for model, fields in IMAGE_VARIANT_FIELDS.items():
+            columns = ['pk', 'updated_at', *fields, *image_metadata_columns(model)]
+            for instance in model.objects.only(*columns).iterator(chunk_size=200):
+                count = refresh_instance_variants(instance, force=options['force'])
+                if count:
+                    updated += count
+                    self.stdout.write(f'{model._meta.verbose_name} #{instance.pk}: {count} image(s) processed')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Generated variants for {updated} images in {time.perf_counter() - start:.1f} s'
+        ))
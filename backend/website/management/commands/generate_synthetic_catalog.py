@@ -0,0 +1,43 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from website.services.synthetic_catalog import clear_synthetic_catalog, generate_synthetic_catalog
+
+class Command(BaseCommand):
+    help = (
+        'Create a reproducible synthetic catalog (N products x M specification types) for benchmarks '
+        'and profiling. Use --clear to remove a previously generated one first'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--products', type=int, default=10000, help='Number of products')
+        parser.add_argument('--spec-types', type=int, default=50, help='Specification types per product')
+        parser.add_argument('--comparison-images', type=int, default=3, help='Number of comparison images')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed; the same seed gives the same catalog')
+        parser.add_argument('--images', action='store_true', help='Store placeholder image files (needs Pillow)')
+        parser.add_argument('--batch-size', type=int, default=settings.CATALOG_IMPORT_BATCH_SIZE,
+                            help='Products per bulk INSERT batch')
+        parser.add_argument('--clear', action='store_true', help='Delete the existing synthetic catalog first')
+        parser.add_argument('--clear-only', action='store_true', help='Only delete the existing synthetic catalog')
+
+    def handle(self, *args, **options):
+        if options['clear'] or options['clear_only']:
+            removed = clear_synthetic_catalog()
+            self.stdout.write(f'Removed {removed} synthetic products')
+            if options['clear_only']:
+                return
+
+        result = generate_synthetic_catalog(
+            products=options['products'],
+            spec_types=options['spec_types'],
+            comparison_images=options['comparison_images'],
+            seed=options['seed'],
+            images=options['images'],
+            batch_size=options['batch_size'],
+        )
+        rows = result['products'] + result['specifications']
+        rate = rows / result['seconds'] if result['seconds'] else 0.0
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {result['products']} products with {result['specification_types']} specification types "
+            f"({result['specifications']} specifications) and {result['comparison_images']} comparison images "
+            f"in {result['seconds']:.1f} s ({rate:.0f} rows/s)"
+        ))
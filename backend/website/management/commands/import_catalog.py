@@ -0,0 +1,37 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from website.services.catalog_import import IMPORT_FORMATS, CatalogImportError, import_catalog, read_catalog_file
+
+class Command(BaseCommand):
+    help = (
+        'Import products and specifications from a CSV, XLSX or JSON file, creating or updating '
+        'products by slug and specifications by type, in one transaction'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='File to import')
+        parser.add_argument('--format', choices=IMPORT_FORMATS, dest='file_format',
+                            help='File format (default: taken from the file extension)')
+        parser.add_argument('--batch-size', type=int, default=settings.CATALOG_IMPORT_BATCH_SIZE,
+                            help='Rows per bulk INSERT statement')
+        parser.add_argument('--dry-run', action='store_true', help='Only read and validate the file')
+
+    def handle(self, *args, **options):
+        try:
+            records = read_catalog_file(options['path'], options['file_format'])
+        except (CatalogImportError, OSError) as error:
+            raise CommandError(error)
+
+        if options['dry_run']:
+            specifications = sum(len(specs) for _, specs in records)
+            self.stdout.write(f'{len(records)} products with {specifications} specifications are valid')
+            return
+
+        result = import_catalog(records, options['batch_size'])
+        rows = result['products'] + result['specifications']
+        rate = rows / result['seconds'] if result['seconds'] else 0.0
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {result['products']} products and {result['specifications']} specifications "
+            f"({result['created_specification_types']} new specification types) "
+            f"in {result['seconds']:.2f} s ({rate:.0f} rows/s)"
+        ))
@@ -0,0 +1,38 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from website.services.contact_notifications import check_notification_backlog, process_notification_batch
+
+class Command(BaseCommand):
+    help = 'Deliver pending contact notification e-mails from the outbox, in batches over one SMTP connection'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=settings.CONTACT_NOTIFICATION_BATCH_SIZE,
+                            help='Notifications claimed and sent per batch')
+        parser.add_argument('--window', type=float, default=settings.CONTACT_NOTIFICATION_BATCH_WINDOW_SECONDS,
+                            help='Seconds the oldest pending notification waits for others before a partial batch is sent')
+        parser.add_argument('--mode', choices=['individual', 'digest'], default=settings.CONTACT_NOTIFICATION_DELIVERY,
+                            help='Send one e-mail per contact or one digest e-mail per batch')
+        parser.add_argument('--loop', action='store_true', help='Keep polling the outbox instead of exiting when it is empty')
+        parser.add_argument('--interval', type=float, default=5.0, help='Seconds to wait between polls with --loop')
+
+    def handle(self, *args, **options):
+        totals = {'sent': 0, 'retried': 0, 'failed': 0}
+        while True:
+            results = process_notification_batch(options['batch_size'], options['window'], options['mode'])
+            for key, value in results.items():
+                totals[key] += value
+            if any(results.values()):
+                self.stdout.write(
+                    f"Sent {results['sent']}, retrying {results['retried']}, failed {results['failed']}"
+                )
+                continue
+            # Whatever is still pending is waiting for a retry or the batch window
+            check_notification_backlog()
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Outbox drained: {totals['sent']} sent, {totals['retried']} scheduled for retry, {totals['failed']} failed"
+        ))
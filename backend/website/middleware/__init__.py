@@ -0,0 +1 @@
+# Middleware package for website app
\ No newline at end of file
@@ -0,0 +1,92 @@
+import json
+import logging
+import random
+import time
+from django.conf import settings
+from django.db import connection
+from website.services.request_timing import RequestTimings, activate, deactivate
+
+logger = logging.getLogger('website.request_timing')
+
+# Phases reported besides db and total, in Server-Timing order
+TIMED_PHASES = ('serialize', 'render', 'compress')
+
+
+class RequestTimingMiddleware:
+    """
+    Records the database queries of every request (count, time and SQL, via
+    connection.execute_wrapper) and times a sample of requests
+    (REQUEST_TIMING_SAMPLE_RATE) in detail: serialization, rendering and
+    compression, the view itself (everything but rendering) and the total.
+    The breakdown of sampled requests is sent as a Server-Timing header (to
+    staff users only by default, see REQUEST_TIMING_SERVER_TIMING, as it
+    reveals query counts and timings) and logged as one JSON line on the
+    'website.request_timing' logger. Any request slower than REQUEST_TIMING_SLOW_MS,
+    sampled or not, is logged as a warning with its queries.
+    Phase times include the database time spent inside them.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        sampled = random.random() < settings.REQUEST_TIMING_SAMPLE_RATE
+        # Queries are always recorded (a counter and a short list), so a slow
+        # request can be explained even when it was not sampled
+        timings = RequestTimings()
+        # Phase timing only for sampled requests; timed() is free otherwise
+        token = activate(timings) if sampled else None
+        try:
+            with connection.execute_wrapper(timings):
+                response = self.get_response(request)
+        finally:
+            if token is not None:
+                deactivate(token)
+        total_ms = (time.perf_counter() - start) * 1000
+        slow = total_ms >= settings.REQUEST_TIMING_SLOW_MS
+        if not sampled and not slow:
+            return response
+
+        metrics = {
+            'total_ms': round(total_ms, 3),
+            'db_ms': round(timings.query_time * 1000, 3),
+            'db_queries': timings.query_count,
+            'sampled': sampled,
+        }
+        if sampled:
+            metrics['view_ms'] = round(total_ms - timings.durations['render'] * 1000, 3)
+            for phase in TIMED_PHASES:
+                if phase in timings.durations:
+                    metrics[f'{phase}_ms'] = round(timings.durations[phase] * 1000, 3)
+            if self.sends_server_timing(request):
+                response['Server-Timing'] = self.server_timing(metrics)
+
+        if slow:
+            metrics['queries'] = timings.queries
+        self.log(request, response, metrics, slow=slow)
+        return response
+
+    def sends_server_timing(self, request):
+        mode = settings.REQUEST_TIMING_SERVER_TIMING
+        if mode == 'staff':
+            # request.user is set by AuthenticationMiddleware further down the chain
+            user = getattr(request, 'user', None)
+            return settings.DEBUG or bool(user is not None and user.is_staff)
+        return bool(mode)
+
+    def server_timing(self, metrics):
+        entries = [f'db;dur={metrics["db_ms"]};desc="{metrics["db_queries"]} queries"']
+        entries += [f'{phase};dur={metrics[f"{phase}_ms"]}' for phase in TIMED_PHASES if f'{phase}_ms' in metrics]
+        entries += [f'view;dur={metrics["view_ms"]}', f'total;dur={metrics["total_ms"]}']
+        return ', '.join(entries)
+
+    def log(self, request, response, metrics, slow):
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'slow': slow,
+            **metrics,
+        }
+        logger.log(logging.WARNING if slow else logging.INFO, json.dumps(record, default=str))
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.1 on 2026-10-18 10:12
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('website', '0003_alter_productspecification_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='productseriescomparisonimage',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name='Fecha de Actualización'),
+            preserve_default=False,
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.1 on 2026-10-18 08:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('website', '0004_productseriescomparisonimage_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['order', 'title', 'id'], name='product_order_title_id_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.1 on 2026-10-18 08:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('website', '0005_product_keyset_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_type', models.CharField(choices=[('product', 'Producto'), ('comparison_image', 'Imagen Comparativa')], max_length=32, verbose_name='Tipo de Objeto')),
+                ('object_id', models.BigIntegerField(verbose_name='ID del Objeto')),
+                ('deleted_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='Fecha de Eliminación')),
+            ],
+            options={
+                'verbose_name': 'Registro de Eliminación',
+                'verbose_name_plural': 'Registros de Eliminación del Catálogo',
+                'ordering': ['deleted_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.1 on 2026-10-18 08:53
+
+from django.db import migrations, models
+from website.migrations._spec_values_0016 import parse_spec_value
+
+
+def backfill_numeric_values(apps, schema_editor):
+    ProductSpecification = apps.get_model('website', 'ProductSpecification')
+    specifications = list(ProductSpecification.objects.select_related('specification_type'))
+    for specification in specifications:
+        specification.numeric_value = parse_spec_value(specification.value, specification.specification_type.unit)
+    ProductSpecification.objects.bulk_update(specifications, ['numeric_value'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('website', '0006_catalogtombstone'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='productspecification',
+            name='numeric_value',
+            field=models.DecimalField(blank=True, decimal_places=6, editable=False, help_text='Número extraído del valor en la unidad del tipo de especificación. Se calcula automáticamente.', max_digits=20, null=True, verbose_name='Valor Numérico'),
+        ),
+        migrations.AddIndex(
+            model_name='productspecification',
+            index=models.Index(fields=['specification_type', 'numeric_value'], name='spec_type_numeric_value_idx'),
+        ),
+        migrations.RunPython(backfill_numeric_values, migrations.RunPython.noop),
+    ]
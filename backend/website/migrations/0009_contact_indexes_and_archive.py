@@ -0,0 +1,39 @@
+# Generated by Django 5.2.1 on 2026-10-18 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('website', '0008_contactnotification'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContactArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('contact_id', models.BigIntegerField(unique=True, verbose_name='ID del Contacto')),
+                ('name', models.CharField(max_length=255, verbose_name='Nombre')),
+                ('phone', models.CharField(blank=True, max_length=20, null=True, verbose_name='Teléfono')),
+                ('email', models.EmailField(max_length=254, verbose_name='Correo Electrónico')),
+                ('message', models.TextField(verbose_name='Mensaje')),
+                ('created_at', models.DateTimeField(db_index=True, verbose_name='Fecha de Creación')),
+                ('archived_at', models.DateTimeField(auto_now_add=True, verbose_name='Fecha de Archivo')),
+            ],
+            options={
+                'verbose_name': 'Contacto Archivado',
+                'verbose_name_plural': 'Contactos Archivados',
+                'ordering': ['created_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='contact',
+            index=models.Index(fields=['created_at'], name='contact_created_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contact',
+            index=models.Index(fields=['email', '-created_at'], name='contact_email_created_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.1 on 2026-10-18 09:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('website', '0009_contact_indexes_and_archive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='dimensions_image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Versiones redimensionadas (AVIF/WebP/JPEG) de la imagen de medidas. Se generan automáticamente.', verbose_name='Variantes de la Imagen de Medidas'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='main_image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Versiones redimensionadas (AVIF/WebP/JPEG) de la imagen principal. Se generan automáticamente.', verbose_name='Variantes de la Imagen Principal'),
+        ),
+        migrations.AddField(
+            model_name='productseriescomparisonimage',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Versiones redimensionadas (AVIF/WebP/JPEG) de la imagen. Se generan automáticamente.', verbose_name='Variantes de la Imagen'),
+        ),
+    ]
@@ -0,0 +1,88 @@
+# Generated by Django 5.2.1 on 2026-10-18 09:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('website', '0010_image_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='dimensions_image_color',
+            field=models.CharField(blank=True, default='', editable=False, help_text='Color predominante de la imagen en formato #rrggbb. Se genera automáticamente.', max_length=7, verbose_name='Color Dominante de la Imagen de Medidas'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='dimensions_image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='Alto de la Imagen de Medidas (px)'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='dimensions_image_placeholder',
+            field=models.TextField(blank=True, default='', editable=False, help_text='Miniatura diminuta (data URI) que se muestra mientras carga la imagen. Se genera automáticamente.', verbose_name='Marcador de Posición de la Imagen de Medidas'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='dimensions_image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='Ancho de la Imagen de Medidas (px)'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='main_image_color',
+            field=models.CharField(blank=True, default='', editable=False, help_text='Color predominante de la imagen en formato #rrggbb. Se genera automáticamente.', max_length=7, verbose_name='Color Dominante de la Imagen Principal'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='main_image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='Alto de la Imagen Principal (px)'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='main_image_placeholder',
+            field=models.TextField(blank=True, default='', editable=False, help_text='Miniatura diminuta (data URI) que se muestra mientras carga la imagen. Se genera automáticamente.', verbose_name='Marcador de Posición de la Imagen Principal'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='main_image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='Ancho de la Imagen Principal (px)'),
+        ),
+        migrations.AddField(
+            model_name='productseriescomparisonimage',
+            name='image_color',
+            field=models.CharField(blank=True, default='', editable=False, help_text='Color predominante de la imagen en formato #rrggbb. Se genera automáticamente.', max_length=7, verbose_name='Color Dominante de la Imagen'),
+        ),
+        migrations.AddField(
+            model_name='productseriescomparisonimage',
+            name='image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='Alto de la Imagen (px)'),
+        ),
+        migrations.AddField(
+            model_name='productseriescomparisonimage',
+            name='image_placeholder',
+            field=models.TextField(blank=True, default='', editable=False, help_text='Miniatura diminuta (data URI) que se muestra mientras carga la imagen. Se genera automáticamente.', verbose_name='Marcador de Posición de la Imagen'),
+        ),
+        migrations.AddField(
+            model_name='productseriescomparisonimage',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='Ancho de la Imagen (px)'),
+        ),
+        migrations.AlterField(
+            model_name='product',
+            name='dimensions_image',
+            field=models.ImageField(blank=True, height_field='dimensions_image_height', help_text='Imagen que muestra las medidas y dimensiones específicas del producto.', null=True, upload_to='products/dimensions_images/', verbose_name='Imagen de Medidas', width_field='dimensions_image_width'),
+        ),
+        migrations.AlterField(
+            model_name='product',
+            name='main_image',
+            field=models.ImageField(height_field='main_image_height', help_text='Imagen que muestra el producto y sus dimensiones.', upload_to='products/main_images/', verbose_name='Imagen Principal del Producto', width_field='main_image_width'),
+        ),
+        migrations.AlterField(
+            model_name='productseriescomparisonimage',
+            name='image',
+            field=models.ImageField(height_field='image_height', help_text='Imagen que muestra la comparativa de varios productos de la serie.', upload_to='products/comparison_images/', verbose_name='Imagen Comparativa', width_field='image_width'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.1 on 2026-10-18 09:15
+
+from django.db import migrations, models
+
+
+def backfill_specs_cache(apps, schema_editor):
+    Product = apps.get_model('website', 'Product')
+    ProductSpecification = apps.get_model('website', 'ProductSpecification')
+    caches = {}
+    spec_rows = ProductSpecification.objects.order_by('product_id', 'specification_type_id').values_list(
+        'product_id', 'specification_type__name', 'specification_type__unit', 'value'
+    )
+    for product_id, name, unit, value in spec_rows:
+        caches.setdefault(product_id, []).append([name, unit, value])
+    Product.objects.bulk_update(
+        [Product(pk=product_id, specs_cache=cache) for product_id, cache in caches.items()],
+        ['specs_cache'],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('website', '0011_image_metadata'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='specs_cache',
+            field=models.JSONField(blank=True, default=list, editable=False, help_text='Copia ordenada de las especificaciones como [nombre, unidad, valor] para leer el catálogo en una sola consulta. Se actualiza automáticamente.', verbose_name='Especificaciones (Caché)'),
+        ),
+        migrations.RunPython(backfill_specs_cache, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+from django.db import migrations
+from website.migrations._spec_values_0016 import parse_spec_value
+
+
+def reparse_numeric_values(apps, schema_editor):
+    # parse_number used to read '0.250' as 250 and accept exponents
+    ProductSpecification = apps.get_model('website', 'ProductSpecification')
+    specifications = list(ProductSpecification.objects.select_related('specification_type'))
+    for specification in specifications:
+        specification.numeric_value = parse_spec_value(specification.value, specification.specification_type.unit)
+    ProductSpecification.objects.bulk_update(specifications, ['numeric_value'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('website', '0012_product_specs_cache'),
+    ]
+
+    operations = [
+        migrations.RunPython(reparse_numeric_values, migrations.RunPython.noop),
+    ]
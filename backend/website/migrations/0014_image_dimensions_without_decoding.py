@@ -0,0 +1,28 @@
+# Generated by Django 5.2.1 on 2026-10-18 09:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('website', '0013_reparse_numeric_values'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='product',
+            name='dimensions_image',
+            field=models.ImageField(blank=True, help_text='Imagen que muestra las medidas y dimensiones específicas del producto.', null=True, upload_to='products/dimensions_images/', verbose_name='Imagen de Medidas'),
+        ),
+        migrations.AlterField(
+            model_name='product',
+            name='main_image',
+            field=models.ImageField(help_text='Imagen que muestra el producto y sus dimensiones.', upload_to='products/main_images/', verbose_name='Imagen Principal del Producto'),
+        ),
+        migrations.AlterField(
+            model_name='productseriescomparisonimage',
+            name='image',
+            field=models.ImageField(help_text='Imagen que muestra la comparativa de varios productos de la serie.', upload_to='products/comparison_images/', verbose_name='Imagen Comparativa'),
+        ),
+    ]
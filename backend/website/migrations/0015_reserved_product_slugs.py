@@ -0,0 +1,19 @@
+# Generated by Django 5.2.1 on 2026-10-18 09:26
+
+import website.models.product_model
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('website', '0014_image_dimensions_without_decoding'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='product',
+            name='slug',
+            field=models.SlugField(blank=True, help_text='Versión amigable del título para URLs, se genera automáticamente si se deja vacío.', max_length=255, unique=True, validators=[website.models.product_model.validate_product_slug], verbose_name='Slug (URL amigable)'),
+        ),
+    ]
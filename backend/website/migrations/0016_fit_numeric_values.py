@@ -0,0 +1,23 @@
+from django.db import migrations
+from website.migrations._spec_values_0016 import parse_spec_value
+
+
+def refit_numeric_values(apps, schema_editor):
+    # Values are now rounded to the column's 6 decimal places and dropped
+    # beyond its 14 integer digits instead of failing (or overflowing) the write
+    ProductSpecification = apps.get_model('website', 'ProductSpecification')
+    specifications = list(ProductSpecification.objects.select_related('specification_type'))
+    for specification in specifications:
+        specification.numeric_value = parse_spec_value(specification.value, specification.specification_type.unit)
+    ProductSpecification.objects.bulk_update(specifications, ['numeric_value'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('website', '0015_reserved_product_slugs'),
+    ]
+
+    operations = [
+        migrations.RunPython(refit_numeric_values, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,164 @@
+"""
+Frozen copy of website.services.spec_values as of migration 0016, used by the
+migrations that fill ProductSpecification.numeric_value (0007, 0013, 0016).
+
+Migrations must keep producing the same data whatever the live parser turns
+into later, so this module is never edited: when the parsing rules change,
+copy the new version next to it and reparse in a new migration. The leading
+underscore keeps the migration loader from treating it as a migration.
+"""
+import re
+from decimal import Decimal, InvalidOperation
+
+# Number followed by an optional unit token, e.g. '30,48 cm', '1.200 L/min', '90%'
+NUMBER_WITH_UNIT = re.compile(
+    r'(?<![\w.,])(?P<number>\d+(?:[.,]\d+)*)\s*(?P<unit>%|[a-zA-Zµ²³]+(?:/[a-zA-Z]+)?[²³23]?)?'
+)
+
+# A value that is only a number, e.g. '4'
+BARE_NUMBER = re.compile(r'\s*\d+(?:[.,]\d+)*\s*')
+
+# What parse_number accepts once the separators are normalized: no exponent, NaN or Infinity
+PLAIN_DECIMAL = re.compile(r'[+-]?\d+(?:\.\d+)?')
+
+# ProductSpecification.numeric_value is a DecimalField(max_digits=20, decimal_places=6)
+NUMERIC_VALUE_QUANTUM = Decimal('0.000001')
+NUMERIC_VALUE_LIMIT = Decimal(10) ** 14
+
+# Unit spellings mapped to (dimension, factor to the dimension's base unit)
+UNITS = {
+    # Area (base: m²)
+    'm2': ('area', Decimal('1')),
+    'cm2': ('area', Decimal('0.0001')),
+    # Length (base: mm)
+    'mm': ('length', Decimal('1')),
+    'cm': ('length', Decimal('10')),
+    'm': ('length', Decimal('1000')),
+    'micras': ('length', Decimal('0.001')),
+    'um': ('length', Decimal('0.001')),
+    # Rain intensity (base: mm/h)
+    'mm/h': ('intensity', Decimal('1')),
+    # Flow (base: L/min)
+    'l/min': ('flow', Decimal('1')),
+    'l/s': ('flow', Decimal('60')),
+    'l/h': ('flow', Decimal('1') / Decimal('60')),
+    'm3/h': ('flow', Decimal('1000') / Decimal('60')),
+    # Ratio (base: %)
+    '%': ('ratio', Decimal('1')),
+}
+
+# Alternative spellings of the units above
+UNIT_ALIASES = {
+    'm²': 'm2',
+    'cm²': 'cm2',
+    'micra': 'micras',
+    'micrones': 'micras',
+    'µm': 'um',
+    'lpm': 'l/min',
+    'm³/h': 'm3/h',
+}
+
+
+def normalize_unit(unit):
+    """
+    Return the canonical spelling of a unit (see UNITS), or None if unknown.
+    Multi-word units such as 'cm de columna de agua' are matched on their first word.
+    """
+    if not unit:
+        return None
+    unit = unit.strip().lower()
+    unit = UNIT_ALIASES.get(unit, unit)
+    if unit in UNITS:
+        return unit
+    first_word = unit.split()[0]
+    first_word = UNIT_ALIASES.get(first_word, first_word)
+    return first_word if first_word in UNITS else None
+
+
+def parse_number(text):
+    """
+    Parse a number written with Spanish or English separators: '30,48' -> 30.48,
+    '1.200' -> 1200, '1.200,5' -> 1200.5, '0.25' -> 0.25, '0.250' -> 0.25.
+    Returns None if invalid, including exponents ('1e5'), NaN and Infinity.
+    """
+    text = text.strip()
+    if ',' in text and '.' in text:
+        # The last separator is the decimal one
+        if text.rfind(',') > text.rfind('.'):
+            text = text.replace('.', '').replace(',', '.')
+        else:
+            text = text.replace(',', '')
+    elif ',' in text:
+        text = text.replace(',', '.') if text.count(',') == 1 else text.replace(',', '')
+    elif re.fullmatch(r'[+-]?[1-9]\d{0,2}(?:\.\d{3})+', text):
+        # Dot used as thousands separator; never after a leading zero ('0.250' is a decimal)
+        text = text.replace('.', '')
+    if not PLAIN_DECIMAL.fullmatch(text):
+        return None
+    try:
+        number = Decimal(text)
+    except InvalidOperation:
+        return None
+    return number if number.is_finite() else None
+
+
+def fit_numeric_value(number):
+    """
+    Round a parsed value to the 6 decimal places of ProductSpecification.numeric_value,
+    or return None when it does not fit the column (14 integer digits).
+    """
+    # Checked before rounding too: quantize() fails beyond the context precision
+    if number is None or abs(number) >= NUMERIC_VALUE_LIMIT:
+        return None
+    number = number.quantize(NUMERIC_VALUE_QUANTUM)
+    return number if abs(number) < NUMERIC_VALUE_LIMIT else None
+
+
+def parse_spec_value(value, unit=None):
+    """
+    Extract the numeric value of a specification, expressed in `unit`
+    (the SpecificationType unit), as stored in ProductSpecification.numeric_value.
+    Returns a Decimal or None; see fit_numeric_value for values out of range.
+    """
+    return fit_numeric_value(_extract_spec_value(value, unit))
+
+
+def _extract_spec_value(value, unit):
+    """
+    Return the number of a specification value in `unit`, unrounded.
+
+    A number written in the type's unit wins; otherwise a number in a
+    compatible unit is converted ('0,25 mm' for a 'micras' type gives 250).
+    Types without a unit only accept a bare number, so text such as
+    'acero inoxidable SS-304' is not mistaken for a measurement.
+    """
+    if not value:
+        return None
+    target = normalize_unit(unit)
+
+    candidates = []
+    for match in NUMBER_WITH_UNIT.finditer(value):
+        number = parse_number(match.group('number'))
+        if number is not None:
+            candidates.append((number, normalize_unit(match.group('unit'))))
+    if not candidates:
+        return None
+
+    if not unit:
+        return candidates[0][0] if BARE_NUMBER.fullmatch(value) else None
+
+    if target is None:
+        # Unit the parser does not know: trust the first number
+        return candidates[0][0]
+
+    for number, value_unit in candidates:
+        if value_unit == target:
+            return number
+    dimension, factor = UNITS[target]
+    for number, value_unit in candidates:
+        if value_unit is not None and UNITS[value_unit][0] == dimension:
+            return number * UNITS[value_unit][1] / factor
+    for number, value_unit in candidates:
+        if value_unit is None:
+            return number
+    return None
@@ -2,15 +2,21 @@
 # This allows Django to discover them when placed in separate files.
 
 from .contact_model import Contact
+from .contact_notification_model import ContactNotification
+from .contact_archive_model import ContactArchive
 from .specification_type_model import SpecificationType
 from .product_model import Product
 from .product_specification_model import ProductSpecification
 from .product_series_comparison_image_model import ProductSeriesComparisonImage
+from .catalog_tombstone_model import CatalogTombstone
 
 __all__ = [
     'Contact',
+    'ContactNotification',
+    'ContactArchive',
     'SpecificationType',
     'Product',
     'ProductSpecification',
     'ProductSeriesComparisonImage',
+    'CatalogTombstone',
 ] 
\ No newline at end of file
@@ -0,0 +1,35 @@
+from django.db import models
+
+class CatalogTombstone(models.Model):
+    """
+    Records the deletion of a catalog row so clients syncing incrementally
+    (products API with updated_since / since_version) can drop it.
+    """
+    PRODUCT = 'product'
+    COMPARISON_IMAGE = 'comparison_image'
+    OBJECT_TYPE_CHOICES = [
+        (PRODUCT, 'Producto'),
+        (COMPARISON_IMAGE, 'Imagen Comparativa'),
+    ]
+
+    object_type = models.CharField(
+        max_length=32,
+        choices=OBJECT_TYPE_CHOICES,
+        verbose_name="Tipo de Objeto"
+    )
+    object_id = models.BigIntegerField(
+        verbose_name="ID del Objeto"
+    )
+    deleted_at = models.DateTimeField(
+        auto_now_add=True,
+        db_index=True,
+        verbose_name="Fecha de Eliminación"
+    )
+
+    class Meta:
+        verbose_name = "Registro de Eliminación"
+        verbose_name_plural = "Registros de Eliminación del Catálogo"
+        ordering = ['deleted_at']
+
+    def __str__(self):
+        return f"{self.get_object_type_display()} #{self.object_id} eliminado el {self.deleted_at.strftime('%Y-%m-%d %H:%M')}"
@@ -0,0 +1,43 @@
+from django.db import models
+
+class ContactArchive(models.Model):
+    """
+    Contact submission moved out of the Contact table by the archive_contacts
+    retention command. Keeps the original id and creation date.
+    """
+    contact_id = models.BigIntegerField(
+        unique=True,
+        verbose_name="ID del Contacto"
+    )
+    name = models.CharField(
+        max_length=255,
+        verbose_name="Nombre"
+    )
+    phone = models.CharField(
+        max_length=20,
+        blank=True,
+        null=True,
+        verbose_name="Teléfono"
+    )
+    email = models.EmailField(
+        verbose_name="Correo Electrónico"
+    )
+    message = models.TextField(
+        verbose_name="Mensaje"
+    )
+    created_at = models.DateTimeField(
+        db_index=True,
+        verbose_name="Fecha de Creación"
+    )
+    archived_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name="Fecha de Archivo"
+    )
+
+    class Meta:
+        verbose_name = "Contacto Archivado"
+        verbose_name_plural = "Contactos Archivados"
+        ordering = ['created_at']
+
+    def __str__(self):
+        return f"Archived contact from {self.name} ({self.email}) on {self.created_at.strftime('%Y-%m-%d %H:%M')}"
@@ -29,6 +29,12 @@ class Contact(models.Model):
         verbose_name = "Contacto"
         verbose_name_plural = "Formularios de Contacto"
         ordering = ['created_at']
+        indexes = [
+            # Admin changelist ordering / date filter and time-ranged exports
+            models.Index(fields=['created_at'], name='contact_created_at_idx'),
+            # Submissions from one e-mail address, newest first
+            models.Index(fields=['email', '-created_at'], name='contact_email_created_idx'),
+        ]
 
     def __str__(self):
         return f"Contact submission from {self.name} ({self.email}) on {self.created_at.strftime('%Y-%m-%d %H:%M')}" 
\ No newline at end of file
@@ -0,0 +1,60 @@
+from django.db import models
+from django.utils import timezone
+
+class ContactNotification(models.Model):
+    """
+    Outbox row for the e-mail notification of a contact submission.
+    Written in the same transaction as the Contact and delivered later by
+    the send_contact_notifications command.
+    """
+    PENDING = 'pending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pendiente'),
+        (SENT, 'Enviado'),
+        (FAILED, 'Fallido'),
+    ]
+
+    contact = models.OneToOneField(
+        'Contact',
+        related_name='notification',
+        on_delete=models.CASCADE,
+        verbose_name="Contacto"
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default=PENDING,
+        verbose_name="Estado"
+    )
+    attempts = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Intentos"
+    )
+    next_attempt_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name="Próximo Intento"
+    )
+    last_error = models.TextField(
+        blank=True,
+        verbose_name="Último Error"
+    )
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Fecha de Creación")
+    sent_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        verbose_name="Fecha de Envío"
+    )
+
+    class Meta:
+        verbose_name = "Notificación de Contacto"
+        verbose_name_plural = "Notificaciones de Contacto"
+        ordering = ['next_attempt_at']
+        indexes = [
+            # The worker polls pending rows that are due
+            models.Index(fields=['status', 'next_attempt_at'], name='notification_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"Notification for contact #{self.contact_id} ({self.status})"
@@ -1,6 +1,19 @@
+from django.core.exceptions import ValidationError
 from django.db import models
 from django.utils.text import slugify
 
+# Taken by the fixed routes under /api/products/, so no product detail could be served there
+RESERVED_PRODUCT_SLUGS = ('compare', 'recommend', 'cache-stats')
+
+
+def validate_product_slug(value):
+    """
+    Reject the slugs of RESERVED_PRODUCT_SLUGS.
+    """
+    if value in RESERVED_PRODUCT_SLUGS:
+        raise ValidationError(f'"{value}" está reservado, elija otro slug.', code='reserved')
+
+
 class Product(models.Model):
     """
     Represents a product, e.g., a specific model of a rain filter.
@@ -15,6 +28,7 @@ class Product(models.Model):
         max_length=255,
         unique=True,
         blank=True, # Will be auto-generated if left blank
+        validators=[validate_product_slug],
         verbose_name="Slug (URL amigable)",
         help_text="Versión amigable del título para URLs, se genera automáticamente si se deja vacío."
     )
@@ -46,6 +60,74 @@ class Product(models.Model):
         verbose_name="Imagen de Medidas",
         help_text="Imagen que muestra las medidas y dimensiones específicas del producto."
     )
+    main_image_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        verbose_name="Variantes de la Imagen Principal",
+        help_text="Versiones redimensionadas (AVIF/WebP/JPEG) de la imagen principal. Se generan automáticamente."
+    )
+    dimensions_image_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        verbose_name="Variantes de la Imagen de Medidas",
+        help_text="Versiones redimensionadas (AVIF/WebP/JPEG) de la imagen de medidas. Se generan automáticamente."
+    )
+    main_image_width = models.PositiveIntegerField(
+        blank=True,
+        null=True,
+        editable=False,
+        verbose_name="Ancho de la Imagen Principal (px)"
+    )
+    main_image_height = models.PositiveIntegerField(
+        blank=True,
+        null=True,
+        editable=False,
+        verbose_name="Alto de la Imagen Principal (px)"
+    )
+    main_image_placeholder = models.TextField(
+        blank=True,
+        default='',
+        editable=False,
+        verbose_name="Marcador de Posición de la Imagen Principal",
+        help_text="Miniatura diminuta (data URI) que se muestra mientras carga la imagen. Se genera automáticamente."
+    )
+    main_image_color = models.CharField(
+        max_length=7,
+        blank=True,
+        default='',
+        editable=False,
+        verbose_name="Color Dominante de la Imagen Principal",
+        help_text="Color predominante de la imagen en formato #rrggbb. Se genera automáticamente."
+    )
+    dimensions_image_width = models.PositiveIntegerField(
+        blank=True,
+        null=True,
+        editable=False,
+        verbose_name="Ancho de la Imagen de Medidas (px)"
+    )
+    dimensions_image_height = models.PositiveIntegerField(
+        blank=True,
+        null=True,
+        editable=False,
+        verbose_name="Alto de la Imagen de Medidas (px)"
+    )
+    dimensions_image_placeholder = models.TextField(
+        blank=True,
+        default='',
+        editable=False,
+        verbose_name="Marcador de Posición de la Imagen de Medidas",
+        help_text="Miniatura diminuta (data URI) que se muestra mientras carga la imagen. Se genera automáticamente."
+    )
+    dimensions_image_color = models.CharField(
+        max_length=7,
+        blank=True,
+        default='',
+        editable=False,
+        verbose_name="Color Dominante de la Imagen de Medidas",
+        help_text="Color predominante de la imagen en formato #rrggbb. Se genera automáticamente."
+    )
     order = models.PositiveIntegerField(
         default=0,
         verbose_name="Orden de Visualización",
@@ -56,6 +138,13 @@ class Product(models.Model):
         verbose_name="¿Está Activo?",
         help_text="Desmarcar para ocultar el producto del sitio web."
     )
+    specs_cache = models.JSONField(
+        default=list,
+        blank=True,
+        editable=False,
+        verbose_name="Especificaciones (Caché)",
+        help_text="Copia ordenada de las especificaciones como [nombre, unidad, valor] para leer el catálogo en una sola consulta. Se actualiza automáticamente."
+    )
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Fecha de Creación")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Fecha de Actualización")
 
@@ -63,6 +152,10 @@ class Product(models.Model):
         verbose_name = "Producto"
         verbose_name_plural = "Productos"
         ordering = ['order', 'title']
+        indexes = [
+            # Keyset pagination of the products API walks (order, title, id)
+            models.Index(fields=['order', 'title', 'id'], name='product_order_title_id_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -70,4 +163,16 @@ class Product(models.Model):
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.title)
+            if self.slug in RESERVED_PRODUCT_SLUGS:
+                self.slug = f'{self.slug}-producto'
+        validate_product_slug(self.slug)
+        # specs_cache is maintained by website.signals; an instance loaded before
+        # a specification changed must not write its stale copy back
+        if (not self._state.adding and self.pk is not None and not args
+                and kwargs.get('update_fields') is None and not kwargs.get('force_insert')):
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'specs_cache' and field.attname not in deferred
+            ]
         super().save(*args, **kwargs) 
\ No newline at end of file
@@ -15,12 +15,47 @@ class ProductSeriesComparisonImage(models.Model):
         verbose_name="Imagen Comparativa",
         help_text="Imagen que muestra la comparativa de varios productos de la serie."
     )
+    image_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        verbose_name="Variantes de la Imagen",
+        help_text="Versiones redimensionadas (AVIF/WebP/JPEG) de la imagen. Se generan automáticamente."
+    )
+    image_width = models.PositiveIntegerField(
+        blank=True,
+        null=True,
+        editable=False,
+        verbose_name="Ancho de la Imagen (px)"
+    )
+    image_height = models.PositiveIntegerField(
+        blank=True,
+        null=True,
+        editable=False,
+        verbose_name="Alto de la Imagen (px)"
+    )
+    image_placeholder = models.TextField(
+        blank=True,
+        default='',
+        editable=False,
+        verbose_name="Marcador de Posición de la Imagen",
+        help_text="Miniatura diminuta (data URI) que se muestra mientras carga la imagen. Se genera automáticamente."
+    )
+    image_color = models.CharField(
+        max_length=7,
+        blank=True,
+        default='',
+        editable=False,
+        verbose_name="Color Dominante de la Imagen",
+        help_text="Color predominante de la imagen en formato #rrggbb. Se genera automáticamente."
+    )
     is_active = models.BooleanField(
         default=True,
         verbose_name="¿Está Activa?",
         help_text="Desmarcar para ocultar esta imagen del sitio."
     )
     uploaded_at = models.DateTimeField(auto_now_add=True, verbose_name="Fecha de Subida")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Fecha de Actualización")
 
     class Meta:
         verbose_name = "Imagen Comparativa de Serie de Productos"
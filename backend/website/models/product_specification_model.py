@@ -1,4 +1,5 @@
 from django.db import models
+from website.services.spec_values import parse_spec_value
 
 class ProductSpecification(models.Model):
     """
@@ -23,6 +24,15 @@ class ProductSpecification(models.Model):
         verbose_name="Valor de la Especificación",
         help_text="Valor específico para el producto y tipo de especificación. Ej: 120 m2, 75 mm/h, Abierto por un extremo..."
     )
+    numeric_value = models.DecimalField(
+        max_digits=20,
+        decimal_places=6,
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name="Valor Numérico",
+        help_text="Número extraído del valor en la unidad del tipo de especificación. Se calcula automáticamente."
+    )
 
     class Meta:
         verbose_name = "Especificación de Producto"
@@ -32,7 +42,15 @@ class ProductSpecification(models.Model):
         # Ordenar por producto y por el ID del tipo de especificación para mantener
         # el mismo orden en que fueron creadas las especificaciones (que coincide
         # con el orden de la tabla solicitada por el cliente).
-        ordering = ['product', 'specification_type__id'] 
+        ordering = ['product', 'specification_type__id']
+        indexes = [
+            # Range filters on the products API: type + numeric value
+            models.Index(fields=['specification_type', 'numeric_value'], name='spec_type_numeric_value_idx'),
+        ]
 
     def __str__(self):
-        return f"{self.product.title} - {self.specification_type.name}: {self.value}" 
\ No newline at end of file
+        return f"{self.product.title} - {self.specification_type.name}: {self.value}"
+
+    def save(self, *args, **kwargs):
+        self.numeric_value = parse_spec_value(self.value, self.specification_type.unit)
+        super().save(*args, **kwargs) 
\ No newline at end of file
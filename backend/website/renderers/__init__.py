@@ -0,0 +1 @@
+# Renderers package for website app
\ No newline at end of file
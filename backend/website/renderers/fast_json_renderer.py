@@ -0,0 +1,114 @@
+import decimal
+from django.conf import settings
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+from website.services.compression import brotli_compress, gzip_compress
+from website.services.request_timing import timed
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, the stdlib json module is used instead
+    orjson = None
+
+# Compressed variants in order of preference
+ENCODINGS = (('br', brotli_compress), ('gzip', gzip_compress))
+
+
+def _accepted_encodings(header):
+    """
+    Return the content codings accepted by an Accept-Encoding header (q > 0).
+    """
+    accepted = set()
+    for item in header.split(','):
+        coding, _, params = item.strip().partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if coding and quality > 0:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+class DecimalStringEncoder(JSONEncoder):
+    """
+    DRF's JSONEncoder, except that Decimal values left in the data are written
+    as strings when COERCE_DECIMAL_TO_STRING is on, like DecimalField does,
+    instead of being rounded through float.
+    """
+
+    def default(self, obj):
+        if isinstance(obj, decimal.Decimal) and api_settings.COERCE_DECIMAL_TO_STRING:
+            return str(obj)
+        return super().default(obj)
+
+
+class PrecompressedPayload:
+    """
+    A rendered JSON body together with its gzip/brotli variants, built once
+    (e.g. per cached catalog version) and then served to every request.
+    """
+
+    def __init__(self, body, encoded):
+        self.body = body
+        self.encoded = encoded
+
+    def for_request(self, request):
+        """
+        Return (content, content_encoding) for the best coding the client accepts.
+        """
+        accepted = _accepted_encodings(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        for coding, _ in ENCODINGS:
+            if coding in self.encoded and (coding in accepted or '*' in accepted):
+                return self.encoded[coding], coding
+        return self.body, None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSON renderer backed by orjson when it is installed, which serializes
+    dicts, lists, strings and datetimes in C; other types (Decimal, lazy
+    strings...) go through DecimalStringEncoder on both paths, so the output is
+    the same byte for byte. Falls back to DRF's stdlib JSONRenderer otherwise
+    and for indented output.
+    """
+    encoder_class = DecimalStringEncoder
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with timed('render'):
+            return self._render(data, accepted_media_type, renderer_context)
+
+    def _render(self, data, accepted_media_type, renderer_context):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=self.encoder_class().default, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+
+        # Escape \u2028 and \u2029 like JSONRenderer, so the output stays a
+        # strict javascript subset
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+    def precompress(self, data, min_size=None):
+        """
+        Render data once and compress it with every available coding when the
+        body is at least min_size bytes (default: API_COMPRESSION_MIN_SIZE).
+        """
+        min_size = settings.API_COMPRESSION_MIN_SIZE if min_size is None else min_size
+        body = self.render(data)
+        encoded = {}
+        if len(body) >= min_size:
+            with timed('compress'):
+                for coding, compress in ENCODINGS:
+                    content = compress(body)
+                    if content is not None and len(content) < len(body):
+                        encoded[coding] = content
+        return PrecompressedPayload(body, encoded)
@@ -0,0 +1,220 @@
+"""
+Fast-path catalog serialization.
+
+Builds exactly the same structures as ProductSerializer and
+ProductSeriesComparisonImageSerializer, but from values()/values_list() rows
+with plain dict construction instead of DRF fields and model instances.
+Any change to those serializers must be mirrored here (see website/tests.py).
+"""
+import decimal
+from django.core.files.storage import FileSystemStorage
+from django.utils.encoding import filepath_to_uri
+from django.utils import timezone
+from website.models.product_model import Product
+from website.models.product_series_comparison_image_model import ProductSeriesComparisonImage
+from website.services.image_variants import srcset_builder
+
+PRODUCT_FIELDS = (
+    'id', 'title', 'slug', 'initial_text', 'description', 'price',
+    'main_image', 'main_image_variants', 'main_image_width', 'main_image_height',
+    'main_image_placeholder', 'main_image_color',
+    'dimensions_image', 'dimensions_image_variants', 'dimensions_image_width', 'dimensions_image_height',
+    'dimensions_image_placeholder', 'dimensions_image_color',
+    'order', 'is_active', 'created_at', 'updated_at', 'specs_cache',
+)
+# Output fields of ProductSerializer, in order
+PRODUCT_OUTPUT_FIELDS = (
+    'id', 'title', 'slug', 'initial_text', 'description', 'price',
+    'main_image', 'main_image_url', 'main_image_srcset', 'main_image_width', 'main_image_height',
+    'main_image_placeholder', 'main_image_color',
+    'dimensions_image', 'dimensions_image_url', 'dimensions_image_srcset', 'dimensions_image_width',
+    'dimensions_image_height', 'dimensions_image_placeholder', 'dimensions_image_color',
+    'order', 'is_active', 'created_at', 'updated_at', 'specifications',
+)
+# Database columns read for output fields whose name differs from the column
+PRODUCT_FIELD_COLUMNS = {
+    'main_image_url': ('main_image',),
+    'main_image_srcset': ('main_image', 'main_image_variants'),
+    'dimensions_image_url': ('dimensions_image',),
+    'dimensions_image_srcset': ('dimensions_image', 'dimensions_image_variants'),
+    'specifications': ('specs_cache',),
+}
+COMPARISON_IMAGE_FIELDS = (
+    'id', 'name', 'image', 'image_variants', 'image_width', 'image_height',
+    'image_placeholder', 'image_color', 'is_active', 'uploaded_at',
+)
+
+_PRICE_FIELD = Product._meta.get_field('price')
+_PRICE_QUANTUM = decimal.Decimal('.1') ** _PRICE_FIELD.decimal_places
+_PRICE_CONTEXT = decimal.Context(prec=_PRICE_FIELD.max_digits)
+
+
+def format_price(value):
+    """
+    Format a Product.price value exactly like DRF's DecimalField with COERCE_DECIMAL_TO_STRING.
+    """
+    return '{:f}'.format(value.quantize(_PRICE_QUANTUM, context=_PRICE_CONTEXT))
+
+
+def _datetime_formatter():
+    """
+    Return a function giving the same output as DRF's ISO 8601 DateTimeField.
+    """
+    current_timezone = timezone.get_current_timezone()
+
+    def format_datetime(value):
+        if value is None:
+            return None
+        value = value.astimezone(current_timezone).isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+
+    return format_datetime
+
+
+def _media_url_builder(storage, request):
+    """
+    Return a function mapping a stored file name to the URL DRF would produce.
+    For file system storage the absolute media prefix is computed once per
+    request instead of calling storage.url() and build_absolute_uri() per image.
+    """
+    if isinstance(storage, FileSystemStorage):
+        # storage.url() only percent-encodes the name and appends it to base_url
+        marker = storage.url('_')
+        prefix = (request.build_absolute_uri(marker) if request else marker)[:-1]
+
+        def media_url(name):
+            if not name:
+                return None
+            return prefix + filepath_to_uri(name).lstrip('/')
+
+        return media_url
+
+    def media_url(name):
+        if not name:
+            return None
+        url = storage.url(name)
+        return request.build_absolute_uri(url) if request else url
+
+    return media_url
+
+
+def _specifications(specs_cache):
+    """
+    Expand a Product.specs_cache value into the spec dicts of ProductSpecificationSerializer.
+    """
+    return [{'name': name, 'unit': unit, 'value': value} for name, unit, value in specs_cache]
+
+
+def serialize_products(queryset, request=None, fields=None):
+    """
+    Serialize a Product queryset like ProductSerializer(many=True), in one
+    query: the specifications come from the denormalized specs_cache column
+    instead of two prefetch queries and a model instance per row.
+    `fields` optionally restricts the output to a subset of PRODUCT_OUTPUT_FIELDS;
+    only the columns those fields need are read.
+    """
+    if fields is not None:
+        return _serialize_products_sparse(queryset, request, fields)
+
+    format_datetime = _datetime_formatter()
+    main_image_url = _media_url_builder(Product._meta.get_field('main_image').storage, request)
+    dimensions_image_url = _media_url_builder(Product._meta.get_field('dimensions_image').storage, request)
+    main_image_srcset = srcset_builder(main_image_url)
+    dimensions_image_srcset = srcset_builder(dimensions_image_url)
+
+    products = []
+    for row in queryset.values(*PRODUCT_FIELDS):
+        main_image = main_image_url(row['main_image'])
+        dimensions_image = dimensions_image_url(row['dimensions_image'])
+        products.append({
+            'id': row['id'],
+            'title': row['title'],
+            'slug': row['slug'],
+            'initial_text': row['initial_text'],
+            'description': row['description'],
+            'price': format_price(row['price']),
+            'main_image': main_image,
+            'main_image_url': main_image,
+            'main_image_srcset': main_image_srcset(row['main_image'], row['main_image_variants']),
+            'main_image_width': row['main_image_width'],
+            'main_image_height': row['main_image_height'],
+            'main_image_placeholder': row['main_image_placeholder'],
+            'main_image_color': row['main_image_color'],
+            'dimensions_image': dimensions_image,
+            'dimensions_image_url': dimensions_image,
+            'dimensions_image_srcset': dimensions_image_srcset(row['dimensions_image'], row['dimensions_image_variants']),
+            'dimensions_image_width': row['dimensions_image_width'],
+            'dimensions_image_height': row['dimensions_image_height'],
+            'dimensions_image_placeholder': row['dimensions_image_placeholder'],
+            'dimensions_image_color': row['dimensions_image_color'],
+            'order': row['order'],
+            'is_active': row['is_active'],
+            'created_at': format_datetime(row['created_at']),
+            'updated_at': format_datetime(row['updated_at']),
+            'specifications': _specifications(row['specs_cache']),
+        })
+    return products
+
+
+def _serialize_products_sparse(queryset, request, fields):
+    """
+    serialize_products() restricted to `fields`.
+    """
+    format_datetime = _datetime_formatter()
+    main_image_url = _media_url_builder(Product._meta.get_field('main_image').storage, request)
+    dimensions_image_url = _media_url_builder(Product._meta.get_field('dimensions_image').storage, request)
+    main_image_srcset = srcset_builder(main_image_url)
+    dimensions_image_srcset = srcset_builder(dimensions_image_url)
+
+    columns = {'id'}
+    for field in fields:
+        columns.update(PRODUCT_FIELD_COLUMNS.get(field, (field,)))
+    rows = queryset.values(*columns)
+
+    converters = {
+        'price': lambda row: format_price(row['price']),
+        'main_image': lambda row: main_image_url(row['main_image']),
+        'main_image_url': lambda row: main_image_url(row['main_image']),
+        'main_image_srcset': lambda row: main_image_srcset(row['main_image'], row['main_image_variants']),
+        'dimensions_image': lambda row: dimensions_image_url(row['dimensions_image']),
+        'dimensions_image_url': lambda row: dimensions_image_url(row['dimensions_image']),
+        'dimensions_image_srcset': lambda row: dimensions_image_srcset(row['dimensions_image'], row['dimensions_image_variants']),
+        'created_at': lambda row: format_datetime(row['created_at']),
+        'updated_at': lambda row: format_datetime(row['updated_at']),
+        'specifications': lambda row: _specifications(row['specs_cache']),
+    }
+    converters = [
+        (field, converters.get(field, lambda row, column=field: row[column]))
+        for field in fields
+    ]
+    return [{field: convert(row) for field, convert in converters} for row in rows]
+
+
+def serialize_comparison_images(queryset, request=None):
+    """
+    Serialize a ProductSeriesComparisonImage queryset like
+    ProductSeriesComparisonImageSerializer(many=True).
+    """
+    format_datetime = _datetime_formatter()
+    image_url = _media_url_builder(ProductSeriesComparisonImage._meta.get_field('image').storage, request)
+    image_srcset = srcset_builder(image_url)
+
+    images = []
+    for row in queryset.values(*COMPARISON_IMAGE_FIELDS):
+        url = image_url(row['image'])
+        images.append({
+            'id': row['id'],
+            'name': row['name'],
+            'image': url,
+            'image_url': url,
+            'image_srcset': image_srcset(row['image'], row['image_variants']),
+            'image_width': row['image_width'],
+            'image_height': row['image_height'],
+            'image_placeholder': row['image_placeholder'],
+            'image_color': row['image_color'],
+            'is_active': row['is_active'],
+            'uploaded_at': format_datetime(row['uploaded_at']),
+        })
+    return images
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from website.models.product_model import Product
+from website.services.image_variants import srcset_builder
 from .product_specification_serializer import ProductSpecificationNestedSerializer
 
 class ProductSerializer(serializers.ModelSerializer):
@@ -8,7 +9,9 @@ class ProductSerializer(serializers.ModelSerializer):
     """
     specifications = ProductSpecificationNestedSerializer(many=True, read_only=True)
     main_image_url = serializers.SerializerMethodField()
+    main_image_srcset = serializers.SerializerMethodField()
     dimensions_image_url = serializers.SerializerMethodField()
+    dimensions_image_srcset = serializers.SerializerMethodField()
 
     class Meta:
         model = Product
@@ -21,8 +24,18 @@ class ProductSerializer(serializers.ModelSerializer):
             'price',
             'main_image',
             'main_image_url',
+            'main_image_srcset',
+            'main_image_width',
+            'main_image_height',
+            'main_image_placeholder',
+            'main_image_color',
             'dimensions_image',
             'dimensions_image_url',
+            'dimensions_image_srcset',
+            'dimensions_image_width',
+            'dimensions_image_height',
+            'dimensions_image_placeholder',
+            'dimensions_image_color',
             'order',
             'is_active',
             'created_at',
@@ -50,4 +63,25 @@ class ProductSerializer(serializers.ModelSerializer):
             if request:
                 return request.build_absolute_uri(obj.dimensions_image.url)
             return obj.dimensions_image.url
-        return None 
\ No newline at end of file
+        return None
+
+    def get_main_image_srcset(self, obj):
+        """
+        Return the resized variants of the main image as a srcset-ready list.
+        """
+        return self._get_srcset(obj.main_image, obj.main_image_variants)
+
+    def get_dimensions_image_srcset(self, obj):
+        """
+        Return the resized variants of the dimensions image as a srcset-ready list.
+        """
+        return self._get_srcset(obj.dimensions_image, obj.dimensions_image_variants)
+
+    def _get_srcset(self, field_file, variants):
+        request = self.context.get('request')
+
+        def media_url(name):
+            url = field_file.storage.url(name)
+            return request.build_absolute_uri(url) if request else url
+
+        return srcset_builder(media_url)(field_file.name, variants)
@@ -1,11 +1,13 @@
 from rest_framework import serializers
 from website.models.product_series_comparison_image_model import ProductSeriesComparisonImage
+from website.services.image_variants import srcset_builder
 
 class ProductSeriesComparisonImageSerializer(serializers.ModelSerializer):
     """
     Serializer for the ProductSeriesComparisonImage model.
     """
     image_url = serializers.SerializerMethodField()
+    image_srcset = serializers.SerializerMethodField()
 
     class Meta:
         model = ProductSeriesComparisonImage
@@ -14,6 +16,11 @@ class ProductSeriesComparisonImageSerializer(serializers.ModelSerializer):
             'name',
             'image',
             'image_url',
+            'image_srcset',
+            'image_width',
+            'image_height',
+            'image_placeholder',
+            'image_color',
             'is_active',
             'uploaded_at'
         ]
@@ -27,4 +34,16 @@ class ProductSeriesComparisonImageSerializer(serializers.ModelSerializer):
             if request:
                 return request.build_absolute_uri(obj.image.url)
             return obj.image.url
-        return None 
\ No newline at end of file
+        return None
+
+    def get_image_srcset(self, obj):
+        """
+        Return the resized variants of the image as a srcset-ready list.
+        """
+        request = self.context.get('request')
+
+        def media_url(name):
+            url = obj.image.storage.url(name)
+            return request.build_absolute_uri(url) if request else url
+
+        return srcset_builder(media_url)(obj.image.name, obj.image_variants)
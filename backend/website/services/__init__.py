@@ -0,0 +1 @@
+# Services package for website app
\ No newline at end of file
@@ -0,0 +1,167 @@
+import time
+from contextlib import contextmanager
+from django.conf import settings
+from django.core.cache import cache
+
+CATALOG_VERSION_KEY = 'website:catalog:version'
+CATALOG_PAYLOAD_KEY = 'website:catalog:payload:{version}:{base_url}'
+CATALOG_STATS_KEY = 'website:catalog:stats:{name}'
+CATALOG_DERIVED_KEY = 'website:catalog:{name}:{version}'
+PRODUCT_SLUG_KEY = 'website:product:slug:{slug}'
+PRODUCT_VERSION_KEY = 'website:product:version:{product_id}'
+PRODUCT_PAYLOAD_KEY = 'website:product:payload:{product_id}:{version}:{base_url}'
+
+# Counters exposed through get_catalog_cache_stats()
+CATALOG_STATS = ('hits', 'misses', 'rebuilds', 'rebuild_time_us', 'product_hits', 'product_misses')
+
+
+def _get_version(key):
+    """
+    Return the version number stored under key, initialising it on first use.
+    """
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, 1, timeout=None)
+        version = cache.get(key, 1)
+    return version
+
+
+def _bump_version(key):
+    """
+    Move the version stored under key forward.
+    """
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # The key was evicted or never set: start again from a fresh version
+        # that cannot collide with the entries written before the eviction.
+        version = time.time_ns()
+        cache.set(key, version, timeout=None)
+        return version
+
+
+def get_catalog_version():
+    """
+    Return the current catalog version, initialising it on first use.
+    """
+    return _get_version(CATALOG_VERSION_KEY)
+
+
+def bump_catalog_version():
+    """
+    Invalidate every cached catalog representation by moving to a new version.
+    Old entries are never read again and simply expire.
+    """
+    return _bump_version(CATALOG_VERSION_KEY)
+
+
+def bump_product_version(product_id):
+    """
+    Invalidate the cached detail representation of a single product.
+    """
+    return _bump_version(PRODUCT_VERSION_KEY.format(product_id=product_id))
+
+
+def get_product_version(product_id):
+    """
+    Return the current version of a product's detail entry.
+    """
+    return _get_version(PRODUCT_VERSION_KEY.format(product_id=product_id))
+
+
+def get_cached_product(slug, base_url):
+    """
+    Return the cached detail entry for a product slug and base URL, or None.
+    Costs two cache reads and no database queries.
+    """
+    product_id = cache.get(PRODUCT_SLUG_KEY.format(slug=slug))
+    if product_id is None:
+        return None
+    version = get_product_version(product_id)
+    entry = cache.get(PRODUCT_PAYLOAD_KEY.format(product_id=product_id, version=version, base_url=base_url))
+    if entry is not None and entry['data']['slug'] != slug:
+        # The product was renamed since the slug was mapped
+        cache.delete(PRODUCT_SLUG_KEY.format(slug=slug))
+        return None
+    return entry
+
+
+def set_cached_product(slug, base_url, entry, version):
+    """
+    Store the detail entry of a product under `version`, which must be read
+    with get_product_version() before the entry is built: a save committed
+    meanwhile bumps the version, so the stale entry is never read.
+    """
+    timeout = getattr(settings, 'CATALOG_CACHE_TIMEOUT', 60 * 60 * 24)
+    product_id = entry['data']['id']
+    cache.set(PRODUCT_SLUG_KEY.format(slug=slug), product_id, timeout=timeout)
+    cache.set(PRODUCT_PAYLOAD_KEY.format(product_id=product_id, version=version, base_url=base_url), entry, timeout=timeout)
+
+
+def get_cached_catalog(version, base_url):
+    """
+    Return the cached catalog payload for the given version and base URL, or None.
+    """
+    return cache.get(CATALOG_PAYLOAD_KEY.format(version=version, base_url=base_url))
+
+
+def set_cached_catalog(version, base_url, payload):
+    """
+    Store a catalog payload for the given version and base URL.
+    """
+    cache.set(
+        CATALOG_PAYLOAD_KEY.format(version=version, base_url=base_url),
+        payload,
+        timeout=getattr(settings, 'CATALOG_CACHE_TIMEOUT', 60 * 60 * 24),
+    )
+
+
+def get_or_build_versioned(name, builder):
+    """
+    Return a value derived from the catalog (a count, an index...), computing it
+    with builder() at most once per catalog version.
+    """
+    version = get_catalog_version()
+    key = CATALOG_DERIVED_KEY.format(name=name, version=version)
+    value = cache.get(key)
+    if value is None:
+        value = builder()
+        cache.set(key, value, timeout=getattr(settings, 'CATALOG_CACHE_TIMEOUT', 60 * 60 * 24))
+    return value
+
+
+def incr_catalog_stat(name, delta=1):
+    """
+    Increment one of the shared catalog cache counters.
+    """
+    key = CATALOG_STATS_KEY.format(name=name)
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        cache.set(key, delta, timeout=None)
+
+
+@contextmanager
+def track_catalog_rebuild():
+    """
+    Context manager that records a cache miss and the time spent rebuilding.
+    """
+    incr_catalog_stat('misses')
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        incr_catalog_stat('rebuilds')
+        incr_catalog_stat('rebuild_time_us', int((time.perf_counter() - start) * 1_000_000))
+
+
+def get_catalog_cache_stats():
+    """
+    Return the catalog cache counters together with the current version.
+    """
+    keys = {CATALOG_STATS_KEY.format(name=name): name for name in CATALOG_STATS}
+    values = cache.get_many(keys.keys())
+    stats = {name: values.get(key, 0) for key, name in keys.items()}
+    stats['version'] = get_catalog_version()
+    return stats
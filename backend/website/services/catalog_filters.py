@@ -0,0 +1,40 @@
+import re
+from django.db.models import Exists, OuterRef
+from rest_framework.exceptions import ValidationError
+from website.models.product_specification_model import ProductSpecification
+from website.services.spec_values import parse_number
+
+# ?spec[<SpecificationType name>]__<lookup>=<number>, e.g. ?spec[Caudal máximo]__gte=200
+SPEC_FILTER_PARAM = re.compile(r'^spec\[(?P<name>[^\]]+)\](?:__(?P<lookup>gte|lte|gt|lt))?$')
+
+
+def has_spec_filters(params):
+    """
+    Return True if the query string contains any spec[...] range filter.
+    """
+    return any(SPEC_FILTER_PARAM.match(key) for key in params)
+
+
+def apply_spec_filters(queryset, params):
+    """
+    Filter a Product queryset by the numeric value of its specifications.
+    Each filter is an EXISTS subquery on (specification_type, numeric_value),
+    which the spec_type_numeric_value_idx index serves. Values are compared in
+    the unit of the SpecificationType and accept a comma decimal separator.
+    """
+    for key, values in params.lists():
+        match = SPEC_FILTER_PARAM.match(key)
+        if match is None:
+            continue
+        lookup = match.group('lookup') or 'exact'
+        for raw_value in values:
+            number = parse_number(raw_value.strip())
+            if number is None:
+                raise ValidationError({key: ['A valid number is required.']})
+            specifications = ProductSpecification.objects.filter(
+                product=OuterRef('pk'),
+                specification_type__name=match.group('name'),
+                **{f'numeric_value__{lookup}': number},
+            )
+            queryset = queryset.filter(Exists(specifications))
+    return queryset
@@ -0,0 +1,280 @@
+"""
+Bulk catalog import.
+
+Loads products and their specifications from CSV, XLSX or JSON and writes
+them with a handful of set-based statements inside one transaction:
+specification types are resolved with one query (missing ones are created
+in bulk), products are upserted by slug and specifications by their
+(product, specification_type) pair. Bulk writes bypass Model.save() and the
+post_save signals, so numeric_value is parsed here, Product.specs_cache is
+rebuilt and the catalog caches are invalidated explicitly once the transaction
+commits.
+
+CSV / XLSX layout: one row per product with the columns title, slug,
+initial_text, description, price, order, is_active, plus one column per
+specification named "spec:<name>" or "spec:<name> [<unit>]"; empty cells are
+skipped. JSON: a list of product objects (or {"products": [...]}) whose
+"specifications" is a list of {"name", "value", "unit"} or a {name: value} map.
+"""
+import csv
+import json
+import os
+import re
+import time
+from decimal import Decimal, InvalidOperation
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils.text import slugify
+from website.models.product_model import RESERVED_PRODUCT_SLUGS, Product
+from website.models.product_specification_model import ProductSpecification
+from website.models.specification_type_model import SpecificationType
+from website.services.spec_values import parse_number, parse_spec_value
+from website.services.specs_cache import rebuild_specs_cache
+from website.signals import catalog_bulk_changed
+
+try:
+    import openpyxl
+except ImportError:  # openpyxl is optional, only needed for .xlsx files
+    openpyxl = None
+
+IMPORT_FORMATS = ('csv', 'json', 'xlsx')
+# Columns overwritten when an existing product (same slug) is imported again
+PRODUCT_UPDATE_FIELDS = ('title', 'initial_text', 'description', 'price', 'order', 'is_active', 'updated_at')
+SPEC_COLUMN = re.compile(r'^spec:\s*(?P<name>.+?)\s*(?:\[(?P<unit>[^\]]*)\])?\s*$')
+# Product fields whose model validators (slug format, max_length, max_digits) run on every row
+VALIDATED_FIELDS = ('title', 'slug', 'price', 'order')
+TRUE_VALUES = {'1', 'true', 'yes', 'si', 'sí', 'x'}
+FALSE_VALUES = {'0', 'false', 'no', ''}
+
+
+class CatalogImportError(Exception):
+    """
+    The import file is unreadable or one of its rows is invalid.
+    """
+
+
+def _text(value):
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def _parse_bool(value, row_number):
+    text = _text(value).lower()
+    if text in TRUE_VALUES:
+        return True
+    if text in FALSE_VALUES:
+        return False
+    raise CatalogImportError(f'Row {row_number}: is_active must be true or false, got {value!r}.')
+
+
+def _normalize_product(raw, specifications, row_number):
+    """
+    Validate one product row and return (product field values, [(name, unit, value)]).
+    """
+    title = _text(raw.get('title'))
+    if not title:
+        raise CatalogImportError(f'Row {row_number}: title is required.')
+    price = parse_number(_text(raw.get('price')))
+    if price is None:
+        raise CatalogImportError(f'Row {row_number}: a numeric price is required.')
+    order = _text(raw.get('order')) or '0'
+    if not order.isdigit():
+        raise CatalogImportError(f'Row {row_number}: order must be a non-negative integer.')
+
+    try:
+        price = price.quantize(Decimal('0.01'))
+    except InvalidOperation:
+        raise CatalogImportError(f'Row {row_number}: price {price} is out of range.')
+
+    slug = _text(raw.get('slug')) or slugify(title)
+    if slug in RESERVED_PRODUCT_SLUGS:
+        raise CatalogImportError(f'Row {row_number}: the slug {slug!r} is reserved.')
+
+    fields = {
+        'title': title,
+        'slug': slug,
+        'initial_text': _text(raw.get('initial_text')) or None,
+        'description': _text(raw.get('description')),
+        'price': price,
+        'order': int(order),
+        'is_active': _parse_bool(raw['is_active'], row_number) if 'is_active' in raw and raw['is_active'] is not None else True,
+    }
+    # bulk_create does not run the model validators, so check here what the database would
+    # reject (or silently accept) only once the whole file is being written
+    for name in VALIDATED_FIELDS:
+        try:
+            Product._meta.get_field(name).run_validators(fields[name])
+        except ValidationError as error:
+            raise CatalogImportError(f'Row {row_number}: {name} {fields[name]!r}: {" ".join(error.messages)}')
+    specifications = [
+        (_text(name), _text(unit) or None, _text(value))
+        for name, unit, value in specifications
+        if _text(name) and _text(value)
+    ]
+    return fields, specifications
+
+
+def _tabular_records(header, rows):
+    """
+    Normalize CSV/XLSX rows given the header row.
+    """
+    header = [_text(column) for column in header]
+    spec_columns = {}
+    for index, column in enumerate(header):
+        match = SPEC_COLUMN.match(column)
+        if match:
+            spec_columns[index] = (match['name'], match['unit'])
+
+    records = []
+    for row_number, row in enumerate(rows, start=2):
+        if not any(_text(cell) for cell in row):
+            continue
+        raw = {column: row[index] for index, column in enumerate(header) if index < len(row) and index not in spec_columns}
+        specifications = [
+            (name, unit, row[index] if index < len(row) else None)
+            for index, (name, unit) in spec_columns.items()
+        ]
+        records.append(_normalize_product(raw, specifications, row_number))
+    return records
+
+
+def _read_csv(path):
+    with open(path, newline='', encoding='utf-8-sig') as handle:
+        reader = csv.reader(handle)
+        header = next(reader, None)
+        if header is None:
+            return []
+        return _tabular_records(header, reader)
+
+
+def _read_xlsx(path):
+    if openpyxl is None:
+        raise CatalogImportError('Importing .xlsx files requires the openpyxl package.')
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return []
+        return _tabular_records(header, rows)
+    finally:
+        workbook.close()
+
+
+def _read_json(path):
+    with open(path, encoding='utf-8') as handle:
+        try:
+            data = json.load(handle)
+        except json.JSONDecodeError as error:
+            raise CatalogImportError(f'Invalid JSON: {error}')
+    if isinstance(data, dict):
+        data = data.get('products', [])
+    if not isinstance(data, list):
+        raise CatalogImportError('The JSON file must hold a list of products or {"products": [...]}.')
+
+    records = []
+    for row_number, raw in enumerate(data, start=1):
+        if not isinstance(raw, dict):
+            raise CatalogImportError(f'Row {row_number}: a product must be an object, got {raw!r}.')
+        specifications = raw.get('specifications') or []
+        if isinstance(specifications, dict):
+            specifications = [(name, None, value) for name, value in specifications.items()]
+        elif isinstance(specifications, list) and all(isinstance(spec, dict) for spec in specifications):
+            specifications = [(spec.get('name'), spec.get('unit'), spec.get('value')) for spec in specifications]
+        else:
+            raise CatalogImportError(f'Row {row_number}: specifications must be a list of objects or an object.')
+        records.append(_normalize_product(raw, specifications, row_number))
+    return records
+
+
+def read_catalog_file(path, file_format=None):
+    """
+    Read and validate an import file; the format defaults to the file extension.
+    Returns a list of (product field values, [(spec name, unit, value)]).
+    """
+    file_format = file_format or os.path.splitext(path)[1].lstrip('.').lower()
+    readers = {'csv': _read_csv, 'json': _read_json, 'xlsx': _read_xlsx}
+    if file_format not in readers:
+        raise CatalogImportError(f'Unsupported format {file_format!r}; use one of {", ".join(IMPORT_FORMATS)}.')
+    return readers[file_format](path)
+
+
+def _resolve_specification_types(records):
+    """
+    Return ({name: SpecificationType}, number created) for every specification in
+    the records, with one SELECT plus one bulk INSERT for the types that do not exist yet.
+    Existing types keep their unit.
+    """
+    units = {}
+    for _, specifications in records:
+        for name, unit, _ in specifications:
+            units.setdefault(name, unit)
+
+    spec_types = {spec_type.name: spec_type for spec_type in SpecificationType.objects.filter(name__in=units)}
+    missing = [SpecificationType(name=name, unit=unit) for name, unit in units.items() if name not in spec_types]
+    if missing:
+        SpecificationType.objects.bulk_create(missing)
+        spec_types.update(
+            (spec_type.name, spec_type)
+            for spec_type in SpecificationType.objects.filter(name__in=[spec_type.name for spec_type in missing])
+        )
+    return spec_types, len(missing)
+
+
+def import_catalog(records, batch_size=None):
+    """
+    Upsert the products and specifications of `records` (see read_catalog_file)
+    in one transaction. Returns a dict with the number of products,
+    specifications and created specification types, and the elapsed seconds.
+    """
+    batch_size = batch_size or settings.CATALOG_IMPORT_BATCH_SIZE
+    start = time.perf_counter()
+
+    # A slug listed twice keeps its last row; one upsert statement cannot touch a row twice
+    by_slug = {fields['slug']: (fields, specifications) for fields, specifications in records}
+
+    with transaction.atomic():
+        spec_types, created_types = _resolve_specification_types(by_slug.values())
+
+        Product.objects.bulk_create(
+            [Product(**fields) for fields, _ in by_slug.values()],
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=['slug'],
+            update_fields=PRODUCT_UPDATE_FIELDS,
+        )
+        product_ids = dict(Product.objects.filter(slug__in=by_slug).values_list('slug', 'id'))
+
+        specifications = {}
+        for slug, (_, product_specifications) in by_slug.items():
+            for name, _, value in product_specifications:
+                spec_type = spec_types[name]
+                # Model.save() is bypassed, so parse the numeric value here
+                specifications[product_ids[slug], spec_type.pk] = ProductSpecification(
+                    product_id=product_ids[slug],
+                    specification_type=spec_type,
+                    value=value,
+                    numeric_value=parse_spec_value(value, spec_type.unit),
+                )
+        ProductSpecification.objects.bulk_create(
+            specifications.values(),
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=['product', 'specification_type'],
+            update_fields=['value', 'numeric_value'],
+        )
+        rebuild_specs_cache(product_ids.values(), batch_size)
+
+        # The bulk statements sent no post_save signals
+        transaction.on_commit(lambda: catalog_bulk_changed(product_ids.values()))
+
+    return {
+        'products': len(by_slug),
+        'specifications': len(specifications),
+        'created_specification_types': created_types,
+        'seconds': time.perf_counter() - start,
+    }
@@ -0,0 +1,90 @@
+import base64
+import json
+from django.conf import settings
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+from website.serializers.catalog_fast_serializer import PRODUCT_OUTPUT_FIELDS
+
+# Query parameters that switch products_list to the paginated, sparse mode
+PAGINATION_PARAMS = ('cursor', 'limit', 'fields', 'expand', 'include_total')
+
+# Keyset used for pagination: Product.Meta.ordering plus id as a tie-breaker
+PRODUCT_KEYSET = ('order', 'title', 'id')
+
+EXPANDABLE_FIELDS = ('specifications',)
+
+
+def encode_cursor(row):
+    """
+    Encode the keyset values of the last row of a page as an opaque cursor.
+    """
+    key = [row[field] for field in PRODUCT_KEYSET]
+    return base64.urlsafe_b64encode(json.dumps(key, separators=(',', ':')).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor produced by encode_cursor() into (order, title, id).
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        order, title, pk = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(order, int) or not isinstance(title, str) or not isinstance(pk, int):
+            raise TypeError
+        # Out of the range of the integer columns, which some databases reject with an error
+        if not (0 <= order < 2 ** 63 and 0 <= pk < 2 ** 63):
+            raise ValueError
+    except (ValueError, TypeError):
+        raise ValidationError({'cursor': ['Invalid cursor.']})
+    return order, title, pk
+
+
+def after_cursor(queryset, cursor):
+    """
+    Restrict an (order, title, id) ordered queryset to the rows after the cursor.
+    The OR-expanded row comparison is portable and can use the keyset index.
+    """
+    order, title, pk = decode_cursor(cursor)
+    return queryset.filter(
+        Q(order__gt=order)
+        | Q(order=order, title__gt=title)
+        | Q(order=order, title=title, id__gt=pk)
+    )
+
+
+def parse_page_size(value):
+    """
+    Validate the `limit` query parameter against PRODUCTS_MAX_PAGE_SIZE.
+    """
+    if value is None:
+        return settings.PRODUCTS_PAGE_SIZE
+    try:
+        limit = int(value)
+    except ValueError:
+        raise ValidationError({'limit': ['A valid integer is required.']})
+    if not 1 <= limit <= settings.PRODUCTS_MAX_PAGE_SIZE:
+        raise ValidationError({'limit': [f'Ensure this value is between 1 and {settings.PRODUCTS_MAX_PAGE_SIZE}.']})
+    return limit
+
+
+def parse_product_fields(fields_param, expand_param):
+    """
+    Resolve `fields=` and `expand=` into the ordered tuple of output fields.
+    Without `fields` every field is returned except the expandable ones, which
+    must be requested explicitly (e.g. expand=specifications).
+    """
+    expand = [name for name in (expand_param or '').split(',') if name]
+    unknown = [name for name in expand if name not in EXPANDABLE_FIELDS]
+    if unknown:
+        raise ValidationError({'expand': [f"Unknown field(s): {', '.join(unknown)}."]})
+
+    if fields_param:
+        requested = [name for name in fields_param.split(',') if name]
+        unknown = [name for name in requested if name not in PRODUCT_OUTPUT_FIELDS]
+        if unknown:
+            raise ValidationError({'fields': [f"Unknown field(s): {', '.join(unknown)}."]})
+    else:
+        requested = [name for name in PRODUCT_OUTPUT_FIELDS if name not in EXPANDABLE_FIELDS]
+
+    selected = set(requested) | set(expand)
+    return tuple(name for name in PRODUCT_OUTPUT_FIELDS if name in selected)
@@ -0,0 +1,171 @@
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+from django.conf import settings
+from django.db import transaction
+from django.http import HttpRequest
+from django.utils.crypto import get_random_string
+from rest_framework.renderers import JSONRenderer
+from website.services.catalog_cache import get_catalog_version
+from website.services.compression import brotli_compress, gzip_compress
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_PREFIX = 'catalog.'
+CURRENT_NAME = 'current.json'
+
+_published = threading.local()
+
+
+def _atomic_write(path, data):
+    """
+    Write bytes to path through a temporary file in the same directory.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as tmp_file:
+            tmp_file.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def _atomic_symlink(target_name, link_path):
+    """
+    Point link_path at target_name, replacing any previous link in one rename.
+    """
+    # Unique per call: threads of one process publish concurrently too
+    tmp_link = link_path.with_name(f'.tmp-{link_path.name}-{os.getpid()}-{get_random_string(8)}')
+    os.symlink(target_name, tmp_link)
+    os.replace(tmp_link, link_path)
+
+
+class _CatalogRequest(HttpRequest):
+    """
+    Request handed to the serializers outside of a real request, so absolute
+    URLs are built from a configured base URL. The host comes from settings
+    and is trusted as is (no ALLOWED_HOSTS check).
+    """
+
+    def __init__(self, base_url):
+        super().__init__()
+        parts = urlsplit(base_url)
+        self.method = 'GET'
+        self.path = self.path_info = '/api/products/'
+        self.META['HTTP_HOST'] = parts.netloc
+        self._base_scheme = parts.scheme
+        self._base_host = parts.netloc
+
+    def _get_scheme(self):
+        return self._base_scheme
+
+    def get_host(self):
+        return self._base_host
+
+
+def build_catalog_request(base_url):
+    """
+    Build a GET /api/products/ request whose absolute URLs start with base_url.
+    """
+    return _CatalogRequest(base_url)
+
+
+def render_catalog_json(base_url):
+    """
+    Render the products_list payload exactly as the API would for base_url.
+    """
+    # Imported here to avoid a circular import with the signal handlers
+    from website.views.product_view import build_catalog_data
+
+    return JSONRenderer().render(build_catalog_data(build_catalog_request(base_url)))
+
+
+def publish_catalog_snapshot(publish_dir=None, base_url=None, keep=None):
+    """
+    Render the catalog to a content-versioned JSON file with .gz/.br siblings and
+    atomically move the current.json pointers to it.
+    Returns a dict describing the published snapshot.
+    """
+    publish_dir = Path(publish_dir or settings.CATALOG_SNAPSHOT_ROOT)
+    base_url = base_url or settings.CATALOG_SNAPSHOT_BASE_URL
+    keep = settings.CATALOG_SNAPSHOT_KEEP if keep is None else keep
+    publish_dir.mkdir(parents=True, exist_ok=True)
+
+    start = time.perf_counter()
+    payload = render_catalog_json(base_url)
+    render_time = time.perf_counter() - start
+
+    version = hashlib.sha256(payload).hexdigest()[:16]
+    json_name = f'{SNAPSHOT_PREFIX}{version}.json'
+    variants = {'': payload, '.gz': gzip_compress(payload)}
+    brotli_payload = brotli_compress(payload)
+    if brotli_payload is not None:
+        variants['.br'] = brotli_payload
+
+    for suffix, data in variants.items():
+        path = publish_dir / f'{json_name}{suffix}'
+        if not path.exists():
+            _atomic_write(path, data)
+
+    # Swap the compressed pointers first so current.json never points at a
+    # version whose siblings are missing
+    for suffix in sorted(variants, reverse=True):
+        _atomic_symlink(f'{json_name}{suffix}', publish_dir / f'{CURRENT_NAME}{suffix}')
+    stale_br = publish_dir / f'{CURRENT_NAME}.br'
+    if '.br' not in variants and stale_br.is_symlink():
+        stale_br.unlink()
+
+    _prune_snapshots(publish_dir, keep, json_name)
+
+    return {
+        'version': version,
+        'path': publish_dir / json_name,
+        'render_time': render_time,
+        'sizes': {suffix or '.json': len(data) for suffix, data in variants.items()},
+    }
+
+
+def _prune_snapshots(publish_dir, keep, current_name):
+    """
+    Delete all but the newest `keep` snapshot versions, never the current one.
+    """
+    snapshots = sorted(
+        publish_dir.glob(f'{SNAPSHOT_PREFIX}*.json'),
+        key=lambda path: path.stat().st_mtime,
+        reverse=True,
+    )
+    for path in snapshots[keep:]:
+        if path.name == current_name:
+            continue
+        for suffix in ('', '.gz', '.br'):
+            sibling = path.with_name(path.name + suffix)
+            if sibling.exists():
+                sibling.unlink()
+
+
+def schedule_catalog_snapshot():
+    """
+    Publish a new snapshot once the current transaction commits.
+    Several catalog saves in one transaction (e.g. a product and its inline
+    specifications in the admin) end on the same catalog version, so only the
+    first callback publishes.
+    """
+    def _publish():
+        version = get_catalog_version()
+        if getattr(_published, 'catalog_version', None) == version:
+            return
+        try:
+            publish_catalog_snapshot()
+        except Exception:
+            logger.exception('Error publishing catalog snapshot')
+        else:
+            _published.catalog_version = version
+
+    transaction.on_commit(_publish)
@@ -0,0 +1,104 @@
+import datetime
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ValidationError
+from website.models.catalog_tombstone_model import CatalogTombstone
+from website.models.product_model import Product
+from website.models.product_series_comparison_image_model import ProductSeriesComparisonImage
+from website.serializers.catalog_fast_serializer import serialize_comparison_images, serialize_products
+
+# Query parameters that switch products_list to the incremental sync mode
+SYNC_PARAMS = ('updated_since', 'since_version')
+
+
+def to_sync_version(moment):
+    """
+    Encode a datetime as the integer sync version handed out to clients (µs since epoch).
+    """
+    return int(moment.timestamp() * 1_000_000)
+
+
+def from_sync_version(version):
+    """
+    Decode a sync version produced by to_sync_version().
+    """
+    return datetime.datetime.fromtimestamp(version / 1_000_000, tz=datetime.timezone.utc)
+
+
+def parse_sync_point(params):
+    """
+    Return the aware datetime a client last synced at, from either
+    `since_version` (as returned by a previous sync) or `updated_since` (ISO 8601).
+    """
+    if params.get('since_version'):
+        try:
+            return from_sync_version(int(params['since_version']))
+        except (ValueError, OverflowError, OSError):
+            raise ValidationError({'since_version': ['A valid sync version is required.']})
+
+    try:
+        since = parse_datetime(params.get('updated_since', ''))
+    except ValueError:
+        # Well formed but not a real date, e.g. 2024-02-30T00:00:00
+        since = None
+    if since is None:
+        raise ValidationError({'updated_since': ['A valid ISO 8601 datetime is required.']})
+    if timezone.is_naive(since):
+        since = timezone.make_aware(since, datetime.timezone.utc)
+    return since
+
+
+def record_tombstone(object_type, object_id):
+    """
+    Log the deletion of a catalog row and drop tombstones past their retention.
+    """
+    CatalogTombstone.objects.create(object_type=object_type, object_id=object_id)
+    horizon = timezone.now() - datetime.timedelta(days=settings.CATALOG_TOMBSTONE_RETENTION_DAYS)
+    CatalogTombstone.objects.filter(deleted_at__lt=horizon).delete()
+
+
+def build_catalog_delta(request, since):
+    """
+    Return the catalog changes after `since`: changed active products and
+    comparison images, plus the ids of deleted or deactivated ones.
+    When `since` is older than the tombstone retention the full catalog is
+    returned with "full": true and the client must replace its copy.
+    """
+    # Taken before querying, so rows committed while this runs are picked up
+    # by the next sync instead of being skipped
+    sync_point = timezone.now()
+    horizon = sync_point - datetime.timedelta(days=settings.CATALOG_TOMBSTONE_RETENTION_DAYS)
+    full = since < horizon
+
+    products = Product.objects.filter(is_active=True)
+    comparison_images = ProductSeriesComparisonImage.objects.filter(is_active=True)
+    deleted_products = []
+    deleted_comparison_images = []
+
+    if not full:
+        # Re-send a short overlap window: repeated rows are harmless, rows from
+        # transactions that committed late with an older timestamp are not lost
+        since = since - datetime.timedelta(seconds=settings.CATALOG_SYNC_OVERLAP_SECONDS)
+        products = products.filter(updated_at__gt=since)
+        comparison_images = comparison_images.filter(updated_at__gt=since)
+
+        tombstones = CatalogTombstone.objects.filter(deleted_at__gt=since).values_list('object_type', 'object_id')
+        for object_type, object_id in tombstones:
+            if object_type == CatalogTombstone.PRODUCT:
+                deleted_products.append(object_id)
+            else:
+                deleted_comparison_images.append(object_id)
+        deleted_products += Product.objects.filter(is_active=False, updated_at__gt=since).values_list('id', flat=True)
+        deleted_comparison_images += ProductSeriesComparisonImage.objects.filter(
+            is_active=False, updated_at__gt=since
+        ).values_list('id', flat=True)
+
+    return {
+        'products': serialize_products(products, request),
+        'comparison_images': serialize_comparison_images(comparison_images, request),
+        'deleted_products': sorted(set(deleted_products)),
+        'deleted_comparison_images': sorted(set(deleted_comparison_images)),
+        'full': full,
+        'sync_version': to_sync_version(sync_point),
+    }
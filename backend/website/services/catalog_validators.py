@@ -0,0 +1,39 @@
+import hashlib
+from django.db.models import Count, Max, Q, Value
+from website.models.product_model import Product
+from website.models.product_series_comparison_image_model import ProductSeriesComparisonImage
+
+
+def _catalog_aggregate(model):
+    """
+    One-row aggregate with the last change and the number of active rows of a model.
+    The maximum covers inactive rows too, so toggling is_active changes it.
+    """
+    return (
+        model.objects.order_by()
+        .values(source=Value(model._meta.model_name))
+        .annotate(last_modified=Max('updated_at'), total=Count('id', filter=Q(is_active=True)))
+    )
+
+
+def get_catalog_validators(base_url):
+    """
+    Return the (etag, last_modified) pair describing the current public catalog.
+    Both aggregates are fetched with a single UNION query, so no rows are loaded.
+    """
+    rows = list(
+        _catalog_aggregate(Product).union(_catalog_aggregate(ProductSeriesComparisonImage), all=True)
+    )
+
+    timestamps = [row['last_modified'] for row in rows if row['last_modified'] is not None]
+    last_modified = max(timestamps) if timestamps else None
+
+    # Absolute image URLs depend on the host, so it is part of the validator
+    fingerprint = '|'.join(
+        [base_url] + [
+            f"{row['source']}:{row['last_modified'].isoformat() if row['last_modified'] else ''}:{row['total']}"
+            for row in sorted(rows, key=lambda row: row['source'])
+        ]
+    )
+    etag = 'W/"%s"' % hashlib.md5(fingerprint.encode(), usedforsecurity=False).hexdigest()
+    return etag, last_modified
@@ -0,0 +1,78 @@
+import hashlib
+from django.conf import settings
+from rest_framework.exceptions import ValidationError
+from website.models.product_model import Product
+from website.services.catalog_cache import get_or_build_versioned
+
+
+def build_comparison_matrix(slugs=None):
+    """
+    Build the product comparison table as a columnar matrix with one query:
+    one column per product (display order) and one row per SpecificationType
+    (ordered by SpecificationType.id, the order of the client's table) whose
+    name and unit are sent once, with a value (or None) per product.
+    Products without specifications still get a column (LEFT JOIN).
+    """
+    rows = Product.objects.filter(is_active=True)
+    if slugs is not None:
+        rows = rows.filter(slug__in=slugs)
+    rows = rows.order_by('order', 'title', 'id', 'specifications__specification_type_id').values_list(
+        'id', 'title', 'slug',
+        'specifications__specification_type_id',
+        'specifications__specification_type__name',
+        'specifications__specification_type__unit',
+        'specifications__value',
+    )
+
+    columns = {}
+    spec_types = {}
+    values = {}
+    for product_id, title, slug, type_id, name, unit, value in rows:
+        columns.setdefault(product_id, {'id': product_id, 'title': title, 'slug': slug})
+        if type_id is None:
+            continue
+        spec_types.setdefault(type_id, (name, unit))
+        values[product_id, type_id] = value
+
+    return {
+        'products': list(columns.values()),
+        'specifications': [
+            {
+                'name': name,
+                'unit': unit,
+                'values': [values.get((product_id, type_id)) for product_id in columns],
+            }
+            for type_id, (name, unit) in sorted(spec_types.items())
+        ],
+    }
+
+
+def get_active_slugs():
+    """
+    Return the set of active product slugs, cached per catalog version.
+    """
+    return get_or_build_versioned(
+        'compare:slugs', lambda: set(Product.objects.filter(is_active=True).values_list('slug', flat=True))
+    )
+
+
+def get_comparison_matrix(slugs=None):
+    """
+    Return the comparison matrix for the given slugs (all active products when
+    None), cached per catalog version. Repeated slugs are compared once. The
+    slugs are checked before anything is built or cached: more than
+    COMPARE_MAX_PRODUCTS of them, or one that names no active product, raises
+    ValidationError.
+    """
+    if slugs is None:
+        return get_or_build_versioned('compare:all', build_comparison_matrix)
+
+    slugs = sorted(set(slugs))
+    if len(slugs) > settings.COMPARE_MAX_PRODUCTS:
+        raise ValidationError({'slugs': [f'At most {settings.COMPARE_MAX_PRODUCTS} products can be compared.']})
+    unknown = set(slugs).difference(get_active_slugs())
+    if unknown:
+        raise ValidationError({'slugs': [f"Unknown product(s): {', '.join(sorted(unknown))}."]})
+
+    name = 'compare:' + hashlib.md5(','.join(slugs).encode(), usedforsecurity=False).hexdigest()
+    return get_or_build_versioned(name, lambda: build_comparison_matrix(slugs))
@@ -0,0 +1,23 @@
+import gzip
+
+try:
+    import brotli
+except ImportError:  # brotli is optional
+    brotli = None
+
+
+def gzip_compress(data):
+    """
+    Compress bytes with gzip at the highest level (done once per payload).
+    A fixed mtime keeps the output reproducible for identical input.
+    """
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def brotli_compress(data):
+    """
+    Compress bytes with brotli, or return None when brotli is not installed.
+    """
+    if brotli is None:
+        return None
+    return brotli.compress(data, quality=11)
@@ -0,0 +1,114 @@
+import csv
+import datetime
+import json
+import logging
+import re
+import time
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+from website.models.contact_model import Contact
+
+logger = logging.getLogger(__name__)
+
+CONTACT_EXPORT_FIELDS = ('id', 'name', 'phone', 'email', 'message', 'created_at')
+CONTACT_EXPORT_FORMATS = ('csv', 'jsonl')
+# Leading characters that make spreadsheet applications read a CSV cell as a formula
+CSV_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+# A signed number such as the phone '+57 300 123 4567' is data, not a formula
+SIGNED_NUMBER = re.compile(r'[+-][\d ]*\d[\d ]*')
+
+
+class _Echo:
+    """
+    File-like object whose write() hands the formatted CSV row back to the caller.
+    """
+
+    def write(self, value):
+        return value
+
+
+def parse_export_bound(name, value):
+    """
+    Parse a since/until bound given as an ISO 8601 datetime or a date (midnight,
+    current time zone). Returns None for an empty value.
+    """
+    if not value:
+        return None
+    # Well-formed but impossible values (2025-02-30) raise ValueError
+    try:
+        moment = parse_datetime(value)
+        if moment is None:
+            date = parse_date(value)
+            moment = None if date is None else datetime.datetime.combine(date, datetime.time.min)
+    except ValueError:
+        moment = None
+    if moment is None:
+        raise ValidationError({name: ['A valid ISO 8601 date or datetime is required.']})
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def csv_safe(value):
+    """
+    Quote a text cell that a spreadsheet would otherwise evaluate as a formula
+    (name and message are user input). Phone numbers like '+57 300 123 4567'
+    are left as they are.
+    """
+    if isinstance(value, str) and value.startswith(CSV_FORMULA_PREFIXES) and not SIGNED_NUMBER.fullmatch(value):
+        return "'" + value
+    return value
+
+
+def export_record(row):
+    """
+    JSON-ready dict for a row of CONTACT_EXPORT_FIELDS.
+    """
+    record = dict(zip(CONTACT_EXPORT_FIELDS, row))
+    record['created_at'] = record['created_at'].isoformat()
+    return record
+
+
+def get_export_queryset(since=None, until=None):
+    """
+    Contacts created in [since, until), oldest first, as tuples of CONTACT_EXPORT_FIELDS.
+    """
+    contacts = Contact.objects.all()
+    if since is not None:
+        contacts = contacts.filter(created_at__gte=since)
+    if until is not None:
+        contacts = contacts.filter(created_at__lt=until)
+    return contacts.order_by('created_at', 'id').values_list(*CONTACT_EXPORT_FIELDS)
+
+
+def iter_contact_export(queryset, export_format, chunk_size=None, stats=None):
+    """
+    Yield the export one line at a time, reading the rows with a server-side
+    iterator so memory use does not grow with the table.
+    When given, `stats` is filled with the row count, elapsed seconds and rows/sec
+    once the export is exhausted.
+    """
+    chunk_size = chunk_size or settings.CONTACT_EXPORT_CHUNK_SIZE
+    stats = {} if stats is None else stats
+    created_at_index = CONTACT_EXPORT_FIELDS.index('created_at')
+    rows = 0
+    start = time.perf_counter()
+
+    if export_format == 'csv':
+        writer = csv.writer(_Echo())
+        yield writer.writerow(CONTACT_EXPORT_FIELDS)
+        for row in queryset.iterator(chunk_size=chunk_size):
+            row = [csv_safe(value) for value in row]
+            row[created_at_index] = row[created_at_index].isoformat()
+            yield writer.writerow(row)
+            rows += 1
+    else:
+        for row in queryset.iterator(chunk_size=chunk_size):
+            yield json.dumps(export_record(row), ensure_ascii=False) + '\n'
+            rows += 1
+
+    elapsed = time.perf_counter() - start
+    stats.update(rows=rows, seconds=elapsed, rows_per_second=rows / elapsed if elapsed else 0.0)
+    logger.info('Exported %d contacts as %s in %.2f s (%.0f rows/s)', rows, export_format, elapsed, stats['rows_per_second'])
@@ -0,0 +1,56 @@
+import hashlib
+from django.conf import settings
+from django.core.cache import cache
+
+CONTACT_DUPLICATE_KEY = 'website:contact:duplicate:{fingerprint}'
+CONTACT_STATS_KEY = 'website:contact:stats:{name}'
+CONTACT_STATS = ('accepted', 'duplicates', 'rejected_ip', 'rejected_email')
+
+
+def incr_contact_stat(name, delta=1):
+    """
+    Increment one of the shared contact endpoint counters.
+    """
+    key = CONTACT_STATS_KEY.format(name=name)
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        cache.set(key, delta, timeout=None)
+
+
+def get_contact_stats():
+    """
+    Return the contact endpoint counters.
+    """
+    keys = {CONTACT_STATS_KEY.format(name=name): name for name in CONTACT_STATS}
+    values = cache.get_many(keys.keys())
+    return {name: values.get(key, 0) for key, name in keys.items()}
+
+
+def _submission_key(data):
+    """
+    Cache key identifying a submission by its normalised (email, message) pair.
+    """
+    email = str(data.get('email') or '').strip().lower()
+    message = ' '.join(str(data.get('message') or '').split())
+    fingerprint = hashlib.sha256(f'{email}\0{message}'.encode()).hexdigest()
+    return CONTACT_DUPLICATE_KEY.format(fingerprint=fingerprint)
+
+
+def is_duplicate_submission(data):
+    """
+    Whether the same e-mail and message were accepted within CONTACT_DUPLICATE_WINDOW_SECONDS.
+    A body that is not an object (a JSON list, for example) never is; the
+    serializer rejects it.
+    """
+    if not isinstance(data, dict):
+        return False
+    return cache.get(_submission_key(data)) is not None
+
+
+def remember_submission(data):
+    """
+    Record an accepted submission so identical resubmits are dropped for a while.
+    """
+    cache.set(_submission_key(data), 1, timeout=settings.CONTACT_DUPLICATE_WINDOW_SECONDS)
@@ -0,0 +1,223 @@
+import datetime
+import logging
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+from website.models.contact_notification_model import ContactNotification
+
+logger = logging.getLogger(__name__)
+
+
+def build_contact_email(contact, connection=None):
+    """
+    Build the notification e-mail sent to CONTACT_EMAIL_RECIPIENT for a contact.
+    """
+    subject = 'Nuevo Contacto de Rainy.com.co'
+
+    # Crear el mensaje del correo
+    message = f"""
+        Se ha recibido un nuevo mensaje de contacto desde rainy.com.co:
+
+        Nombre: {contact.name}
+        Teléfono: {contact.phone or 'No proporcionado'}
+        Email: {contact.email}
+        Mensaje: {contact.message}
+        
+        Fecha de recepción: {contact.created_at.strftime('%Y-%m-%d %H:%M:%S')}
+        """
+
+    return EmailMessage(
+        subject,
+        message,
+        settings.DEFAULT_FROM_EMAIL,
+        [settings.CONTACT_EMAIL_RECIPIENT],
+        connection=connection,
+    )
+
+
+def build_digest_email(contacts, connection=None):
+    """
+    Build a single e-mail to CONTACT_EMAIL_RECIPIENT summarising several contacts.
+    """
+    subject = f'{len(contacts)} Nuevos Contactos de Rainy.com.co'
+    sections = [
+        f"""
+        Nombre: {contact.name}
+        Teléfono: {contact.phone or 'No proporcionado'}
+        Email: {contact.email}
+        Mensaje: {contact.message}
+        Fecha de recepción: {contact.created_at.strftime('%Y-%m-%d %H:%M:%S')}
+        """
+        for contact in contacts
+    ]
+    message = (
+        f"\n        Se han recibido {len(contacts)} nuevos mensajes de contacto desde rainy.com.co:\n"
+        + '\n        ----------------------------------------\n'.join(sections)
+    )
+    return EmailMessage(
+        subject,
+        message,
+        settings.DEFAULT_FROM_EMAIL,
+        [settings.CONTACT_EMAIL_RECIPIENT],
+        connection=connection,
+    )
+
+
+def claim_due_notifications(batch_size, window=None):
+    """
+    Lock up to batch_size due notifications and lease them to this worker by
+    pushing next_attempt_at forward, so concurrent workers skip them while
+    the (slow) SMTP delivery runs outside the transaction.
+
+    With a collection `window` (seconds, default CONTACT_NOTIFICATION_BATCH_WINDOW_SECONDS)
+    nothing is claimed until the oldest due notification has waited that long
+    or a full batch is due, so a burst of submissions goes out together.
+    """
+    now = timezone.now()
+    window = settings.CONTACT_NOTIFICATION_BATCH_WINDOW_SECONDS if window is None else window
+    due = ContactNotification.objects.filter(status=ContactNotification.PENDING, next_attempt_at__lte=now)
+
+    if window:
+        oldest = due.order_by('created_at').values_list('created_at', flat=True).first()
+        if oldest is None:
+            return []
+        if oldest > now - datetime.timedelta(seconds=window) and due[:batch_size].count() < batch_size:
+            return []
+
+    with transaction.atomic():
+        notifications = list(
+            due
+            .select_for_update(skip_locked=True)
+            .select_related('contact')
+            .order_by('next_attempt_at')[:batch_size]
+        )
+        lease_until = now + datetime.timedelta(seconds=settings.CONTACT_NOTIFICATION_LEASE_SECONDS)
+        ContactNotification.objects.filter(pk__in=[notification.pk for notification in notifications]).update(
+            next_attempt_at=lease_until
+        )
+    # Keep the instances in step with the rows: deliver_notifications writes
+    # next_attempt_at back for every notification, not only the retried ones
+    for notification in notifications:
+        notification.next_attempt_at = lease_until
+    return notifications
+
+
+def get_notification_backlog():
+    """
+    Return the number of pending notifications and the age in seconds of the
+    oldest one (None when the outbox is empty).
+    """
+    pending = ContactNotification.objects.filter(status=ContactNotification.PENDING)
+    oldest = pending.order_by('created_at').values_list('created_at', flat=True).first()
+    return {
+        'pending': pending.count(),
+        'oldest_pending_seconds': None if oldest is None else round((timezone.now() - oldest).total_seconds()),
+    }
+
+
+def check_notification_backlog():
+    """
+    Log a warning when the oldest pending notification is older than
+    CONTACT_NOTIFICATION_BACKLOG_WARNING_SECONDS, e.g. because the SMTP server
+    keeps failing or the worker fell behind. Returns the backlog.
+    """
+    backlog = get_notification_backlog()
+    age = backlog['oldest_pending_seconds']
+    if age is not None and age > settings.CONTACT_NOTIFICATION_BACKLOG_WARNING_SECONDS:
+        logger.warning(
+            'Contact notification backlog: %s pending, oldest waiting %ss', backlog['pending'], age
+        )
+    return backlog
+
+
+def _record_failure(notification, error, now):
+    """
+    Count a failed attempt and schedule the retry with exponential backoff,
+    or give up after CONTACT_NOTIFICATION_MAX_ATTEMPTS.
+    """
+    notification.attempts += 1
+    notification.last_error = str(error) or error.__class__.__name__
+    if notification.attempts >= settings.CONTACT_NOTIFICATION_MAX_ATTEMPTS:
+        notification.status = ContactNotification.FAILED
+    else:
+        delay = settings.CONTACT_NOTIFICATION_RETRY_BASE_SECONDS * 2 ** (notification.attempts - 1)
+        notification.next_attempt_at = now + datetime.timedelta(seconds=delay)
+
+
+def _record_outcome(notification, error, results):
+    """
+    Store the result of one delivery attempt on the notification and count it.
+    """
+    now = timezone.now()
+    if error is None:
+        notification.attempts += 1
+        notification.status = ContactNotification.SENT
+        notification.sent_at = now
+        notification.last_error = ''
+        results['sent'] += 1
+    else:
+        _record_failure(notification, error, now)
+        logger.warning('Error sending contact notification #%s: %s', notification.pk, error)
+        results['failed' if notification.status == ContactNotification.FAILED else 'retried'] += 1
+
+
+def deliver_notifications(notifications, mode=None):
+    """
+    Send the given notifications over one SMTP connection and store the outcome
+    of each. Returns a dict with the number of sent, retried and failed rows.
+
+    `mode` (default CONTACT_NOTIFICATION_DELIVERY) is 'individual', one e-mail
+    per contact sent over the shared connection, or 'digest', a single e-mail
+    listing every contact in the batch.
+    """
+    results = {'sent': 0, 'retried': 0, 'failed': 0}
+    if not notifications:
+        return results
+    mode = mode or settings.CONTACT_NOTIFICATION_DELIVERY
+
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as error:
+        logger.warning('Could not connect to the e-mail server: %s', error)
+        connection_error = error
+    else:
+        connection_error = None
+
+    try:
+        if mode == 'digest' and len(notifications) > 1:
+            error = connection_error
+            if error is None:
+                contacts = [notification.contact for notification in notifications]
+                try:
+                    connection.send_messages([build_digest_email(contacts, connection)])
+                except Exception as send_error:
+                    error = send_error
+            for notification in notifications:
+                _record_outcome(notification, error, results)
+        else:
+            for notification in notifications:
+                error = connection_error
+                if error is None:
+                    try:
+                        connection.send_messages([build_contact_email(notification.contact, connection)])
+                    except Exception as send_error:
+                        error = send_error
+                _record_outcome(notification, error, results)
+    finally:
+        if connection_error is None:
+            connection.close()
+
+    ContactNotification.objects.bulk_update(
+        notifications, ['status', 'attempts', 'next_attempt_at', 'last_error', 'sent_at']
+    )
+    return results
+
+
+def process_notification_batch(batch_size=None, window=None, mode=None):
+    """
+    Claim one batch of due notifications and deliver it.
+    """
+    batch_size = batch_size or settings.CONTACT_NOTIFICATION_BATCH_SIZE
+    return deliver_notifications(claim_due_notifications(batch_size, window), mode)
@@ -0,0 +1,130 @@
+import calendar
+import gzip
+import json
+import os
+import time
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from website.models.contact_archive_model import ContactArchive
+from website.models.contact_model import Contact
+from website.models.contact_notification_model import ContactNotification
+from website.services.contact_export import CONTACT_EXPORT_FIELDS, export_record
+
+ARCHIVE_DESTINATIONS = ('table', 'file')
+
+
+def retention_cutoff(months, now=None):
+    """
+    Return the moment `months` calendar months before `now` (clamped to the
+    last day of shorter months).
+    """
+    now = now or timezone.now()
+    month_index = now.year * 12 + now.month - 1 - months
+    year, month = divmod(month_index, 12)
+    month += 1
+    day = min(now.day, calendar.monthrange(year, month)[1])
+    return now.replace(year=year, month=month, day=day)
+
+
+def get_archivable_contacts(cutoff):
+    """
+    Contacts created before `cutoff`, except those whose notification e-mail
+    is still waiting in the outbox.
+    """
+    return (
+        Contact.objects
+        .filter(created_at__lt=cutoff)
+        .exclude(notification__status=ContactNotification.PENDING)
+    )
+
+
+def default_archive_path(cutoff):
+    """
+    Archive file used when none is given: one per month of the cutoff in
+    CONTACT_ARCHIVE_ROOT, so a run restarted after a crash (or any other run
+    that month) appends to the same file and skips the contacts already in it.
+    """
+    return os.path.join(settings.CONTACT_ARCHIVE_ROOT, f'contacts-{cutoff:%Y-%m}.jsonl.gz')
+
+
+def archived_contact_ids(path):
+    """
+    Ids of the contacts already in an archive file (empty when it does not exist).
+    """
+    ids = set()
+    if path and os.path.exists(path):
+        with gzip.open(path, 'rt', encoding='utf-8') as archive:
+            for line in archive:
+                ids.add(json.loads(line)['id'])
+    return ids
+
+
+def archive_contacts(cutoff, destination='table', path=None, batch_size=None):
+    """
+    Move contacts older than `cutoff` out of the Contact table, oldest first,
+    in batches of `batch_size`. Each batch is copied to the ContactArchive
+    table or appended to the gzip-compressed JSONL file at `path`, then deleted
+    in the same transaction, so an interrupted run can simply be restarted.
+    A file batch is written (as its own gzip member, synced to disk) before its
+    transaction commits and cut off the file again if the transaction fails;
+    contacts already in the file are not written twice, so rerunning with the
+    same file after a run that died between the write and the commit leaves
+    no duplicates either (see default_archive_path).
+    Returns a dict with the number of rows and batches moved and the elapsed seconds.
+    """
+    batch_size = batch_size or settings.CONTACT_ARCHIVE_BATCH_SIZE
+    contacts = get_archivable_contacts(cutoff).order_by('created_at', 'id').values_list(*CONTACT_EXPORT_FIELDS)
+    archived_ids = archived_contact_ids(path) if destination == 'file' else set()
+    archive_file = open(path, 'ab') if destination == 'file' else None
+    result = {'rows': 0, 'batches': 0}
+    start = time.perf_counter()
+
+    try:
+        while True:
+            offset = None
+            try:
+                with transaction.atomic():
+                    rows = list(contacts[:batch_size])
+                    if not rows:
+                        break
+                    records = [export_record(row) for row in rows]
+                    if archive_file is not None:
+                        lines = ''.join(
+                            json.dumps(record, ensure_ascii=False) + '\n'
+                            for record in records if record['id'] not in archived_ids
+                        )
+                        if lines:
+                            offset = archive_file.tell()
+                            archive_file.write(gzip.compress(lines.encode('utf-8')))
+                            archive_file.flush()
+                            os.fsync(archive_file.fileno())
+                    else:
+                        ContactArchive.objects.bulk_create(
+                            [
+                                ContactArchive(
+                                    contact_id=contact_id,
+                                    name=name,
+                                    phone=phone,
+                                    email=email,
+                                    message=message,
+                                    created_at=created_at,
+                                )
+                                for contact_id, name, phone, email, message, created_at in rows
+                            ],
+                            ignore_conflicts=True,
+                        )
+                    Contact.objects.filter(pk__in=[record['id'] for record in records]).delete()
+            except BaseException:
+                # The contacts are still in the table; drop their copy from the file
+                if offset is not None:
+                    archive_file.truncate(offset)
+                raise
+            result['rows'] += len(rows)
+            result['batches'] += 1
+    finally:
+        if archive_file is not None:
+            archive_file.close()
+
+    result['seconds'] = time.perf_counter() - start
+    return result
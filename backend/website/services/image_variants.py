@@ -0,0 +1,279 @@
+"""
+Responsive image variants and image metadata.
+
+For every product and comparison image a set of resized AVIF / WebP / JPEG
+files is generated at the widths in IMAGE_VARIANT_WIDTHS (never upscaled).
+The content-addressed default storage names every variant after its own
+content hash, and identical uploads share one original name, so the variants
+already listed for that name (by this row or another one) are reused instead
+of being encoded again. Their names are stored in a JSON column next to each
+image field ({'source': <original name>, 'version': ..., 'variants': [{'name', 'width', 'height', 'format'}]}),
+together with the image's width and height, a tiny inline placeholder (LQIP
+data URI) and its dominant colour, so the serializers can describe images
+without touching the files. The image fields deliberately have no
+width_field / height_field: Django would decode the file again every time a
+row is loaded. The width and height are 0 for a file that cannot be decoded
+and NULL until the image has been processed.
+
+The size, placeholder and colour are cheap and filled in right after every
+save; encoding the variants is slow and, unless IMAGE_VARIANTS_ON_SAVE, left to
+generate_image_variants, which finds those rows by the 'pending' flag of their
+variants column.
+
+For an image field <field> the derived columns are <field>_variants,
+<field>_width, <field>_height, <field>_placeholder and <field>_color.
+"""
+import base64
+import hashlib
+import io
+import logging
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.utils import timezone
+from PIL import ExifTags, Image, ImageOps, UnidentifiedImageError, features
+from website.models.product_model import Product
+from website.models.product_series_comparison_image_model import ProductSeriesComparisonImage
+
+logger = logging.getLogger(__name__)
+
+VARIANT_CONTENT_TYPES = {
+    'avif': 'image/avif',
+    'webp': 'image/webp',
+    'jpeg': 'image/jpeg',
+}
+VARIANT_EXTENSIONS = {'avif': 'avif', 'webp': 'webp', 'jpeg': 'jpg'}
+# Encoder options per format, on top of IMAGE_VARIANT_QUALITY
+VARIANT_SAVE_OPTIONS = {
+    'avif': {'speed': 6},
+    'webp': {'method': 6},
+    'jpeg': {'optimize': True, 'progressive': True},
+}
+
+# Image fields with derived columns, per model
+IMAGE_VARIANT_FIELDS = {
+    Product: ('main_image', 'dimensions_image'),
+    ProductSeriesComparisonImage: ('image',),
+}
+# Bump when the derived data changes shape, so the backfill regenerates it
+IMAGE_METADATA_VERSION = 2
+# Bounding box of the inline placeholder image
+PLACEHOLDER_SIZE = (16, 16)
+# EXIF orientations that rotate the image by 90 degrees, swapping width and height
+ROTATED_ORIENTATIONS = (5, 6, 7, 8)
+
+
+def available_formats():
+    """
+    The configured variant formats the installed Pillow can encode.
+    """
+    return [
+        variant_format for variant_format in settings.IMAGE_VARIANT_FORMATS
+        if variant_format == 'jpeg' or features.check(variant_format)
+    ]
+
+
+def _variant_widths(original_width):
+    widths = [width for width in settings.IMAGE_VARIANT_WIDTHS if width < original_width]
+    return widths or [original_width]
+
+
+def placeholder_data_uri(image):
+    """
+    Return a tiny blurred-on-upscale version of the image as a data URI
+    (a few hundred bytes), suitable as an inline placeholder or CSS background.
+    """
+    thumbnail = image.copy()
+    thumbnail.thumbnail(PLACEHOLDER_SIZE)
+    variant_format = 'webp' if features.check('webp') else 'jpeg'
+    if variant_format == 'jpeg':
+        thumbnail = thumbnail.convert('RGB')
+    buffer = io.BytesIO()
+    thumbnail.save(buffer, format=variant_format.upper(), quality=40)
+    encoded = base64.b64encode(buffer.getvalue()).decode('ascii')
+    return f'data:{VARIANT_CONTENT_TYPES[variant_format]};base64,{encoded}'
+
+
+def dominant_color(image):
+    """
+    Return the most common colour of the image (after reducing it to a small
+    palette) as '#rrggbb'.
+    """
+    sample = image.convert('RGB')
+    sample.thumbnail((64, 64))
+    palette_image = sample.quantize(colors=5)
+    _, index = max(palette_image.getcolors())
+    red, green, blue = palette_image.getpalette()[index * 3:index * 3 + 3]
+    return f'#{red:02x}{green:02x}{blue:02x}'
+
+
+def existing_variant_names(field_file):
+    """
+    Return {(width, format): stored name} of the variants already generated for
+    the current file name of an image field, by any row.
+    """
+    column = f'{field_file.field.name}_variants'
+    rows = field_file.field.model.objects.filter(**{f'{column}__source': field_file.name}).values_list(column, flat=True)
+    existing = {}
+    for variants in rows:
+        for variant in variants.get('variants', ()):
+            existing.setdefault((variant['width'], variant['format']), variant['name'])
+    return existing
+
+
+def process_image(field_file, variants=True):
+    """
+    Create the missing variant files of an image and return the values of its
+    derived columns, keyed by suffix (variants, width, height, placeholder, color).
+    With variants=False only the size, placeholder and colour are computed
+    (a JPEG is decoded at a fraction of its size) and the variants column is
+    marked 'pending'.
+    Unreadable images, and images larger than IMAGE_VARIANT_MAX_PIXELS (or
+    Pillow's decompression bomb limit), get empty values and a 0 x 0 size, so
+    they are not retried on every save.
+    """
+    result = {
+        'variants': {'source': field_file.name, 'version': IMAGE_METADATA_VERSION, 'variants': []},
+        'width': 0,
+        'height': 0,
+        'placeholder': '',
+        'color': '',
+    }
+    storage = field_file.storage
+    try:
+        with storage.open(field_file.name, 'rb') as original:
+            content = original.read()
+        image = Image.open(io.BytesIO(content))
+        # Checked on the header, before any pixel is decoded
+        if image.width * image.height > settings.IMAGE_VARIANT_MAX_PIXELS:
+            raise Image.DecompressionBombError(
+                f'{image.width}x{image.height} exceeds IMAGE_VARIANT_MAX_PIXELS ({settings.IMAGE_VARIANT_MAX_PIXELS})'
+            )
+        width, height = image.size
+        if image.getexif().get(ExifTags.Base.Orientation) in ROTATED_ORIENTATIONS:
+            width, height = height, width
+        if not variants:
+            # Enough pixels for the placeholder and the colour sample
+            image.draft('RGB', (64, 64))
+        image = ImageOps.exif_transpose(image)
+    except (OSError, UnidentifiedImageError, Image.DecompressionBombError) as error:
+        logger.warning('Cannot create variants of %s: %s', field_file.name, error)
+        return result
+
+    has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+    image = image.convert('RGBA' if has_alpha else 'RGB')
+    result.update(
+        width=width,
+        height=height,
+        placeholder=placeholder_data_uri(image),
+        color=dominant_color(image),
+    )
+    if not variants:
+        result['variants']['pending'] = True
+        return result
+
+    digest = hashlib.sha256(content).hexdigest()[:16]
+    existing = existing_variant_names(field_file)
+    folder = field_file.field.upload_to
+    generated = result['variants']['variants']
+    for width in _variant_widths(image.width):
+        height = max(1, round(image.height * width / image.width))
+        resized = None
+        for variant_format in available_formats():
+            name = existing.get((width, variant_format))
+            if name is None or not storage.exists(name):
+                if resized is None:
+                    resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+                frame = resized
+                if variant_format == 'jpeg' and has_alpha:
+                    frame = Image.new('RGB', resized.size, (255, 255, 255))
+                    frame.paste(resized, mask=resized.getchannel('A'))
+                buffer = io.BytesIO()
+                frame.save(
+                    buffer,
+                    format=variant_format.upper(),
+                    quality=settings.IMAGE_VARIANT_QUALITY[variant_format],
+                    **VARIANT_SAVE_OPTIONS[variant_format],
+                )
+                name = storage.save(
+                    f'{folder}variants/{digest}-{width}w.{VARIANT_EXTENSIONS[variant_format]}',
+                    ContentFile(buffer.getvalue()),
+                )
+            generated.append({'name': name, 'width': width, 'height': height, 'format': variant_format})
+    return result
+
+
+def image_metadata_columns(model):
+    """
+    Names of every derived column of a model (see the module docstring).
+    """
+    return [
+        f'{image_field}_{suffix}'
+        for image_field in IMAGE_VARIANT_FIELDS[model]
+        for suffix in ('variants', 'width', 'height', 'placeholder', 'color')
+    ]
+
+
+def refresh_instance_variants(instance, force=False, variants=True):
+    """
+    Regenerate the derived columns of every image of `instance` whose stored
+    data does not belong to the current file (or predates IMAGE_METADATA_VERSION)
+    or whose variants are still pending. With variants=False only the metadata
+    of new files is computed and their variants are left pending. The columns are saved without sending post_save (the catalog caches are
+    invalidated explicitly). Returns the number of image fields updated.
+    """
+    # website.signals imports this module
+    from website.signals import catalog_bulk_changed
+
+    updates = {}
+    processed = 0
+    for image_field in IMAGE_VARIANT_FIELDS[type(instance)]:
+        field_file = getattr(instance, image_field)
+        stored = getattr(instance, f'{image_field}_variants') or {}
+        if not field_file:
+            if stored:
+                updates.update({
+                    f'{image_field}_variants': {},
+                    f'{image_field}_width': None,
+                    f'{image_field}_height': None,
+                    f'{image_field}_placeholder': '',
+                    f'{image_field}_color': '',
+                })
+                processed += 1
+            continue
+        current = stored.get('source') == field_file.name and stored.get('version') == IMAGE_METADATA_VERSION
+        if force or not current or (variants and stored.get('pending')):
+            updates.update(
+                (f'{image_field}_{suffix}', value)
+                for suffix, value in process_image(field_file, variants=variants).items()
+            )
+            processed += 1
+
+    if updates:
+        updates['updated_at'] = timezone.now()
+        type(instance).objects.filter(pk=instance.pk).update(**updates)
+        for name, value in updates.items():
+            setattr(instance, name, value)
+        catalog_bulk_changed([instance.pk] if isinstance(instance, Product) else ())
+    return processed
+
+
+def srcset_builder(media_url):
+    """
+    Return a function mapping (current image name, variants column) to the
+    srcset list exposed by the serializers, using `media_url` to turn stored
+    names into URLs. Variants of a previous file are ignored.
+    """
+
+    def build_srcset(name, variants):
+        if not name or not variants or variants.get('source') != name:
+            return []
+        return [
+            {
+                'url': media_url(variant['name']),
+                'width': variant['width'],
+                'type': VARIANT_CONTENT_TYPES[variant['format']],
+            }
+            for variant in variants['variants']
+        ]
+
+    return build_srcset
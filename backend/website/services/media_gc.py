@@ -0,0 +1,88 @@
+"""
+Media garbage collection.
+
+Product and comparison images are never deleted when a row is removed or its
+image replaced, and with content-addressed names a replaced file can still be
+shared by another row. Files under the image upload folders that no row
+references (as an image or as one of its variants) are removed here, except
+recent ones, which may belong to a transaction that has not committed yet.
+"""
+import datetime
+import posixpath
+import time
+from django.conf import settings
+from django.utils import timezone
+from website.services.image_variants import IMAGE_VARIANT_FIELDS
+
+
+def referenced_media_names():
+    """
+    Names of every stored file referenced by a Product or
+    ProductSeriesComparisonImage row: the images themselves and their variants.
+    """
+    referenced = set()
+    for model, fields in IMAGE_VARIANT_FIELDS.items():
+        columns = [*fields, *(f'{field}_variants' for field in fields)]
+        for row in model.objects.values_list(*columns).iterator(chunk_size=2000):
+            names, variant_columns = row[:len(fields)], row[len(fields):]
+            referenced.update(name for name in names if name)
+            for variants in variant_columns:
+                referenced.update(variant['name'] for variant in (variants or {}).get('variants', ()))
+    return referenced
+
+
+def media_roots():
+    """
+    Return [(storage, upload folder)] for every image field, without duplicates.
+    """
+    roots = []
+    for model, fields in IMAGE_VARIANT_FIELDS.items():
+        for field_name in fields:
+            field = model._meta.get_field(field_name)
+            root = (field.storage, field.upload_to.rstrip('/'))
+            if root not in roots:
+                roots.append(root)
+    return roots
+
+
+def _walk(storage, directory):
+    try:
+        directories, files = storage.listdir(directory)
+    except FileNotFoundError:
+        return
+    for file_name in files:
+        yield posixpath.join(directory, file_name)
+    for subdirectory in directories:
+        yield from _walk(storage, posixpath.join(directory, subdirectory))
+
+
+def collect_media_garbage(grace_hours=None, dry_run=False):
+    """
+    Delete the unreferenced files under the image upload folders that are older
+    than `grace_hours` (MEDIA_GC_GRACE_HOURS by default). With `dry_run` nothing
+    is deleted. Returns a dict with the scanned, deleted and kept-recent file
+    counts, the bytes freed, the deleted names and the elapsed seconds.
+    """
+    grace_hours = settings.MEDIA_GC_GRACE_HOURS if grace_hours is None else grace_hours
+    cutoff = timezone.now() - datetime.timedelta(hours=grace_hours)
+    start = time.perf_counter()
+
+    # Listed before the references are read, so a file saved meanwhile is either
+    # not seen or already referenced
+    candidates = [(storage, name) for storage, root in media_roots() for name in _walk(storage, root)]
+    referenced = referenced_media_names()
+
+    result = {'scanned': len(candidates), 'deleted': 0, 'recent': 0, 'bytes': 0, 'names': []}
+    for storage, name in candidates:
+        if name in referenced:
+            continue
+        if storage.get_modified_time(name) > cutoff:
+            result['recent'] += 1
+            continue
+        result['bytes'] += storage.size(name)
+        result['deleted'] += 1
+        result['names'].append(name)
+        if not dry_run:
+            storage.delete(name)
+    result['seconds'] = time.perf_counter() - start
+    return result
@@ -0,0 +1,138 @@
+import threading
+from bisect import bisect_left
+from django.conf import settings
+from website.models.product_model import Product
+from website.models.product_specification_model import ProductSpecification
+from website.serializers.catalog_fast_serializer import format_price
+from website.services.catalog_cache import get_catalog_version
+from website.services.spec_values import to_base_unit
+
+_lock = threading.Lock()
+_current = {'version': None, 'index': None}
+# Relative slack when comparing a capacity with a load, so a product exactly at
+# its rated point is not rejected by float rounding
+FIT_TOLERANCE = 1e-9
+
+
+class CapacityIndex:
+    """
+    In-memory index of the hydraulic capacity of every active product, built
+    from the parsed numeric values of the 'Área máxima de la cubierta',
+    'Máxima Intensidad de la lluvia' and 'Caudal máximo' specifications.
+
+    A roof of A m² under I mm/h of rain produces A * I / 60 L/min. A product
+    rated for A_max m² at I_rated mm/h handles A_max * I_rated / I m² under
+    I mm/h, so its capacity is A_max * I_rated / 60 L/min; 'Caudal máximo'
+    (converted to L/min through its type's unit) is only used when the rated
+    area or intensity is missing. Entries are kept sorted by capacity so a
+    lookup is a binary search.
+    """
+
+    def __init__(self, entries):
+        self.entries = sorted(entries, key=lambda entry: (entry['capacity'], entry['order']))
+        self.capacities = [entry['capacity'] for entry in self.entries]
+
+    @classmethod
+    def build(cls):
+        """
+        Build the index with two queries: products and their capacity specs.
+        """
+        spec_names = settings.RECOMMENDER_SPEC_NAMES
+        keys_by_name = {name: key for key, name in spec_names.items()}
+
+        products = {
+            row['id']: row
+            for row in Product.objects.filter(is_active=True).values('id', 'title', 'slug', 'price', 'main_image', 'order')
+        }
+        capacities = {product_id: {} for product_id in products}
+        rows = ProductSpecification.objects.filter(
+            product__is_active=True,
+            specification_type__name__in=keys_by_name.keys(),
+            numeric_value__isnull=False,
+        ).values_list('product_id', 'specification_type__name', 'specification_type__unit', 'numeric_value')
+        for product_id, name, unit, value in rows:
+            key = keys_by_name[name]
+            # numeric_value is expressed in the type's unit; the keys are also
+            # the dimensions (spec_values.UNITS), whose base units are m², mm/h and L/min
+            value = to_base_unit(value, unit, key)
+            if value is not None:
+                capacities[product_id][key] = float(value)
+
+        entries = []
+        for product_id, values in capacities.items():
+            if 'area' in values and 'intensity' in values:
+                capacity = values['area'] * values['intensity'] / 60
+            elif 'flow' in values:
+                capacity = values['flow']
+            else:
+                continue
+            product = products[product_id]
+            entries.append({
+                'id': product_id,
+                'title': product['title'],
+                'slug': product['slug'],
+                'price': format_price(product['price']),
+                'main_image': product['main_image'],
+                'order': product['order'],
+                'capacity': capacity,
+            })
+        return cls(entries)
+
+    def recommend(self, area, intensity, limit):
+        """
+        Return (required_flow, up to `limit` entries), best fit first: the
+        smallest products that handle the load, then the largest ones that do not.
+        """
+        required = area * intensity / 60
+        start = bisect_left(self.capacities, required * (1 - FIT_TOLERANCE))
+        fitting = self.entries[start:start + limit]
+        not_fitting = self.entries[:start][::-1][:limit - len(fitting)]
+        return required, fitting + not_fitting
+
+
+def get_capacity_index():
+    """
+    Return the capacity index for the current catalog version, rebuilding it
+    only after the catalog changed. A lookup costs one cache read.
+    """
+    version = get_catalog_version()
+    if _current['version'] != version:
+        with _lock:
+            if _current['version'] != version:
+                _current['index'] = CapacityIndex.build()
+                _current['version'] = version
+    return _current['index']
+
+
+def recommend_products(request, area, intensity=None, limit=None):
+    """
+    Rank active products by how well they fit a roof of `area` m² under
+    `intensity` mm/h (default: RECOMMENDER_DEFAULT_INTENSITY).
+    """
+    intensity = intensity or settings.RECOMMENDER_DEFAULT_INTENSITY
+    limit = limit or settings.RECOMMENDER_MAX_RESULTS
+    required, entries = get_capacity_index().recommend(area, intensity, limit)
+    storage = Product._meta.get_field('main_image').storage
+
+    recommendations = []
+    for entry in entries:
+        main_image_url = None
+        if entry['main_image']:
+            main_image_url = request.build_absolute_uri(storage.url(entry['main_image']))
+        recommendations.append({
+            'id': entry['id'],
+            'title': entry['title'],
+            'slug': entry['slug'],
+            'price': entry['price'],
+            'main_image_url': main_image_url,
+            'fits': entry['capacity'] >= required * (1 - FIT_TOLERANCE),
+            'capacity_flow': round(entry['capacity'], 2),
+            'max_area': round(entry['capacity'] * 60 / intensity, 2),
+            'utilization': round(required / entry['capacity'], 4) if entry['capacity'] else None,
+        })
+    return {
+        'area': area,
+        'intensity': intensity,
+        'required_flow': round(required, 2),
+        'recommendations': recommendations,
+    }
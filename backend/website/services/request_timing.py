@@ -0,0 +1,69 @@
+"""
+Per-request timing breakdown collected by RequestTimingMiddleware.
+
+The middleware installs a RequestTimings as the database execute wrapper of
+every request, and activates it for phase timing on sampled requests only;
+code on the hot paths wraps its phases in `with timed('serialize'):` etc.,
+which costs nothing when no request is being timed (management commands,
+unsampled requests).
+"""
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_current = ContextVar('request_timings', default=None)
+
+# Queries kept per request for the slow-request log
+MAX_RECORDED_QUERIES = 200
+
+
+class RequestTimings:
+    """
+    Accumulated phase durations (seconds) and database statistics of one request.
+    Instances are installed as a database execute wrapper.
+    """
+
+    def __init__(self):
+        self.durations = defaultdict(float)
+        self.query_count = 0
+        self.query_time = 0.0
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.query_count += 1
+            self.query_time += elapsed
+            if len(self.queries) < MAX_RECORDED_QUERIES:
+                self.queries.append({'sql': sql, 'ms': round(elapsed * 1000, 3), 'many': many})
+
+
+def activate(timings):
+    """
+    Make `timings` the collector of the current request; returns a token for deactivate().
+    """
+    return _current.set(timings)
+
+
+def deactivate(token):
+    _current.reset(token)
+
+
+@contextmanager
+def timed(name):
+    """
+    Add the duration of the block to phase `name` of the request being timed, if any.
+    """
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.durations[name] += time.perf_counter() - start
@@ -0,0 +1,77 @@
+"""
+Denormalized product specifications.
+
+Product.specs_cache holds the specifications of a product as an ordered list
+of [name, unit, value] (ordered like ProductSpecification, by specification
+type id), so catalog reads need neither the ProductSpecification /
+SpecificationType join nor a model instance per specification. The column is
+rebuilt by website.signals when a specification or specification type
+changes, and by the bulk writers (catalog import, synthetic catalog), which
+bypass those signals. check_specs_cache lists and repairs drifted rows.
+"""
+from django.conf import settings
+from django.utils import timezone
+from website.models.product_model import Product
+from website.models.product_specification_model import ProductSpecification
+
+
+def build_specs_caches(product_ids):
+    """
+    Return {product_id: [[name, unit, value], ...]} for the given products,
+    with one joined query. Products without specifications get an empty list.
+    """
+    caches = {product_id: [] for product_id in product_ids}
+    if not caches:
+        return caches
+    spec_rows = (
+        ProductSpecification.objects
+        .filter(product_id__in=caches)
+        .order_by('product_id', 'specification_type_id')
+        .values_list('product_id', 'specification_type__name', 'specification_type__unit', 'value')
+    )
+    for product_id, name, unit, value in spec_rows:
+        caches[product_id].append([name, unit, value])
+    return caches
+
+
+def rebuild_specs_cache(product_ids, batch_size=None, touch=False):
+    """
+    Recompute and store specs_cache of the given products, in batches of
+    `batch_size` (CATALOG_IMPORT_BATCH_SIZE by default); one SELECT and one
+    UPDATE per batch. With `touch`, updated_at is set too, so the catalog
+    validators change. Returns the number of products.
+    """
+    batch_size = batch_size or settings.CATALOG_IMPORT_BATCH_SIZE
+    product_ids = list(dict.fromkeys(product_ids))
+    now = timezone.now()
+    fields = ['specs_cache', 'updated_at'] if touch else ['specs_cache']
+    for batch_start in range(0, len(product_ids), batch_size):
+        caches = build_specs_caches(product_ids[batch_start:batch_start + batch_size])
+        Product.objects.bulk_update(
+            [Product(pk=product_id, specs_cache=cache, updated_at=now) for product_id, cache in caches.items()],
+            fields,
+        )
+    return len(product_ids)
+
+
+def find_stale_specs_caches(batch_size=None):
+    """
+    Return the ids of the products whose stored specs_cache differs from their
+    specifications, comparing `batch_size` products at a time.
+    """
+    batch_size = batch_size or settings.CATALOG_IMPORT_BATCH_SIZE
+    stale = []
+    rows = Product.objects.order_by('pk').values_list('pk', 'specs_cache')
+    batch = []
+    for row in rows.iterator(chunk_size=batch_size):
+        batch.append(row)
+        if len(batch) == batch_size:
+            stale.extend(_stale_in_batch(batch))
+            batch = []
+    stale.extend(_stale_in_batch(batch))
+    return stale
+
+
+def _stale_in_batch(rows):
+    expected = build_specs_caches([product_id for product_id, _ in rows])
+    return [product_id for product_id, stored in rows if stored != expected[product_id]]
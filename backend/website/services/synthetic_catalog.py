@@ -0,0 +1,275 @@
+"""
+Seeded synthetic catalog for benchmarks and profiling.
+
+Generates N products x M specification types with value strings written the
+way the real catalog writes them ('1.200 L/min', '250 micras (0,25 mm)',
+'Por encima del 90%', free text), so numeric parsing, filters and the
+recommender see realistic data. The same seed always produces the same
+catalog. Everything is written with bulk_create in batches (Product.specs_cache
+is filled in directly, as no signal runs); synthetic rows are recognisable by
+their slug / name prefix and can be removed with clear_synthetic_catalog().
+"""
+import io
+import posixpath
+import random
+import time
+from decimal import Decimal
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+from website.models.catalog_tombstone_model import CatalogTombstone
+from website.models.product_model import Product
+from website.models.product_series_comparison_image_model import ProductSeriesComparisonImage
+from website.models.product_specification_model import ProductSpecification
+from website.models.specification_type_model import SpecificationType
+from website.services.spec_values import parse_spec_value
+from website.services.specs_cache import rebuild_specs_cache
+from website.signals import catalog_bulk_changed, muted_catalog_signals
+
+SYNTHETIC_SLUG_PREFIX = 'synthetic-'
+SYNTHETIC_SPEC_TYPE_PREFIX = 'Especificación sintética'
+SYNTHETIC_COMPARISON_PREFIX = 'Comparativa sintética'
+# Distinct placeholder files shared by all synthetic products
+PLACEHOLDER_VARIANTS = 8
+
+TEXT_VALUES = (
+    'Abierto por un extremo, con diseño antiobstrucción',
+    'Fuerza Cohesiva y Centrífuga',
+    'Malla de superficies múltiples en acero inoxidable SS-304 - grado alimenticio',
+    'Polietileno de alta densidad',
+    'No requiere',
+    'Autolimpiante por gravedad',
+    'Manual, retirando la tapa superior',
+)
+WORDS = (
+    'filtro', 'lluvia', 'cubierta', 'agua', 'malla', 'acero', 'caudal', 'tanque',
+    'instalación', 'mantenimiento', 'eficiencia', 'canal', 'bajante', 'residencial',
+)
+
+
+def _es(number, decimals=0):
+    """
+    Format a number with Spanish separators: 1.200,5
+    """
+    text = f'{number:,.{decimals}f}'
+    return text.replace(',', '\0').replace('.', ',').replace('\0', '.')
+
+
+# (unit, value builder) for the filler specification types
+SPEC_PROFILES = (
+    ('mm', lambda rng: f'{rng.choice((50, 75, 100, 110, 160, 200))} mm'),
+    ('micras', lambda rng: (lambda n: f'{n} micras ({_es(n / 1000, 2)} mm)')(rng.choice((150, 250, 300, 440, 800)))),
+    ('%', lambda rng: f'Por encima del {rng.randrange(80, 100)}%'),
+    ('cm de columna de agua', lambda rng: f'{_es(rng.uniform(10, 60), 2)} cm de columna de agua'),
+    ('L/min', lambda rng: rng.choice((f'{_es(rng.randrange(60, 3000))} L/min', f'{_es(rng.uniform(1, 50), 1)} L/s'))),
+    (None, lambda rng: rng.choice(TEXT_VALUES)),
+    ('m²', lambda rng: f'{rng.randrange(20, 5000, 10)} m2'),
+)
+
+
+def _placeholder_image(rng, width, height):
+    """
+    Return JPEG bytes of a flat-colour placeholder with a lighter band.
+    """
+    from PIL import Image, ImageDraw
+
+    color = tuple(rng.randrange(40, 200) for _ in range(3))
+    image = Image.new('RGB', (width, height), color)
+    ImageDraw.Draw(image).rectangle(
+        (width // 8, height // 3, width * 7 // 8, height * 2 // 3),
+        fill=tuple(min(255, channel + 50) for channel in color),
+    )
+    buffer = io.BytesIO()
+    image.save(buffer, format='JPEG', quality=80)
+    return buffer.getvalue()
+
+
+def _save_placeholders(rng, field, folder, count, size, created):
+    """
+    Store `count` placeholder images through the field's storage and return
+    their names. (storage, name) of every file that did not exist before is
+    appended to `created`, so it can be removed if the transaction rolls back.
+    """
+    storage = field.storage
+    directory = f'{field.upload_to}{folder}'
+    try:
+        existing = set(storage.listdir(directory)[1])
+    except FileNotFoundError:
+        existing = set()
+    names = [
+        storage.save(f'{directory}/placeholder-{index}.jpg', ContentFile(_placeholder_image(rng, *size)))
+        for index in range(count)
+    ]
+    created.extend((storage, name) for name in dict.fromkeys(names) if posixpath.basename(name) not in existing)
+    return names
+
+
+def _resolve_spec_types(spec_type_count):
+    """
+    Return the specification types used by the generator: the three the
+    recommender reads, then numbered filler types cycling through SPEC_PROFILES.
+    Existing types are reused (one query); missing ones are bulk created.
+    """
+    names = settings.RECOMMENDER_SPEC_NAMES
+    wanted = [(names['area'], 'm²'), (names['intensity'], 'mm/h'), (names['flow'], 'L/min')][:spec_type_count]
+    for index in range(len(wanted), spec_type_count):
+        wanted.append((f'{SYNTHETIC_SPEC_TYPE_PREFIX} {index:02d}', SPEC_PROFILES[index % len(SPEC_PROFILES)][0]))
+
+    existing = {spec_type.name: spec_type for spec_type in SpecificationType.objects.filter(name__in=[name for name, _ in wanted])}
+    SpecificationType.objects.bulk_create(
+        [SpecificationType(name=name, unit=unit) for name, unit in wanted if name not in existing]
+    )
+    by_name = {spec_type.name: spec_type for spec_type in SpecificationType.objects.filter(name__in=[name for name, _ in wanted])}
+    return [by_name[name] for name, _ in wanted]
+
+
+def _product_spec_values(rng, spec_type_count):
+    """
+    Value strings of one product, in the order of _resolve_spec_types().
+    Area, intensity and flow are consistent (flow = area x intensity / 60),
+    like a real filter rating.
+    """
+    area = rng.randrange(40, 2000, 10)
+    intensity = rng.choice((50, 75, 90, 100, 120, 150))
+    flow = area * intensity / 60
+    values = [f'{area} m2', f'{intensity} mm/h', f'{_es(flow)} L/min'][:spec_type_count]
+    for index in range(len(values), spec_type_count):
+        values.append(SPEC_PROFILES[index % len(SPEC_PROFILES)][1](rng))
+    return values
+
+
+def generate_synthetic_catalog(products=10000, spec_types=50, comparison_images=3, seed=42,
+                               images=False, batch_size=None):
+    """
+    Create a reproducible synthetic catalog in one transaction and return a
+    dict with the created row counts and the elapsed seconds. Placeholder
+    files written for it are deleted again if the transaction fails.
+    """
+    batch_size = batch_size or settings.CATALOG_IMPORT_BATCH_SIZE
+    rng = random.Random(seed)
+    start = time.perf_counter()
+
+    created_files = []
+    try:
+        with transaction.atomic():
+            types = _resolve_spec_types(spec_types)
+
+            main_images = []
+            comparison_files = []
+            if images:
+                # Separate stream, so the catalog itself does not depend on --images
+                image_rng = random.Random(f'{seed}-images')
+                main_images = _save_placeholders(
+                    image_rng, Product._meta.get_field('main_image'), 'synthetic', PLACEHOLDER_VARIANTS, (800, 600),
+                    created_files,
+                )
+                comparison_files = _save_placeholders(
+                    image_rng, ProductSeriesComparisonImage._meta.get_field('image'), 'synthetic', comparison_images,
+                    (1600, 900), created_files,
+                )
+
+            created_specifications = 0
+            product_ids = []
+            for batch_start in range(0, products, batch_size):
+                batch = []
+                batch_values = []
+                for number in range(batch_start, min(batch_start + batch_size, products)):
+                    product = Product(
+                        title=f'Rainy SX-{number:05d}',
+                        slug=f'{SYNTHETIC_SLUG_PREFIX}sx-{number:05d}',
+                        initial_text=f'Filtro de lluvia sintético número {number}',
+                        description=' '.join(rng.choice(WORDS) for _ in range(rng.randrange(20, 80))).capitalize() + '.',
+                        price=Decimal(rng.randrange(150_000, 5_000_000, 500)),
+                        main_image=main_images[number % len(main_images)] if main_images else '',
+                        order=number,
+                        is_active=rng.random() < 0.95,
+                    )
+                    values = _product_spec_values(rng, spec_types)
+                    product.specs_cache = [
+                        [spec_type.name, spec_type.unit, value]
+                        for spec_type, value in sorted(zip(types, values), key=lambda pair: pair[0].pk)
+                    ]
+                    batch.append(product)
+                    batch_values.append(values)
+                Product.objects.bulk_create(batch)
+                ids = dict(
+                    Product.objects.filter(slug__in=[product.slug for product in batch]).values_list('slug', 'id')
+                )
+                product_ids.extend(ids.values())
+
+                # Model.save() is bypassed, so parse the numeric values here
+                specifications = [
+                    ProductSpecification(
+                        product_id=ids[product.slug],
+                        specification_type=spec_type,
+                        value=value,
+                        numeric_value=parse_spec_value(value, spec_type.unit),
+                    )
+                    for product, values in zip(batch, batch_values)
+                    for spec_type, value in zip(types, values)
+                ]
+                ProductSpecification.objects.bulk_create(specifications, batch_size=batch_size)
+                created_specifications += len(specifications)
+
+            ProductSeriesComparisonImage.objects.bulk_create([
+                ProductSeriesComparisonImage(
+                    name=f'{SYNTHETIC_COMPARISON_PREFIX} {index + 1}',
+                    image=comparison_files[index] if comparison_files else '',
+                )
+                for index in range(comparison_images)
+            ])
+
+            transaction.on_commit(lambda: catalog_bulk_changed(product_ids))
+    except BaseException:
+        # Nothing references the new files any more
+        for storage, name in created_files:
+            storage.delete(name)
+        raise
+
+    return {
+        'products': products,
+        'specification_types': len(types),
+        'specifications': created_specifications,
+        'comparison_images': comparison_images,
+        'seconds': time.perf_counter() - start,
+    }
+
+
+def clear_synthetic_catalog():
+    """
+    Delete every synthetic product, specification type and comparison image.
+    The per-row catalog signals are muted (muted_catalog_signals), so deleting
+    thousands of rows does not rebuild caches and write tombstones one row at a
+    time; tombstones and cache invalidation are then done in bulk.
+    Returns the number of products removed.
+    """
+    with transaction.atomic(), muted_catalog_signals():
+        products = Product.objects.filter(slug__startswith=SYNTHETIC_SLUG_PREFIX)
+        product_ids = list(products.values_list('id', flat=True))
+        spec_types = SpecificationType.objects.filter(name__startswith=SYNTHETIC_SPEC_TYPE_PREFIX)
+        comparison_images = ProductSeriesComparisonImage.objects.filter(name__startswith=SYNTHETIC_COMPARISON_PREFIX)
+        comparison_image_ids = list(comparison_images.values_list('id', flat=True))
+        # Other products that use a synthetic specification type lose those specifications
+        affected_ids = list(
+            ProductSpecification.objects.filter(specification_type__in=spec_types)
+            .exclude(product_id__in=product_ids)
+            .values_list('product_id', flat=True).distinct()
+        )
+
+        # Cascades to their specifications, and the types' to those of other products
+        products.delete()
+        spec_types.delete()
+        comparison_images.delete()
+
+        rebuild_specs_cache(affected_ids, touch=True)
+
+        CatalogTombstone.objects.bulk_create(
+            [CatalogTombstone(object_type=CatalogTombstone.PRODUCT, object_id=product_id) for product_id in product_ids]
+            + [
+                CatalogTombstone(object_type=CatalogTombstone.COMPARISON_IMAGE, object_id=image_id)
+                for image_id in comparison_image_ids
+            ],
+            batch_size=1000,
+        )
+        transaction.on_commit(lambda: catalog_bulk_changed(product_ids + affected_ids))
+    return len(product_ids)
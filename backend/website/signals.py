@@ -0,0 +1,160 @@
+import functools
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+from website.models.catalog_tombstone_model import CatalogTombstone
+from website.models.product_model import Product
+from website.models.product_series_comparison_image_model import ProductSeriesComparisonImage
+from website.models.product_specification_model import ProductSpecification
+from website.models.specification_type_model import SpecificationType
+from website.services.catalog_cache import bump_catalog_version, bump_product_version
+from website.services.catalog_snapshot import schedule_catalog_snapshot
+from website.services.catalog_sync import record_tombstone
+from website.services.image_variants import IMAGE_VARIANT_FIELDS, refresh_instance_variants
+from website.services.spec_values import parse_spec_value
+from website.services.specs_cache import build_specs_caches, rebuild_specs_cache
+
+# Every model that is part of the public catalog payload
+CATALOG_MODELS = (Product, ProductSpecification, SpecificationType, ProductSeriesComparisonImage)
+
+# True inside muted_catalog_signals(); a context variable, so other threads and requests are unaffected
+_signals_muted = ContextVar('catalog_signals_muted', default=False)
+
+
+@contextmanager
+def muted_catalog_signals():
+    """
+    Skip the catalog receivers below for the saves and deletes made in the block.
+    For bulk operations that go through the ORM and then record tombstones and
+    call catalog_bulk_changed() once, instead of once per row.
+    """
+    token = _signals_muted.set(True)
+    try:
+        yield
+    finally:
+        _signals_muted.reset(token)
+
+
+def _unless_muted(receiver):
+    @functools.wraps(receiver)
+    def wrapper(*args, **kwargs):
+        if not _signals_muted.get():
+            receiver(*args, **kwargs)
+    return wrapper
+
+
+def _catalog_changed():
+    bump_catalog_version()
+    if settings.CATALOG_SNAPSHOT_AUTO_PUBLISH:
+        schedule_catalog_snapshot()
+
+
+@_unless_muted
+def invalidate_catalog_cache(sender, **kwargs):
+    """
+    Bump the catalog version whenever a catalog model is saved or deleted,
+    and republish the static snapshot when that is enabled.
+    """
+    _catalog_changed()
+
+
+@_unless_muted
+def invalidate_product_cache(sender, instance, **kwargs):
+    """
+    Evict only the cached detail entry of the saved or deleted product.
+    """
+    bump_product_version(instance.pk)
+
+
+@_unless_muted
+def record_product_tombstone(sender, instance, **kwargs):
+    """
+    Log a deleted product for clients syncing incrementally.
+    """
+    record_tombstone(CatalogTombstone.PRODUCT, instance.pk)
+
+
+@_unless_muted
+def record_comparison_image_tombstone(sender, instance, **kwargs):
+    """
+    Log a deleted comparison image for clients syncing incrementally.
+    """
+    record_tombstone(CatalogTombstone.COMPARISON_IMAGE, instance.pk)
+
+
+@_unless_muted
+def touch_specification_product(sender, instance, **kwargs):
+    """
+    Mark the product as updated when one of its specifications changes,
+    so Product.updated_at stays a valid HTTP validator for the catalog,
+    rebuild its denormalized specs_cache and evict its cached detail entry.
+    """
+    Product.objects.filter(pk=instance.product_id).update(
+        updated_at=timezone.now(),
+        specs_cache=build_specs_caches([instance.product_id])[instance.product_id],
+    )
+    bump_product_version(instance.product_id)
+
+
+@_unless_muted
+def touch_specification_type_products(sender, instance, created=False, **kwargs):
+    """
+    Mark every product using a specification type as updated when the type is renamed
+    or its unit changes, re-parse the numeric values against the new unit and
+    rebuild the specs_cache of those products.
+    Deleting a type cascades to its specifications instead.
+    """
+    if not created:
+        specifications = list(ProductSpecification.objects.filter(specification_type=instance).only('id', 'value'))
+        for specification in specifications:
+            specification.numeric_value = parse_spec_value(specification.value, instance.unit)
+        ProductSpecification.objects.bulk_update(specifications, ['numeric_value'], batch_size=500)
+
+        product_ids = list(
+            Product.objects.filter(specifications__specification_type=instance).values_list('pk', flat=True)
+        )
+        rebuild_specs_cache(product_ids, touch=True)
+        for product_id in product_ids:
+            bump_product_version(product_id)
+
+
+@_unless_muted
+def schedule_image_variants(sender, instance, **kwargs):
+    """
+    Fill in the size, placeholder and colour of new or replaced images once the
+    save is committed (a no-op when the stored data matches the current files).
+    The variants are encoded too with IMAGE_VARIANTS_ON_SAVE; otherwise they are
+    left pending for generate_image_variants.
+    """
+    transaction.on_commit(
+        lambda: refresh_instance_variants(instance, variants=settings.IMAGE_VARIANTS_ON_SAVE)
+    )
+
+
+def catalog_bulk_changed(product_ids=()):
+    """
+    Do what the save signals would have done after a bulk_create/update()
+    that bypassed them: bump the catalog version (republishing the snapshot
+    when enabled) and evict the cached detail entries of the given products.
+    """
+    _catalog_changed()
+    for product_id in product_ids:
+        bump_product_version(product_id)
+
+
+for model in CATALOG_MODELS:
+    post_save.connect(invalidate_catalog_cache, sender=model, dispatch_uid=f'catalog_save_{model.__name__}')
+    post_delete.connect(invalidate_catalog_cache, sender=model, dispatch_uid=f'catalog_delete_{model.__name__}')
+
+post_save.connect(invalidate_product_cache, sender=Product, dispatch_uid='invalidate_product_cache_save')
+post_delete.connect(invalidate_product_cache, sender=Product, dispatch_uid='invalidate_product_cache_delete')
+post_delete.connect(record_product_tombstone, sender=Product, dispatch_uid='record_product_tombstone')
+post_delete.connect(record_comparison_image_tombstone, sender=ProductSeriesComparisonImage, dispatch_uid='record_comparison_image_tombstone')
+post_save.connect(touch_specification_product, sender=ProductSpecification, dispatch_uid='touch_specification_product_save')
+post_delete.connect(touch_specification_product, sender=ProductSpecification, dispatch_uid='touch_specification_product_delete')
+for model in IMAGE_VARIANT_FIELDS:
+    post_save.connect(schedule_image_variants, sender=model, dispatch_uid=f'image_variants_{model.__name__}')
+post_save.connect(touch_specification_type_products, sender=SpecificationType, dispatch_uid='touch_specification_type_products')
@@ -0,0 +1 @@
+# Storages package for website app
\ No newline at end of file
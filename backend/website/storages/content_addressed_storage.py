@@ -0,0 +1,71 @@
+import hashlib
+import os
+import posixpath
+import re
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.core.files.utils import validate_file_name
+from django.utils.crypto import get_random_string
+
+# Hex characters of the SHA-256 digest kept in file names
+CONTENT_HASH_LENGTH = 32
+CONTENT_ADDRESSED_NAME = re.compile(rf'^[0-9a-f]{{{CONTENT_HASH_LENGTH}}}(\.[0-9a-z]+)?$')
+
+
+def is_content_addressed(name):
+    """
+    Whether a stored name was derived from its content, so the file behind it
+    never changes and can be cached forever.
+    """
+    return bool(CONTENT_ADDRESSED_NAME.match(posixpath.basename(name)))
+
+
+def content_hash(content):
+    """
+    Hex SHA-256 digest of a File, read in chunks; the file is left rewound.
+    """
+    digest = hashlib.sha256()
+    content.seek(0)
+    for chunk in content.chunks():
+        digest.update(chunk.encode() if isinstance(chunk, str) else chunk)
+    content.seek(0)
+    return digest.hexdigest()
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    File system storage that names every file after a hash of its content,
+    keeping the requested directory and extension:
+    'products/main_images/foto.JPG' is stored as
+    'products/main_images/<sha256[:32]>.jpg'. Saving content that is already
+    stored returns the existing name without writing anything (only the
+    modification time is refreshed, so collect_media_garbage treats the file as
+    recent again), so identical uploads share one file, and a stored file never
+    changes, so it can be served with Cache-Control: immutable. Files are
+    written under a temporary name and moved into place, so a concurrent reader
+    never sees a partial file.
+    """
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+
+        directory, basename = posixpath.split(str(name).replace('\\', '/'))
+        extension = os.path.splitext(basename)[1].lower()
+        name = posixpath.join(directory, f'{content_hash(content)[:CONTENT_HASH_LENGTH]}{extension}')
+        validate_file_name(name, allow_relative_path=True)
+        if self.exists(name):
+            try:
+                os.utime(self.path(name))
+                return name
+            except FileNotFoundError:
+                # Collected in the meantime; write it again
+                pass
+        return self._save(name, content)
+
+    def _save(self, name, content):
+        temporary_name = super()._save(f'{name}.{get_random_string(8)}.part', content)
+        os.replace(self.path(temporary_name), self.path(name))
+        return name
@@ -1,3 +1,1429 @@
-from django.test import TestCase
+import base64
+import csv
+import datetime
+import io
+import gzip
+import json
+import os
+import shutil
+import tempfile
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+from django.conf import settings
+from django.core import mail
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from PIL import ExifTags, Image
+from rest_framework.renderers import JSONRenderer
+from website.models.catalog_tombstone_model import CatalogTombstone
+from website.models.contact_archive_model import ContactArchive
+from website.models.contact_model import Contact
+from website.models.contact_notification_model import ContactNotification
+from website.models.product_model import Product
+from website.models.product_series_comparison_image_model import ProductSeriesComparisonImage
+from website.models.product_specification_model import ProductSpecification
+from website.models.specification_type_model import SpecificationType
+from website.renderers.fast_json_renderer import FastJSONRenderer
+from website.services.catalog_cache import get_catalog_version
+from website.services.catalog_import import CatalogImportError, read_catalog_file
+from website.services.catalog_snapshot import publish_catalog_snapshot
+from website.services.catalog_sync import from_sync_version, to_sync_version
+from website.services.compression import brotli_compress
+from website.services.contact_export import csv_safe
+from website.services.contact_guard import get_contact_stats
+from website.services.contact_retention import retention_cutoff
+from website.services.contact_notifications import claim_due_notifications, deliver_notifications
+from website.services.image_variants import refresh_instance_variants
+from website.services.media_gc import collect_media_garbage
+from website.services.spec_values import parse_number, parse_spec_value
+from website.services.specs_cache import find_stale_specs_caches
+from website.services.synthetic_catalog import clear_synthetic_catalog, generate_synthetic_catalog
+from website.storages.content_addressed_storage import is_content_addressed
+from website.views import product_view
+from website.views.product_view import build_catalog_data
 
-# Create your tests here.
+TEMP_MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def make_image(color='red', size=(40, 20), image_format='PNG'):
+    """
+    Return the bytes of a small solid-colour image.
+    """
+    buffer = io.BytesIO()
+    Image.new('RGB', size, color).save(buffer, format=image_format)
+    return buffer.getvalue()
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT, IMAGE_VARIANT_WIDTHS=(16, 32))
+class CatalogSerializerParityTests(TestCase):
+    """
+    The fast catalog serializer must render byte-identical JSON to the DRF serializers.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command('create_sample_products', stdout=StringIO())
+
+        product = Product.objects.create(
+            title='Rainy Ñandú 1000',
+            price=Decimal('1234567.50'),
+            description='Producto con imágenes',
+            main_image=SimpleUploadedFile('foto principal ñ.jpg', b'main'),
+            dimensions_image=SimpleUploadedFile('medidas.png', b'dims'),
+            order=6,
+        )
+        ProductSpecification.objects.create(
+            product=product,
+            specification_type=SpecificationType.objects.create(name='Color'),
+            value='Gris',
+        )
+        refresh_instance_variants(product)
+        refresh_instance_variants(Product.objects.create(
+            title='Rainy Variantes',
+            price=Decimal('10'),
+            description='Producto con variantes',
+            main_image=SimpleUploadedFile('variantes.png', make_image()),
+            order=7,
+        ))
+        Product.objects.create(title='Inactivo', price=Decimal('1'), description='-', is_active=False)
+        refresh_instance_variants(ProductSeriesComparisonImage.objects.create(
+            name='Comparativa Serie Rainy FL',
+            image=SimpleUploadedFile('comparativa.png', make_image('blue')),
+        ))
+        ProductSeriesComparisonImage.objects.create(
+            name='Oculta',
+            image=SimpleUploadedFile('oculta.webp', b'hidden'),
+            is_active=False,
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def render(self, engine, **request_kwargs):
+        request = RequestFactory().get('/api/products/', **request_kwargs)
+        return JSONRenderer().render(build_catalog_data(request, engine=engine))
+
+    def test_fast_engine_matches_drf_serializers(self):
+        rendered = self.render('fast')
+        self.assertRegex(rendered, rb'http://testserver/media/products/main_images/[0-9a-f]{32}\.jpg')
+        self.assertEqual(rendered, self.render('drf'))
+
+    def test_fast_engine_matches_drf_serializers_over_https(self):
+        kwargs = {'secure': True, 'HTTP_HOST': 'testserver:8443'}
+        self.assertEqual(self.render('fast', **kwargs), self.render('drf', **kwargs))
+
+    def test_variants_are_exposed_as_srcset(self):
+        data = build_catalog_data(RequestFactory().get('/api/products/'))
+        product = next(product for product in data['products'] if product['slug'] == 'rainy-variantes')
+
+        srcset = product['main_image_srcset']
+        self.assertEqual({entry['width'] for entry in srcset}, {16, 32})
+        self.assertIn('image/webp', {entry['type'] for entry in srcset})
+        self.assertTrue(all(entry['url'].startswith('http://testserver/media/products/main_images/variants/') for entry in srcset))
+        self.assertEqual(product['dimensions_image_srcset'], [])
+        self.assertTrue(data['comparison_images'][0]['image_srcset'])
+
+    def test_image_metadata_is_stored(self):
+        product = Product.objects.get(slug='rainy-variantes')
+
+        self.assertEqual((product.main_image_width, product.main_image_height), (40, 20))
+        self.assertEqual(product.main_image_color, '#ff0000')
+        self.assertTrue(product.main_image_placeholder.startswith('data:image/'))
+        self.assertLess(len(product.main_image_placeholder), 1000)
+        self.assertEqual(product.dimensions_image_placeholder, '')
+
+    def test_loading_rows_does_not_open_images(self):
+        with mock.patch('django.core.files.images.get_image_dimensions') as get_dimensions:
+            list(Product.objects.all())
+            list(ProductSeriesComparisonImage.objects.all())
+        get_dimensions.assert_not_called()
+
+    def test_unreadable_image_gets_zero_size(self):
+        hidden = ProductSeriesComparisonImage.objects.get(name='Oculta')
+        refresh_instance_variants(hidden)
+        hidden.refresh_from_db()
+
+        self.assertEqual((hidden.image_width, hidden.image_height), (0, 0))
+        self.assertEqual(hidden.image_variants['variants'], [])
+
+    def test_identical_uploads_share_variant_files(self):
+        product = Product.objects.create(
+            title='Copia', price=Decimal('1'), description='-',
+            main_image=SimpleUploadedFile('copia.png', make_image()),
+        )
+        with mock.patch('website.services.image_variants.ContentFile') as encoded_variant:
+            refresh_instance_variants(product)
+        encoded_variant.assert_not_called()
+        original = Product.objects.get(slug='rainy-variantes')
+        self.assertEqual(product.main_image_variants['variants'], original.main_image_variants['variants'])
+
+    def test_fast_engine_uses_fewer_queries(self):
+        # Products (with their specs_cache) and comparison images
+        with self.assertNumQueries(2):
+            self.render('fast')
+
+    def test_benchmark_command_fails_on_parity_mismatch(self):
+        call_command('benchmark_catalog_serializer', '--iterations', '1', stdout=StringIO())
+
+        def build(request, engine='fast'):
+            data = build_catalog_data(request, engine=engine)
+            if engine == 'fast':
+                data['products'] = data['products'][1:]
+            return data
+
+        with mock.patch('website.management.commands.benchmark_catalog_serializer.build_catalog_data', build):
+            with self.assertRaisesMessage(CommandError, 'Outputs differ'):
+                call_command('benchmark_catalog_serializer', '--iterations', '1', stdout=StringIO())
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT, IMAGE_VARIANT_WIDTHS=(16,))
+class ContentAddressedMediaTests(TestCase):
+    """
+    Uploads are stored once under their content hash; unreferenced files are collected.
+    """
+
+    def test_identical_uploads_are_stored_once(self):
+        first = Product.objects.create(
+            title='Original', price=Decimal('1'), description='-',
+            main_image=SimpleUploadedFile('foto.PNG', make_image('green')),
+        )
+        second = Product.objects.create(
+            title='Duplicado', price=Decimal('1'), description='-',
+            main_image=SimpleUploadedFile('otro nombre.png', make_image('green')),
+        )
+
+        self.assertEqual(first.main_image.name, second.main_image.name)
+        self.assertRegex(first.main_image.name, r'^products/main_images/[0-9a-f]{32}\.png$')
+        self.assertTrue(is_content_addressed(first.main_image.name))
+        response = self.client.get(f'/media/{first.main_image.name}')
+        self.assertIn('immutable', response['Cache-Control'])
+
+    def test_garbage_collection_keeps_referenced_files_and_variants(self):
+        product = Product.objects.create(
+            title='Con imagen', price=Decimal('1'), description='-',
+            main_image=SimpleUploadedFile('foto.png', make_image('purple')),
+        )
+        refresh_instance_variants(product)
+        orphan = default_storage.save('products/main_images/huerfana.png', ContentFile(make_image('orange')))
+        kept = [product.main_image.name, *(variant['name'] for variant in product.main_image_variants['variants'])]
+
+        self.assertEqual(collect_media_garbage()['deleted'], 0)  # younger than the grace period
+        result = collect_media_garbage(grace_hours=0)
+
+        self.assertIn(orphan, result['names'])
+        self.assertFalse(default_storage.exists(orphan))
+        self.assertTrue(all(default_storage.exists(name) for name in kept))
+
+    def test_resaving_stored_content_restarts_the_grace_period(self):
+        name = default_storage.save('products/main_images/vieja.png', ContentFile(make_image('gray')))
+        old = datetime.datetime(2020, 1, 1).timestamp()
+        os.utime(default_storage.path(name), (old, old))
+
+        self.assertEqual(default_storage.save('products/main_images/nueva.png', ContentFile(make_image('gray'))), name)
+        result = collect_media_garbage(grace_hours=1)
+        self.assertNotIn(name, result['names'])
+        self.assertTrue(default_storage.exists(name))
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT, IMAGE_VARIANT_WIDTHS=(16,))
+class ImageVariantGenerationTests(TestCase):
+    """
+    Variants are generated by generate_image_variants, never for oversized images.
+    """
+
+    def create_product(self, **image_kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Product.objects.create(
+                title='Con imagen', price=Decimal('1'), description='-',
+                main_image=SimpleUploadedFile('foto.png', make_image('navy', **image_kwargs)),
+            )
+
+    def test_saving_fills_metadata_and_defers_variants_by_default(self):
+        product = self.create_product()
+        product.refresh_from_db()
+        self.assertEqual((product.main_image_width, product.main_image_height), (40, 20))
+        self.assertTrue(product.main_image_placeholder.startswith('data:image/'))
+        self.assertEqual(product.main_image_color, '#000080')
+        self.assertEqual(product.main_image_variants['variants'], [])
+        self.assertTrue(product.main_image_variants['pending'])
+
+        call_command('generate_image_variants', stdout=StringIO())
+        product.refresh_from_db()
+        self.assertEqual(product.main_image_width, 40)
+        self.assertTrue(product.main_image_variants['variants'])
+        self.assertNotIn('pending', product.main_image_variants)
+
+    def test_metadata_of_rotated_jpeg_uses_the_displayed_size(self):
+        buffer = io.BytesIO()
+        exif = Image.Exif()
+        exif[ExifTags.Base.Orientation] = 6
+        Image.new('RGB', (400, 300), 'navy').save(buffer, format='JPEG', exif=exif)
+        product = Product.objects.create(title='Girada', price=Decimal('1'), description='-')
+        product.main_image.save('girada.jpg', ContentFile(buffer.getvalue()), save=False)
+
+        refresh_instance_variants(product, variants=False)
+        self.assertEqual((product.main_image_width, product.main_image_height), (300, 400))
+        self.assertTrue(product.main_image_variants['pending'])
+
+    @override_settings(IMAGE_VARIANTS_ON_SAVE=True)
+    def test_saving_generates_variants_when_enabled(self):
+        product = self.create_product()
+        product.refresh_from_db()
+        self.assertTrue(product.main_image_variants['variants'])
+
+    @override_settings(IMAGE_VARIANT_MAX_PIXELS=100)
+    def test_oversized_images_are_not_decoded(self):
+        product = self.create_product()
+        with mock.patch('website.services.image_variants.ImageOps.exif_transpose') as decode:
+            refresh_instance_variants(product)
+        decode.assert_not_called()
+        self.assertEqual((product.main_image_width, product.main_image_height), (0, 0))
+        self.assertEqual(product.main_image_variants['variants'], [])
+
+    def test_decompression_bombs_are_skipped(self):
+        product = self.create_product()
+        with mock.patch('website.services.image_variants.Image.open', side_effect=Image.DecompressionBombError('bomb')):
+            refresh_instance_variants(product)
+        self.assertEqual(product.main_image_variants['variants'], [])
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class MediaViewTests(TestCase):
+    """
+    The media view answers conditional and Range requests and can offload the transfer.
+    """
+
+    def setUp(self):
+        self.content = bytes(range(256)) * 4
+        self.name = default_storage.save('products/comparison_images/serie.bin', ContentFile(self.content))
+        self.url = f'/media/{self.name}'
+
+    def test_full_and_conditional_responses(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.content)
+        self.assertEqual(response['ETag'], '"%s"' % self.name.split('/')[-1].split('.')[0])
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_range_requests(self):
+        response = self.client.get(self.url, HTTP_RANGE='bytes=10-19')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], 'bytes 10-19/1024')
+        # Without fileno() a sendfile-based file_wrapper cannot send past the range
+        self.assertFalse(hasattr(response.file_to_stream, 'fileno'))
+        self.assertEqual(b''.join(response.streaming_content), self.content[10:20])
+
+        response = self.client.get(self.url, HTTP_RANGE='bytes=-4')
+        self.assertEqual(b''.join(response.streaming_content), self.content[-4:])
+
+        response = self.client.get(self.url, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"outdated"')
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.get(self.url, HTTP_RANGE='bytes=2000-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */1024')
+
+    def test_legacy_files_are_validated_without_reading_them(self):
+        path = os.path.join(TEMP_MEDIA_ROOT, 'products', 'antigua.jpg')
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as handle:
+            handle.write(b'version 1')
+
+        with mock.patch('builtins.open', side_effect=AssertionError('file was read')):
+            etag = self.client.head('/media/products/antigua.jpg')['ETag']
+        self.assertEqual(self.client.get('/media/products/antigua.jpg', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        with open(path, 'wb') as handle:
+            handle.write(b'version 2 (larger)')
+        self.assertNotEqual(self.client.head('/media/products/antigua.jpg')['ETag'], etag)
+
+    @override_settings(MEDIA_SENDFILE='x-accel-redirect')
+    def test_transfer_is_offloaded_to_the_front_server(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response['X-Accel-Redirect'], f'/protected-media/{self.name}')
+        self.assertEqual(response.content, b'')
+
+        self.assertEqual(self.client.get('/media/products/../../settings.py').status_code, 400)
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+class ContactNotificationOutboxTests(TestCase):
+    """
+    Contact submissions are queued in the outbox and delivered by the worker.
+    """
+
+    def setUp(self):
+        cache.clear()
+
+    def post_contact(self, **overrides):
+        data = {'name': 'Ana', 'email': 'ana@example.com', 'message': 'Hola', **overrides}
+        return self.client.post('/api/contact/', data)
+
+    def test_contact_is_queued_without_sending(self):
+        response = self.post_contact()
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(mail.outbox), 0)
+        notification = ContactNotification.objects.get()
+        self.assertEqual(notification.status, ContactNotification.PENDING)
+
+    def test_worker_sends_pending_notifications(self):
+        self.post_contact()
+        self.post_contact(email='luis@example.com')
+
+        call_command('send_contact_notifications', stdout=StringIO())
+
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertIn('luis@example.com', mail.outbox[1].body)
+        self.assertFalse(ContactNotification.objects.exclude(status=ContactNotification.SENT).exists())
+
+    @override_settings(CONTACT_NOTIFICATION_MAX_ATTEMPTS=2)
+    def test_failed_delivery_is_retried_then_marked_failed(self):
+        self.post_contact()
+        notification = ContactNotification.objects.get()
+
+        with mock.patch(
+            'django.core.mail.backends.locmem.EmailBackend.send_messages',
+            side_effect=ConnectionError('SMTP down'),
+        ):
+            call_command('send_contact_notifications', stdout=StringIO())
+            notification.refresh_from_db()
+            self.assertEqual(notification.status, ContactNotification.PENDING)
+            self.assertEqual(notification.last_error, 'SMTP down')
+
+            ContactNotification.objects.update(next_attempt_at=notification.created_at)
+            call_command('send_contact_notifications', stdout=StringIO())
+
+        notification.refresh_from_db()
+        self.assertEqual(notification.status, ContactNotification.FAILED)
+        self.assertEqual(notification.attempts, 2)
+        self.assertEqual(Contact.objects.count(), 1)
+
+    def test_digest_mode_sends_one_email_per_batch(self):
+        self.post_contact()
+        self.post_contact(email='luis@example.com')
+
+        call_command('send_contact_notifications', '--mode', 'digest', stdout=StringIO())
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn('ana@example.com', mail.outbox[0].body)
+        self.assertIn('luis@example.com', mail.outbox[0].body)
+        self.assertEqual(ContactNotification.objects.filter(status=ContactNotification.SENT).count(), 2)
+
+    def test_batch_window_holds_back_recent_notifications(self):
+        self.post_contact()
+
+        call_command('send_contact_notifications', '--window', '60', stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 0)
+
+        call_command('send_contact_notifications', '--window', '60', '--batch-size', '1', stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_sent_notification_keeps_its_lease_time(self):
+        self.post_contact()
+
+        notifications = claim_due_notifications(10)
+        deliver_notifications(notifications)
+
+        notification = ContactNotification.objects.get()
+        self.assertEqual(notification.status, ContactNotification.SENT)
+        self.assertEqual(notification.next_attempt_at, notifications[0].next_attempt_at)
+        self.assertGreater(notification.next_attempt_at, notification.created_at)
+
+    @override_settings(CONTACT_NOTIFICATION_BACKLOG_WARNING_SECONDS=60)
+    def test_old_backlog_is_logged_and_reported(self):
+        self.post_contact()
+        ContactNotification.objects.update(
+            created_at=timezone.now() - datetime.timedelta(hours=2),
+            next_attempt_at=timezone.now() + datetime.timedelta(hours=1),
+        )
+
+        with self.assertLogs('website.services.contact_notifications', level='WARNING') as logs:
+            call_command('send_contact_notifications', stdout=StringIO())
+        self.assertIn('1 pending', logs.output[0])
+
+        staff = User.objects.create_user('staff', password='x', is_staff=True)
+        self.client.force_login(staff)
+        backlog = self.client.get('/api/contact/stats/').json()['notifications']
+        self.assertEqual(backlog['pending'], 1)
+        self.assertGreaterEqual(backlog['oldest_pending_seconds'], 7200)
+
+
+@override_settings(
+    EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+    CONTACT_THROTTLE_RATES={'ip': (4, 600), 'email': (2, 3600)},
+)
+class ContactThrottleTests(TestCase):
+    """
+    The contact endpoint drops duplicates and rate limits per IP and per e-mail.
+    """
+
+    def setUp(self):
+        cache.clear()
+
+    def post_contact(self, **overrides):
+        data = {'name': 'Ana', 'email': 'ana@example.com', 'message': 'Hola', **overrides}
+        return self.client.post('/api/contact/', data)
+
+    def test_duplicate_submission_is_not_stored(self):
+        self.assertEqual(self.post_contact().status_code, 201)
+        response = self.post_contact(name='Ana María', message='  Hola ')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Contact.objects.count(), 1)
+
+    def test_email_and_ip_buckets_reject_with_retry_after(self):
+        self.post_contact(message='uno')
+        self.post_contact(message='dos')
+        response = self.post_contact(message='tres')
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+
+        # Rejected requests still spend an IP token; one is left for another address
+        self.assertEqual(self.post_contact(email='luis@example.com').status_code, 201)
+        self.assertEqual(self.post_contact(email='eva@example.com').status_code, 429)
+
+        self.assertEqual(Contact.objects.count(), 3)
+        stats = get_contact_stats()
+        self.assertEqual((stats['rejected_email'], stats['rejected_ip']), (1, 1))
+
+    def test_duplicates_spend_no_tokens(self):
+        self.assertEqual(self.post_contact().status_code, 201)
+        for _ in range(3):
+            self.assertEqual(self.post_contact().status_code, 200)
+
+        self.assertEqual(self.post_contact(message='dos').status_code, 201)
+        self.assertEqual(get_contact_stats()['duplicates'], 3)
+
+    def test_non_object_body_is_a_validation_error(self):
+        response = self.client.post('/api/contact/', [1, 2], content_type='application/json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Contact.objects.count(), 0)
+
+
+class ContactExportTests(TestCase):
+    """
+    Contacts can be streamed out as CSV or JSON lines within a date range.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        for day, name in ((1, 'Ana'), (2, 'Luis'), (3, 'Eva')):
+            contact = Contact.objects.create(name=name, email=f'{name.lower()}@example.com', message=f'Hola, {name}')
+            Contact.objects.filter(pk=contact.pk).update(
+                created_at=datetime.datetime(2025, 1, day, 12, tzinfo=datetime.timezone.utc)
+            )
+        cls.staff = User.objects.create_user('staff', password='x', is_staff=True)
+
+    def test_endpoint_streams_csv_within_bounds(self):
+        self.client.force_login(self.staff)
+        response = self.client.get('/api/contact/export/', {'since': '2025-01-02', 'until': '2025-01-03'})
+
+        self.assertTrue(response.streaming)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], 'id,name,phone,email,message,created_at')
+        self.assertEqual(len(lines), 2)
+        self.assertIn('"Hola, Luis"', lines[1])
+
+    def test_endpoint_requires_staff(self):
+        self.assertEqual(self.client.get('/api/contact/export/').status_code, 403)
+
+    def test_command_writes_json_lines(self):
+        stdout, stderr = StringIO(), StringIO()
+        call_command('export_contacts', '--format', 'jsonl', stdout=stdout, stderr=stderr)
+
+        records = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        self.assertEqual([record['name'] for record in records], ['Ana', 'Luis', 'Eva'])
+        self.assertIn('Exported 3 contacts', stderr.getvalue())
+
+    def test_impossible_bounds_are_rejected(self):
+        self.client.force_login(self.staff)
+        for value in ('2025-02-30', '2025-02-30T10:00:00', 'yesterday'):
+            with self.subTest(value=value):
+                self.assertEqual(self.client.get('/api/contact/export/', {'since': value}).status_code, 400)
+                with self.assertRaises(CommandError):
+                    call_command('export_contacts', '--since', value, stdout=StringIO(), stderr=StringIO())
+
+    def test_csv_cells_cannot_start_formulas(self):
+        Contact.objects.create(name='=HYPERLINK("http://example.com")', email='x@example.com', message='@SUM(A1)')
+        self.client.force_login(self.staff)
+        response = self.client.get('/api/contact/export/', {'since': '2025-02-01'})
+
+        row = next(csv.reader(b''.join(response.streaming_content).decode().splitlines()[1:]))
+        self.assertEqual(row[1], '\'=HYPERLINK("http://example.com")')
+        self.assertEqual(row[4], "'@SUM(A1)")
+
+    def test_csv_keeps_phone_numbers_as_they_are(self):
+        for value, expected in (('+57 300 123 4567', '+57 300 123 4567'), ('-42', '-42'), ('+1+1', "'+1+1"), ('-', "'-")):
+            with self.subTest(value=value):
+                self.assertEqual(csv_safe(value), expected)
+
+
+class ContactRetentionTests(TestCase):
+    """
+    archive_contacts moves old submissions out of the Contact table in batches.
+    """
+
+    def setUp(self):
+        now = datetime.datetime.now(datetime.timezone.utc)
+        for months_old, name in ((30, 'Ana'), (26, 'Luis'), (1, 'Eva')):
+            contact = Contact.objects.create(name=name, email=f'{name.lower()}@example.com', message='Hola')
+            Contact.objects.filter(pk=contact.pk).update(created_at=now - datetime.timedelta(days=31 * months_old))
+
+    def test_old_submissions_move_to_archive_table(self):
+        call_command('archive_contacts', '--months', '24', '--batch-size', '1', stdout=StringIO())
+
+        self.assertEqual(list(Contact.objects.values_list('name', flat=True)), ['Eva'])
+        self.assertEqual(list(ContactArchive.objects.values_list('name', flat=True)), ['Ana', 'Luis'])
+
+    def test_old_submissions_move_to_compressed_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = f'{directory}/contacts.jsonl.gz'
+            call_command('archive_contacts', '--to', 'file', '--output', path, stdout=StringIO())
+            with gzip.open(path, 'rt', encoding='utf-8') as archive:
+                names = [json.loads(line)['name'] for line in archive]
+
+        self.assertEqual(names, ['Ana', 'Luis'])
+
+    def test_failed_batch_is_removed_from_the_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = f'{directory}/contacts.jsonl.gz'
+            with mock.patch('django.db.models.query.QuerySet.delete', side_effect=RuntimeError('fallo')):
+                with self.assertRaises(RuntimeError):
+                    call_command('archive_contacts', '--to', 'file', '--output', path, stdout=StringIO())
+            self.assertEqual(os.path.getsize(path), 0)
+            self.assertEqual(Contact.objects.count(), 3)
+
+            call_command('archive_contacts', '--to', 'file', '--output', path, stdout=StringIO())
+            with gzip.open(path, 'rt', encoding='utf-8') as archive:
+                names = [json.loads(line)['name'] for line in archive]
+
+        self.assertEqual(names, ['Ana', 'Luis'])
+
+    def test_contacts_already_in_the_file_are_not_written_twice(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = f'{directory}/contacts.jsonl.gz'
+            # As left by a run that died after writing its batch, before the delete committed
+            ana = Contact.objects.get(name='Ana')
+            with gzip.open(path, 'wt', encoding='utf-8') as archive:
+                archive.write(json.dumps({'id': ana.pk, 'name': 'Ana'}) + '\n')
+
+            call_command('archive_contacts', '--to', 'file', '--output', path, stdout=StringIO())
+            with gzip.open(path, 'rt', encoding='utf-8') as archive:
+                names = [json.loads(line)['name'] for line in archive]
+
+        self.assertEqual(names, ['Ana', 'Luis'])
+        self.assertEqual(list(Contact.objects.values_list('name', flat=True)), ['Eva'])
+        self.assertEqual(Contact.objects.count(), 1)
+        self.assertFalse(ContactArchive.objects.exists())
+
+    def test_default_file_is_reused_by_a_restarted_run(self):
+        with tempfile.TemporaryDirectory() as directory, override_settings(CONTACT_ARCHIVE_ROOT=directory):
+            with mock.patch('django.db.models.query.QuerySet.delete', side_effect=RuntimeError('fallo')):
+                with self.assertRaises(RuntimeError):
+                    call_command('archive_contacts', '--to', 'file', stdout=StringIO())
+            call_command('archive_contacts', '--to', 'file', stdout=StringIO())
+
+            files = os.listdir(directory)
+            self.assertEqual(files, [f'contacts-{retention_cutoff(settings.CONTACT_RETENTION_MONTHS):%Y-%m}.jsonl.gz'])
+            with gzip.open(os.path.join(directory, files[0]), 'rt', encoding='utf-8') as archive:
+                names = [json.loads(line)['name'] for line in archive]
+
+        self.assertEqual(names, ['Ana', 'Luis'])
+
+
+class SpecValueParsingTests(TestCase):
+    """
+    Numbers in specification values and filters are parsed strictly.
+    """
+
+    def test_parse_number(self):
+        cases = {
+            '30,48': Decimal('30.48'),
+            '1.200': Decimal('1200'),
+            '1.200.000': Decimal('1200000'),
+            '1.200,5': Decimal('1200.5'),
+            '0.25': Decimal('0.25'),
+            '0.250': Decimal('0.25'),
+            ' 4 ': Decimal('4'),
+        }
+        for text, expected in cases.items():
+            with self.subTest(text=text):
+                self.assertEqual(parse_number(text), expected)
+        for text in ('NaN', 'sNaN', 'Infinity', '-inf', '1e5', '1E-3', 'abc', ''):
+            with self.subTest(text=text):
+                self.assertIsNone(parse_number(text))
+
+    def test_parse_spec_value(self):
+        self.assertEqual(parse_spec_value('250 micras (0,25 mm)', 'micras'), Decimal('250'))
+        self.assertEqual(parse_spec_value('0,25 mm', 'micras'), Decimal('250'))
+        self.assertEqual(parse_spec_value('1.200 L/min', 'L/min'), Decimal('1200'))
+        self.assertEqual(parse_spec_value('Por encima del 90%', '%'), Decimal('90'))
+        self.assertIsNone(parse_spec_value('acero inoxidable SS-304', None))
+
+    def test_spec_values_fit_the_numeric_column(self):
+        self.assertEqual(parse_spec_value('100 L/h', 'L/min').as_tuple().exponent, -6)
+        self.assertEqual(parse_spec_value('100 L/h', 'L/min'), Decimal('1.666667'))
+        self.assertEqual(parse_spec_value('99.999.999.999.999 m2', 'm2'), Decimal('99999999999999'))
+        self.assertIsNone(parse_spec_value('100.000.000.000.000 m2', 'm2'))
+        self.assertIsNone(parse_spec_value('1' * 40, ''))
+
+        flow = SpecificationType.objects.create(name='Caudal', unit='L/min')
+        product = Product.objects.create(title='Enorme', price=Decimal('1'), description='-')
+        specification = ProductSpecification.objects.create(
+            product=product, specification_type=flow, value='9.999.999.999.999 L/s'
+        )
+        specification.refresh_from_db()
+        self.assertIsNone(specification.numeric_value)
+
+    def test_spec_filters(self):
+        area = SpecificationType.objects.create(name='Área', unit='m²')
+        for title, value in (('Pequeño', '120 m2'), ('Grande', '1.500 m2')):
+            product = Product.objects.create(title=title, price=Decimal('1'), description='-')
+            ProductSpecification.objects.create(product=product, specification_type=area, value=value)
+
+        response = self.client.get('/api/products/', {'spec[Área]__gte': '1.000'})
+        self.assertEqual([product['title'] for product in response.json()['products']], ['Grande'])
+        for value in ('NaN', 'Infinity', '1e5', 'mucho'):
+            with self.subTest(value=value):
+                self.assertEqual(self.client.get('/api/products/', {'spec[Área]__gte': value}).status_code, 400)
+
+
+class RecommenderTests(TestCase):
+    """
+    products_recommend validates its parameters.
+    """
+
+    def test_rejects_non_positive_and_non_finite_values(self):
+        call_command('create_sample_products', stdout=StringIO())
+        self.assertEqual(self.client.get('/api/products/recommend/', {'area': '150'}).status_code, 200)
+        for area in ('NaN', 'inf', 'Infinity', '1e999999', '9' * 400, '0', '-5', 'grande'):
+            with self.subTest(area=area):
+                self.assertEqual(self.client.get('/api/products/recommend/', {'area': area}).status_code, 400)
+        response = self.client.get('/api/products/recommend/', {'area': '150', 'intensity': 'NaN'})
+        self.assertEqual(response.status_code, 400)
+
+    def recommend(self, **params):
+        response = self.client.get('/api/products/recommend/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()['recommendations']
+
+    def test_products_fit_at_their_rated_point(self):
+        call_command('create_sample_products', stdout=StringIO())
+
+        best = self.recommend(area='120', intensity='75')[0]
+        self.assertEqual((best['slug'], best['fits'], best['max_area']), ('rainy-fl-80', True, 120))
+        self.assertEqual(best['utilization'], 1)
+
+        results = self.recommend(area='150', intensity='75')
+        self.assertEqual([result['slug'] for result in results][:2], ['rainy-fl-150', 'rainy-fl-250'])
+        self.assertEqual(results[0]['max_area'], 180)
+        self.assertFalse(next(result for result in results if result['slug'] == 'rainy-fl-80')['fits'])
+
+    def test_heavier_rain_needs_a_larger_filter(self):
+        call_command('create_sample_products', stdout=StringIO())
+
+        best = self.recommend(area='120', intensity='150')[0]
+        self.assertEqual((best['slug'], best['max_area']), ('rainy-fl-250', 125))
+
+    def test_nothing_fits_lists_the_largest_first(self):
+        call_command('create_sample_products', stdout=StringIO())
+
+        results = self.recommend(area='5000')
+        self.assertFalse(any(result['fits'] for result in results))
+        self.assertEqual(results[0]['slug'], 'rainy-fl-500')
+
+    def test_flow_is_converted_from_its_unit(self):
+        flow = SpecificationType.objects.create(name=settings.RECOMMENDER_SPEC_NAMES['flow'], unit='L/s')
+        product = Product.objects.create(title='Rainy Caudal', price=Decimal('1'), description='-')
+        ProductSpecification.objects.create(product=product, specification_type=flow, value='2 L/s')
+
+        best = self.recommend(area='96', intensity='75')[0]
+        self.assertEqual((best['capacity_flow'], best['max_area'], best['fits']), (120, 96, True))
+
+
+class CatalogCacheTests(TestCase):
+    """
+    products_list serves the catalog from a cache entry keyed by the catalog version.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.product = Product.objects.create(title='Rainy FL 80', price=Decimal('100'), description='-')
+        flow = SpecificationType.objects.create(name='Caudal', unit='L/min')
+        ProductSpecification.objects.create(product=self.product, specification_type=flow, value='80')
+
+    def get_catalog(self):
+        return self.client.get('/api/products/')
+
+    def test_hit_needs_no_queries(self):
+        with CaptureQueriesContext(connection) as miss_queries:
+            self.assertEqual(self.get_catalog()['X-Catalog-Cache'], 'MISS')
+        self.assertTrue(miss_queries)
+        with self.assertNumQueries(0):
+            response = self.get_catalog()
+        self.assertEqual(response['X-Catalog-Cache'], 'HIT')
+        self.assertEqual(response.json()['total_products'], 1)
+
+        self.product.save()
+        with self.assertNumQueries(len(miss_queries)):
+            self.assertEqual(self.get_catalog()['X-Catalog-Cache'], 'MISS')
+
+    def test_save_and_delete_bump_the_version(self):
+        self.get_catalog()
+        version = get_catalog_version()
+
+        self.product.title = 'Rainy FL 90'
+        self.product.save()
+        self.assertGreater(get_catalog_version(), version)
+        response = self.get_catalog()
+        self.assertEqual(response['X-Catalog-Cache'], 'MISS')
+        self.assertEqual(response.json()['products'][0]['title'], 'Rainy FL 90')
+
+        version = get_catalog_version()
+        self.product.delete()
+        self.assertGreater(get_catalog_version(), version)
+        self.assertEqual(self.get_catalog().json()['products'], [])
+
+    def test_stats_count_hits_misses_and_rebuilds(self):
+        self.get_catalog()
+        self.get_catalog()
+        self.get_catalog()
+
+        self.client.force_login(User.objects.create_user('staff', password='x', is_staff=True))
+        stats = self.client.get('/api/products/cache-stats/').json()
+        self.assertEqual((stats['hits'], stats['misses'], stats['rebuilds']), (2, 1, 1))
+        self.assertGreater(stats['rebuild_time_us'], 0)
+        self.assertEqual(stats['version'], get_catalog_version())
+
+    def test_stats_are_staff_only(self):
+        self.assertEqual(self.client.get('/api/products/cache-stats/').status_code, 403)
+
+
+class CatalogConditionalRequestTests(TestCase):
+    """
+    products_list answers revalidations with 304 until the catalog changes.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.product = Product.objects.create(title='Rainy FL 80', price=Decimal('100'), description='-')
+        flow = SpecificationType.objects.create(name='Caudal', unit='L/min')
+        self.specification = ProductSpecification.objects.create(
+            product=self.product, specification_type=flow, value='80',
+        )
+        self.first = self.client.get('/api/products/')
+
+    def test_if_none_match_and_if_modified_since(self):
+        response = self.client.get('/api/products/', HTTP_IF_NONE_MATCH=self.first['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], self.first['ETag'])
+
+        response = self.client.get('/api/products/', HTTP_IF_MODIFIED_SINCE=self.first['Last-Modified'])
+        self.assertEqual(response.status_code, 304)
+
+        response = self.client.get('/api/products/', HTTP_IF_NONE_MATCH='W/"otro"')
+        self.assertEqual(response.status_code, 200)
+
+    def test_saves_change_the_etag(self):
+        self.product.price = Decimal('110')
+        self.product.save()
+        second = self.client.get('/api/products/', HTTP_IF_NONE_MATCH=self.first['ETag'])
+        self.assertEqual(second.status_code, 200)
+        self.assertNotEqual(second['ETag'], self.first['ETag'])
+
+        self.specification.value = '90'
+        self.specification.save()
+        third = self.client.get('/api/products/', HTTP_IF_NONE_MATCH=second['ETag'])
+        self.assertEqual(third.status_code, 200)
+        self.assertNotIn(third['ETag'], (self.first['ETag'], second['ETag']))
+
+    def test_vary_on_full_and_not_modified_responses(self):
+        not_modified = self.client.get('/api/products/', HTTP_IF_NONE_MATCH=self.first['ETag'])
+        for response in (self.first, not_modified):
+            vary = {header.strip() for header in response['Vary'].split(',')}
+            self.assertLessEqual({'Accept', 'Accept-Encoding'}, vary)
+        self.assertIn('no-cache', self.first['Cache-Control'])
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT, IMAGE_VARIANT_WIDTHS=(16,))
+class CatalogSnapshotTests(TestCase):
+    """
+    export_catalog_snapshot publishes the products API payload as static files.
+    """
+
+    def setUp(self):
+        cache.clear()
+        Product.objects.create(
+            title='Rainy FL 80', price=Decimal('100'), description='-',
+            main_image=SimpleUploadedFile('foto.png', make_image('olive')),
+        )
+
+    def test_published_snapshot_matches_the_api(self):
+        with tempfile.TemporaryDirectory() as directory:
+            call_command(
+                'export_catalog_snapshot', '--publish-dir', directory, '--base-url', 'http://testserver',
+                stdout=StringIO(),
+            )
+            with open(f'{directory}/current.json', 'rb') as current:
+                snapshot = current.read()
+            with gzip.open(f'{directory}/current.json.gz') as compressed:
+                snapshot_gz = compressed.read()
+
+        self.assertEqual(snapshot, snapshot_gz)
+        self.assertEqual(json.loads(snapshot), self.client.get('/api/products/').json())
+
+    def test_base_url_host_need_not_be_allowed(self):
+        with tempfile.TemporaryDirectory() as directory:
+            result = publish_catalog_snapshot(directory, base_url='https://cdn.example.com')
+            data = json.loads(result['path'].read_bytes())
+
+        self.assertTrue(data['products'][0]['main_image'].startswith('https://cdn.example.com/media/products/main_images/'))
+
+
+class FastJSONRendererTests(TestCase):
+    """
+    FastJSONRenderer writes the same bytes as DRF's JSONRenderer and negotiates compression.
+    """
+
+    def test_orjson_output_matches_stdlib_output(self):
+        data = {
+            'price': Decimal('1200.50'),
+            'updated_at': datetime.datetime(2025, 1, 2, 3, 4, 5, 678, tzinfo=datetime.timezone.utc),
+            'day': datetime.date(2025, 1, 2),
+            'title': 'Filtro «Rainy» \u2028 ñ',
+            'values': [1, 2.5, None, True],
+        }
+        rendered = FastJSONRenderer().render(data)
+        with mock.patch('website.renderers.fast_json_renderer.orjson', None):
+            self.assertEqual(rendered, FastJSONRenderer().render(data))
+        self.assertIn(b'"price":"1200.50"', rendered)
+        self.assertIn(b'\\u2028', rendered)
+
+    @override_settings(REST_FRAMEWORK={'COERCE_DECIMAL_TO_STRING': False})
+    def test_decimals_follow_coerce_decimal_to_string(self):
+        self.assertEqual(FastJSONRenderer().render({'price': Decimal('1.5')}), b'{"price":1.5}')
+
+    def test_accept_encoding_negotiation(self):
+        cache.clear()
+        for index in range(20):
+            Product.objects.create(title=f'Rainy {index}', price=Decimal('100'), description='Filtro de lluvia ' * 10)
+        body = self.client.get('/api/products/').content
+
+        response = self.client.get('/api/products/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), body)
+        for header in ('gzip;q=0', 'identity', ''):
+            with self.subTest(header=header):
+                response = self.client.get('/api/products/', HTTP_ACCEPT_ENCODING=header)
+                self.assertFalse(response.has_header('Content-Encoding'))
+                self.assertEqual(response.content, body)
+        self.assertEqual(self.client.get('/api/products/', HTTP_ACCEPT_ENCODING='*')['Content-Encoding'],
+                         'br' if brotli_compress(b'x') is not None else 'gzip')
+
+
+class CatalogPaginationTests(TestCase):
+    """
+    products_list pages through the catalog with opaque keyset cursors.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        flow = SpecificationType.objects.create(name='Caudal', unit='L/min')
+        for index in range(7):
+            # Repeated order values exercise the title / id tie-breakers
+            product = Product.objects.create(
+                title=f'Rainy {index % 3}', price=Decimal('100'), description='-', order=index % 2,
+                slug=f'rainy-{index}',
+            )
+            ProductSpecification.objects.create(product=product, specification_type=flow, value=str(index))
+        Product.objects.create(title='Oculto', price=Decimal('1'), description='-', is_active=False)
+
+    def setUp(self):
+        cache.clear()
+
+    def get_page(self, **params):
+        response = self.client.get('/api/products/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_cursor_round_trip_visits_every_product_once(self):
+        slugs, params = [], {'limit': 3}
+        while True:
+            page = self.get_page(**params)
+            slugs.extend(product['slug'] for product in page['products'])
+            if page['next_cursor'] is None:
+                break
+            params['cursor'] = page['next_cursor']
+
+        expected = list(Product.objects.filter(is_active=True).order_by('order', 'title', 'id').values_list('slug', flat=True))
+        self.assertEqual(slugs, expected)
+
+    def test_invalid_cursors_are_rejected(self):
+        def encode(value):
+            return base64.urlsafe_b64encode(json.dumps(value).encode()).decode()
+
+        for cursor in ('no-es-un-cursor', encode({'order': 1}), encode([1, 2, 3]), encode([0, 'x', 10 ** 30])):
+            with self.subTest(cursor=cursor):
+                response = self.client.get('/api/products/', {'cursor': cursor})
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('cursor', response.json())
+
+    def test_fields_and_expand_select_the_output(self):
+        page = self.get_page(fields='slug,price', limit=2)
+        self.assertEqual([set(product) for product in page['products']], [{'slug', 'price'}] * 2)
+        self.assertIsNotNone(page['next_cursor'])
+
+        page = self.get_page(fields='slug', expand='specifications', limit=1)
+        self.assertEqual(page['products'][0]['specifications'][0]['value'], '0')
+        self.assertNotIn('specifications', self.get_page(limit=1)['products'][0])
+
+        for params in ({'fields': 'slug,secreto'}, {'expand': 'precio'}, {'limit': '0'}, {'limit': 'diez'}):
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get('/api/products/', params).status_code, 400)
+
+    def test_include_total(self):
+        self.assertNotIn('total_products', self.get_page(limit=2))
+        self.assertEqual(self.get_page(limit=2, include_total='1')['total_products'], 7)
+        self.assertEqual(self.get_page(include_total='true', **{'spec[Caudal]__gte': '5'})['total_products'], 2)
+
+
+class ComparisonMatrixTests(TestCase):
+    """
+    products_compare returns specification rows by product columns.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        flow = SpecificationType.objects.create(name='Caudal', unit='L/min')
+        color = SpecificationType.objects.create(name='Color')
+        small = Product.objects.create(title='Rainy S', price=Decimal('1'), description='-', order=1)
+        large = Product.objects.create(title='Rainy L', price=Decimal('1'), description='-', order=2)
+        Product.objects.create(title='Rainy Sin Datos', price=Decimal('1'), description='-', order=3)
+        Product.objects.create(title='Rainy Oculto', price=Decimal('1'), description='-', is_active=False)
+        ProductSpecification.objects.create(product=small, specification_type=flow, value='80')
+        ProductSpecification.objects.create(product=small, specification_type=color, value='Gris')
+        ProductSpecification.objects.create(product=large, specification_type=flow, value='200')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_matrix_with_missing_cells(self):
+        response = self.client.get('/api/products/compare/')
+
+        self.assertEqual(response.status_code, 200)
+        matrix = response.json()
+        self.assertEqual([product['slug'] for product in matrix['products']], ['rainy-s', 'rainy-l', 'rainy-sin-datos'])
+        self.assertEqual(matrix['specifications'], [
+            {'name': 'Caudal', 'unit': 'L/min', 'values': ['80', '200', None]},
+            {'name': 'Color', 'unit': None, 'values': ['Gris', None, None]},
+        ])
+
+    def test_duplicate_slugs_are_compared_once_in_display_order(self):
+        matrix = self.client.get('/api/products/compare/', {'slugs': 'rainy-l, rainy-s,rainy-l'}).json()
+
+        self.assertEqual([product['slug'] for product in matrix['products']], ['rainy-s', 'rainy-l'])
+        self.assertEqual(matrix['specifications'][1]['values'], ['Gris', None])
+
+    def test_unknown_or_inactive_slugs_are_rejected(self):
+        for slugs in ('rainy-s,no-existe', 'rainy-oculto'):
+            with self.subTest(slugs=slugs):
+                response = self.client.get('/api/products/compare/', {'slugs': slugs})
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('slugs', response.json())
+
+    def test_invalid_slug_lists_are_rejected_before_building(self):
+        too_many = ','.join(f'rainy-{index}' for index in range(settings.COMPARE_MAX_PRODUCTS + 1))
+        with mock.patch('website.services.comparison_matrix.build_comparison_matrix') as build:
+            for slugs in ('rainy-s,no-existe', too_many):
+                with self.subTest(slugs=slugs):
+                    self.assertEqual(self.client.get('/api/products/compare/', {'slugs': slugs}).status_code, 400)
+        build.assert_not_called()
+
+
+class ProductDetailCacheTests(TestCase):
+    """
+    Each product detail is cached on its own and evicted only when that product changes.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.product = Product.objects.create(title='Rainy FL 80', price=Decimal('100'), description='-')
+        self.other = Product.objects.create(title='Rainy FL 120', price=Decimal('150'), description='-')
+
+    def get_detail(self, product):
+        return self.client.get(f'/api/products/{product.slug}/')
+
+    def test_hit_miss_and_per_product_invalidation(self):
+        self.assertEqual(self.get_detail(self.product)['X-Catalog-Cache'], 'MISS')
+        self.assertEqual(self.get_detail(self.other)['X-Catalog-Cache'], 'MISS')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get_detail(self.product)['X-Catalog-Cache'], 'HIT')
+
+        self.product.price = Decimal('120')
+        self.product.save()
+        response = self.get_detail(self.product)
+        self.assertEqual(response['X-Catalog-Cache'], 'MISS')
+        self.assertEqual(response.json()['price'], '120.00')
+        self.assertEqual(self.get_detail(self.other)['X-Catalog-Cache'], 'HIT')
+
+        self.product.delete()
+        self.assertEqual(self.get_detail(self.product).status_code, 404)
+
+    def test_save_while_building_does_not_cache_stale_entry(self):
+        build = product_view.build_product_data
+
+        def build_then_save(request, slug):
+            data = build(request, slug)
+            Product.objects.get(pk=self.product.pk).save()
+            return data
+
+        with mock.patch.object(product_view, 'build_product_data', side_effect=build_then_save):
+            self.get_detail(self.product)
+        self.assertEqual(self.get_detail(self.product)['X-Catalog-Cache'], 'MISS')
+
+    def test_route_slugs_are_reserved(self):
+        self.assertEqual(Product.objects.create(title='Compare', price=Decimal('1'), description='-').slug, 'compare-producto')
+        product = Product(title='Recomendar', slug='recommend', price=Decimal('1'), description='-')
+        with self.assertRaises(ValidationError):
+            product.full_clean()
+        with self.assertRaises(ValidationError):
+            product.save()
+
+
+class CatalogImportTests(TestCase):
+    """
+    import_catalog upserts products and specifications in bulk.
+    """
+
+    def write_csv(self, directory, price):
+        path = f'{directory}/catalog.csv'
+        with open(path, 'w', encoding='utf-8') as handle:
+            handle.write(
+                'title,price,description,order,spec:Caudal máximo [L/min],spec:Color\n'
+                f'Rainy X1,"{price}",Filtro,1,"1.200 L/min",Gris\n'
+            )
+        return path
+
+    def write_json(self, data):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = f'{directory}/catalog.json'
+        with open(path, 'w', encoding='utf-8') as handle:
+            json.dump(data, handle)
+        return path
+
+    def test_import_upserts_and_invalidates_catalog(self):
+        with tempfile.TemporaryDirectory() as directory:
+            call_command('import_catalog', self.write_csv(directory, '450.000'), stdout=StringIO())
+            version = get_catalog_version()
+            with self.captureOnCommitCallbacks(execute=True):
+                call_command('import_catalog', self.write_csv(directory, '500.000'), stdout=StringIO())
+
+        product = Product.objects.get(slug='rainy-x1')
+        self.assertEqual(product.price, Decimal('500000'))
+        flow = product.specifications.get(specification_type__name='Caudal máximo')
+        self.assertEqual(flow.numeric_value, Decimal('1200'))
+        self.assertEqual(flow.specification_type.unit, 'L/min')
+        self.assertEqual(ProductSpecification.objects.count(), 2)
+        self.assertEqual(product.specs_cache, [['Caudal máximo', 'L/min', '1.200 L/min'], ['Color', None, 'Gris']])
+        self.assertNotEqual(get_catalog_version(), version)
+
+    def test_invalid_rows_are_reported_with_their_row_number(self):
+        cases = {
+            'slug': {'title': 'Rainy X1', 'slug': 'foo bar', 'price': '10'},
+            'price': {'title': 'Rainy X1', 'price': '123456789012'},
+            'title': {'title': 'x' * 256, 'price': '10'},
+        }
+        for field, row in cases.items():
+            with self.subTest(field=field), self.assertRaisesRegex(CatalogImportError, f'^Row 2: {field} '):
+                read_catalog_file(self.write_json([{'title': 'Rainy X0', 'price': '1'}, row]))
+        self.assertFalse(Product.objects.exists())
+
+    def test_non_object_json_entries_are_rejected(self):
+        for data in (['Rainy X1'], [{'title': 'Rainy X1', 'price': '1', 'specifications': ['Gris']}], 5):
+            with self.subTest(data=data), self.assertRaises(CatalogImportError):
+                read_catalog_file(self.write_json(data))
+
+
+class SpecsCacheTests(TestCase):
+    """
+    Product.specs_cache follows every change to specifications and their types.
+    """
+
+    def setUp(self):
+        self.product = Product.objects.create(title='Rainy FL-80', price=Decimal('1'), description='-')
+        self.area = SpecificationType.objects.create(name='Área', unit='m²')
+        self.flow = SpecificationType.objects.create(name='Caudal', unit='L/min')
+
+    def specs_cache(self):
+        return Product.objects.get(pk=self.product.pk).specs_cache
+
+    def test_signals_keep_the_cache_current(self):
+        flow = ProductSpecification.objects.create(product=self.product, specification_type=self.flow, value='120 L/min')
+        ProductSpecification.objects.create(product=self.product, specification_type=self.area, value='120 m2')
+        self.assertEqual(self.specs_cache(), [['Área', 'm²', '120 m2'], ['Caudal', 'L/min', '120 L/min']])
+
+        self.flow.name = 'Caudal máximo'
+        self.flow.save()
+        flow.delete()
+        self.area.unit = 'm2'
+        self.area.save()
+        self.assertEqual(self.specs_cache(), [['Área', 'm2', '120 m2']])
+
+        # A stale instance saved later must not write its old copy back
+        self.product.price = Decimal('2')
+        self.product.save()
+        self.assertEqual(self.specs_cache(), [['Área', 'm2', '120 m2']])
+
+    def test_check_command_reports_and_fixes_drift(self):
+        ProductSpecification.objects.create(product=self.product, specification_type=self.area, value='80 m2')
+        Product.objects.filter(pk=self.product.pk).update(specs_cache=[])
+
+        with self.assertRaises(CommandError):
+            call_command('check_specs_cache', stdout=StringIO())
+        call_command('check_specs_cache', '--fix', stdout=StringIO())
+        self.assertEqual(self.specs_cache(), [['Área', 'm²', '80 m2']])
+        call_command('check_specs_cache', stdout=StringIO())
+
+
+class SyntheticCatalogTests(TestCase):
+    """
+    generate_synthetic_catalog is reproducible and can be cleared again.
+    """
+
+    def generate(self, *args):
+        call_command('generate_synthetic_catalog', '--products', '20', '--spec-types', '8', *args, stdout=StringIO())
+        return list(ProductSpecification.objects.order_by('product__slug', 'specification_type_id').values_list('value', flat=True))
+
+    def test_same_seed_gives_same_catalog(self):
+        values = self.generate()
+        self.assertEqual(len(values), 160)
+        self.assertEqual(self.generate('--clear'), values)
+        self.assertEqual(Product.objects.count(), 20)
+        self.assertTrue(ProductSpecification.objects.filter(numeric_value__isnull=False).exists())
+        self.assertEqual(find_stale_specs_caches(), [])
+
+        call_command('generate_synthetic_catalog', '--clear-only', stdout=StringIO())
+        self.assertFalse(Product.objects.exists())
+        self.assertFalse(ProductSpecification.objects.exists())
+        self.assertFalse(ProductSeriesComparisonImage.objects.exists())
+
+    def test_clear_keeps_other_products_and_their_specifications(self):
+        self.generate()
+        product = Product.objects.create(title='Rainy Real', price=Decimal('1'), description='-')
+        flow = SpecificationType.objects.get(name=settings.RECOMMENDER_SPEC_NAMES['flow'])
+        filler = SpecificationType.objects.filter(name__startswith='Especificación sintética').first()
+        ProductSpecification.objects.create(product=product, specification_type=flow, value='100 L/min')
+        ProductSpecification.objects.create(product=product, specification_type=filler, value='x')
+
+        self.assertEqual(clear_synthetic_catalog(), 20)
+        self.assertEqual(list(Product.objects.values_list('slug', flat=True)), ['rainy-real'])
+        self.assertEqual(list(product.specifications.values_list('value', flat=True)), ['100 L/min'])
+        self.assertEqual(find_stale_specs_caches(), [])
+
+    def test_clear_records_tombstones_once_per_row_without_per_row_signals(self):
+        self.generate()
+        comparison_images = ProductSeriesComparisonImage.objects.count()
+        with mock.patch('website.signals.record_tombstone') as record_tombstone:
+            with self.captureOnCommitCallbacks(execute=True):
+                clear_synthetic_catalog()
+        record_tombstone.assert_not_called()
+
+        tombstones = CatalogTombstone.objects.values_list('object_type', flat=True)
+        self.assertEqual(
+            (tombstones.filter(object_type=CatalogTombstone.PRODUCT).count(),
+             tombstones.filter(object_type=CatalogTombstone.COMPARISON_IMAGE).count()),
+            (20, comparison_images),
+        )
+
+        # Signals are back once the clear is done
+        product = Product.objects.create(title='Rainy Real', price=Decimal('1'), description='-')
+        product.delete()
+        self.assertEqual(CatalogTombstone.objects.count(), 20 + comparison_images + 1)
+
+    @override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+    def test_failed_generation_removes_its_placeholder_files(self):
+        folder = 'products/main_images/synthetic'
+        with mock.patch.object(ProductSpecification.objects, 'bulk_create', side_effect=RuntimeError('fallo')):
+            with self.assertRaises(RuntimeError):
+                generate_synthetic_catalog(products=3, spec_types=3, comparison_images=1, images=True)
+
+        self.assertFalse(Product.objects.exists())
+        self.assertEqual(default_storage.listdir(folder)[1], [])
+        self.assertEqual(default_storage.listdir('products/comparison_images/synthetic')[1], [])
+
+
+class CatalogQueryCountTests(TestCase):
+    """
+    The number of queries behind products_list must not grow with the catalog
+    (an N+1 in ProductSerializer or the nested specification serializer).
+    """
+
+    def count_queries(self, products, engine):
+        generate_synthetic_catalog(products=products, spec_types=6, comparison_images=2)
+        request = RequestFactory().get('/api/products/')
+        with CaptureQueriesContext(connection) as queries:
+            data = build_catalog_data(request, engine=engine)
+        self.assertEqual(data['total_products'], Product.objects.filter(is_active=True).count())
+        return len(queries)
+
+    def test_query_count_is_independent_of_catalog_size(self):
+        for engine in ('fast', 'drf'):
+            with self.subTest(engine=engine):
+                small = self.count_queries(3, engine)
+                clear_synthetic_catalog()
+                large = self.count_queries(40, engine)
+                clear_synthetic_catalog()
+                self.assertEqual(small, large)
+
+
+class CatalogSyncTests(TestCase):
+    """
+    Incremental sync returns what changed since a sync version, and its parameters are validated.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.fl80 = Product.objects.create(title='Rainy FL-80', price=Decimal('1'), description='-')
+        self.fl150 = Product.objects.create(title='Rainy FL-150', price=Decimal('2'), description='-')
+
+    def sync(self, version):
+        response = self.client.get('/api/products/', {'since_version': version})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def age(self, queryset, seconds):
+        queryset.update(updated_at=timezone.now() - datetime.timedelta(seconds=seconds))
+
+    def test_only_rows_changed_since_the_cursor_are_returned(self):
+        self.age(Product.objects.all(), 3600)
+        version = self.sync(0)['sync_version']
+
+        self.fl150.price = Decimal('3')
+        self.fl150.save()
+        data = self.sync(version)
+
+        self.assertFalse(data['full'])
+        self.assertEqual([product['slug'] for product in data['products']], ['rainy-fl-150'])
+        self.assertEqual(data['deleted_products'], [])
+        self.assertGreater(data['sync_version'], version)
+
+    def test_deleted_products_are_sent_as_tombstones(self):
+        self.age(Product.objects.all(), 3600)
+        version = self.sync(0)['sync_version']
+        deleted_id = self.fl80.pk
+
+        self.fl80.delete()
+        data = self.sync(version)
+
+        self.assertEqual(data['products'], [])
+        self.assertEqual(data['deleted_products'], [deleted_id])
+
+    def test_deactivated_products_are_reported_as_removed(self):
+        self.age(Product.objects.all(), 3600)
+        version = self.sync(0)['sync_version']
+
+        self.fl150.is_active = False
+        self.fl150.save()
+        data = self.sync(version)
+
+        self.assertEqual(data['products'], [])
+        self.assertEqual(data['deleted_products'], [self.fl150.pk])
+
+    def test_rows_committed_late_inside_the_overlap_window_are_not_missed(self):
+        self.age(Product.objects.all(), 3600)
+        version = self.sync(0)['sync_version']
+        # A transaction that stamped its row just before the sync point but committed after it
+        Product.objects.filter(pk=self.fl80.pk).update(
+            updated_at=from_sync_version(version) - datetime.timedelta(seconds=settings.CATALOG_SYNC_OVERLAP_SECONDS / 2)
+        )
+
+        data = self.sync(version)
+        self.assertEqual([product['slug'] for product in data['products']], ['rainy-fl-80'])
+
+    def test_cursor_older_than_the_tombstone_retention_forces_a_full_sync(self):
+        self.age(Product.objects.all(), 3600)
+        too_old = timezone.now() - datetime.timedelta(days=settings.CATALOG_TOMBSTONE_RETENTION_DAYS + 1)
+
+        data = self.sync(to_sync_version(too_old))
+
+        self.assertTrue(data['full'])
+        self.assertEqual(len(data['products']), 2)
+        self.assertEqual(data['deleted_products'], [])
+
+    def test_invalid_sync_points_are_rejected(self):
+        for params in ({'updated_since': 'ayer'}, {'updated_since': '2024-02-30T00:00:00'}, {'since_version': 'x'}):
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get('/api/products/', params).status_code, 400)
+        self.assertEqual(self.client.get('/api/products/', {'updated_since': '2024-02-28T00:00:00'}).status_code, 200)
+
+
+@override_settings(REQUEST_TIMING_SAMPLE_RATE=1.0)
+class RequestTimingMiddlewareTests(TestCase):
+    """
+    Sampled requests get a Server-Timing breakdown and a JSON log line.
+    """
+
+    def setUp(self):
+        cache.clear()
+
+    def test_server_timing_header_reports_database_and_phases(self):
+        self.client.force_login(User.objects.create_user('staff', password='x', is_staff=True))
+        response = self.client.get('/api/products/')
+
+        server_timing = response['Server-Timing']
+        self.assertRegex(server_timing, r'^db;dur=[\d.]+;desc="\d+ queries"')
+        for phase in ('serialize', 'render', 'view', 'total'):
+            self.assertIn(f'{phase};dur=', server_timing)
+
+    @override_settings(REQUEST_TIMING_SLOW_MS=0)
+    def test_slow_request_logs_its_queries(self):
+        with self.assertLogs('website.request_timing', 'WARNING') as logs:
+            self.client.get('/api/products/')
+
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record['path'], '/api/products/')
+        self.assertEqual(len(record['queries']), record['db_queries'])
+
+    def test_server_timing_is_staff_only_by_default(self):
+        self.assertNotIn('Server-Timing', self.client.get('/api/products/'))
+        self.client.force_login(User.objects.create_user('cliente', password='x'))
+        self.assertNotIn('Server-Timing', self.client.get('/api/products/'))
+
+        with override_settings(REQUEST_TIMING_SERVER_TIMING=True):
+            self.assertIn('Server-Timing', self.client.get('/api/products/'))
+        with override_settings(REQUEST_TIMING_SERVER_TIMING='staff', DEBUG=True):
+            self.assertIn('Server-Timing', self.client.get('/api/products/'))
+
+    @override_settings(REQUEST_TIMING_SAMPLE_RATE=0, REQUEST_TIMING_SERVER_TIMING=True)
+    def test_unsampled_request_has_no_header(self):
+        self.assertNotIn('Server-Timing', self.client.get('/api/products/'))
+
+    @override_settings(REQUEST_TIMING_SAMPLE_RATE=0, REQUEST_TIMING_SLOW_MS=0)
+    def test_unsampled_slow_request_logs_its_queries(self):
+        with self.assertLogs('website.request_timing', 'WARNING') as logs:
+            self.client.get('/api/products/')
+
+        record = json.loads(logs.records[0].getMessage())
+        self.assertFalse(record['sampled'])
+        self.assertGreater(record['db_queries'], 0)
+        self.assertEqual(len(record['queries']), record['db_queries'])
+        self.assertNotIn('serialize_ms', record)
@@ -0,0 +1 @@
+# Throttles package for website app
\ No newline at end of file
@@ -0,0 +1,75 @@
+import hashlib
+import time
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.throttling import BaseThrottle
+from website.services.contact_guard import incr_contact_stat, is_duplicate_submission
+
+THROTTLE_BUCKET_KEY = 'website:throttle:{scope}:{ident}'
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Token bucket kept in the shared cache. Each client identity may burst up
+    to `capacity` requests, and tokens refill evenly over `period` seconds as
+    configured in CONTACT_THROTTLE_RATES[scope]. Concurrent requests from the
+    same identity may occasionally both take the last token; the cache is not
+    locked, which is acceptable for abuse protection.
+    A resubmit of an already accepted submission takes no token: the view
+    acknowledges it without storing anything.
+    """
+    scope = None
+
+    def get_bucket_ident(self, request):
+        raise NotImplementedError('.get_bucket_ident() must be overridden')
+
+    def allow_request(self, request, view):
+        ident = self.get_bucket_ident(request)
+        if not ident or is_duplicate_submission(request.data):
+            return True
+
+        capacity, period = settings.CONTACT_THROTTLE_RATES[self.scope]
+        refill_rate = capacity / period
+        key = THROTTLE_BUCKET_KEY.format(
+            scope=self.scope,
+            ident=hashlib.sha256(ident.encode()).hexdigest(),
+        )
+        now = time.time()
+        tokens, updated = cache.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated) * refill_rate)
+
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+            self.wait_seconds = None
+        else:
+            self.wait_seconds = (1 - tokens) / refill_rate
+            incr_contact_stat(f'rejected_{self.scope}')
+        # An untouched bucket is full again after one period, so let it expire
+        cache.set(key, (tokens, now), timeout=period)
+        return allowed
+
+    def wait(self):
+        return getattr(self, 'wait_seconds', None)
+
+
+class ContactIPThrottle(TokenBucketThrottle):
+    """
+    Limits contact submissions per client IP address.
+    """
+    scope = 'ip'
+
+    def get_bucket_ident(self, request):
+        return self.get_ident(request)
+
+
+class ContactEmailThrottle(TokenBucketThrottle):
+    """
+    Limits contact submissions per submitted e-mail address.
+    """
+    scope = 'email'
+
+    def get_bucket_ident(self, request):
+        if not isinstance(request.data, dict):
+            return None
+        return str(request.data.get('email') or '').strip().lower()
@@ -1,8 +1,20 @@
 from django.urls import path
-from website.views.contact_view import new_contact
-from website.views.product_view import products_list
+from website.views.contact_view import contact_export, contact_stats, new_contact
+from website.views.product_view import (
+    catalog_cache_stats,
+    product_detail,
+    products_compare,
+    products_list,
+    products_recommend,
+)
 
 urlpatterns = [
     path('contact/', new_contact, name='new_contact'),
+    path('contact/export/', contact_export, name='contact_export'),
+    path('contact/stats/', contact_stats, name='contact_stats'),
     path('products/', products_list, name='products_list'),
-] 
\ No newline at end of file
+    path('products/cache-stats/', catalog_cache_stats, name='catalog_cache_stats'),
+    path('products/compare/', products_compare, name='products_compare'),
+    path('products/recommend/', products_recommend, name='products_recommend'),
+    path('products/<slug:slug>/', product_detail, name='product_detail'),
+] 
@@ -1,46 +1,85 @@
 from rest_framework.response import Response
 from rest_framework import status
-from website.models.contact_model import Contact
+from website.models.contact_notification_model import ContactNotification
 from website.serializers.contact_serializer import ContactSerializer
-from rest_framework.decorators import api_view
-from django.core.mail import send_mail
-from django.conf import settings
+from website.services.contact_notifications import get_notification_backlog
+from website.services.contact_export import (
+    CONTACT_EXPORT_FORMATS,
+    get_export_queryset,
+    iter_contact_export,
+    parse_export_bound,
+)
+from website.services.contact_guard import (
+    get_contact_stats,
+    incr_contact_stat,
+    is_duplicate_submission,
+    remember_submission,
+)
+from website.throttles.contact_throttles import ContactEmailThrottle, ContactIPThrottle
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
+from rest_framework.permissions import IsAdminUser
+from django.db import transaction
+from django.http import StreamingHttpResponse
 
 @api_view(['POST'])
+@throttle_classes([ContactIPThrottle, ContactEmailThrottle])
 def new_contact(request):
     """
     API view to create a new Contact message.
+    The notification e-mail is queued in the outbox in the same transaction
+    and sent by the send_contact_notifications worker, so the request never
+    waits for SMTP.
+    Submissions are rate limited per IP and per e-mail (429 with Retry-After),
+    and a resubmit of the same e-mail and message is acknowledged without
+    being validated, stored or counted against the limits again.
     """
+    if is_duplicate_submission(request.data):
+        incr_contact_stat('duplicates')
+        return Response({'detail': 'Duplicate submission ignored.'}, status=status.HTTP_200_OK)
+
     serializer = ContactSerializer(data=request.data, context={'request': request})
     if serializer.is_valid():
-        contact = serializer.save()
-        
-        # Enviar correo electrónico de notificación
-        subject = 'Nuevo Contacto de Rainy.com.co'
-        
-        # Crear el mensaje del correo
-        message = f"""
-        Se ha recibido un nuevo mensaje de contacto desde rainy.com.co:
-
-        Nombre: {contact.name}
-        Teléfono: {contact.phone or 'No proporcionado'}
-        Email: {contact.email}
-        Mensaje: {contact.message}
-        
-        Fecha de recepción: {contact.created_at.strftime('%Y-%m-%d %H:%M:%S')}
-        """
-        
-        try:
-            send_mail(
-                subject,
-                message,
-                settings.DEFAULT_FROM_EMAIL,
-                [settings.CONTACT_EMAIL_RECIPIENT],
-                fail_silently=False,
-            )
-        except Exception as e:
-            # Si hay error en el envío del correo, log del error pero no falla la creación del contacto
-            print(f"Error enviando correo: {e}")
+        with transaction.atomic():
+            contact = serializer.save()
+            ContactNotification.objects.create(contact=contact)
+        remember_submission(request.data)
+        incr_contact_stat('accepted')
         
         return Response(serializer.data, status=status.HTTP_201_CREATED)
-    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST) 
\ No newline at end of file
+    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def contact_stats(request):
+    """
+    API view exposing the accepted / duplicate / throttled counters of the contact endpoint
+    and the notification outbox backlog (staff only).
+    """
+    stats = get_contact_stats()
+    stats['notifications'] = get_notification_backlog()
+    return Response(stats, status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def contact_export(request):
+    """
+    API view streaming contact submissions, oldest first (staff only).
+    Query parameters: type=csv|jsonl (default csv), and since / until as
+    ISO 8601 dates or datetimes. Rows are read in chunks, so memory use does
+    not depend on the size of the table.
+    """
+    export_format = request.query_params.get('type', 'csv')
+    if export_format not in CONTACT_EXPORT_FORMATS:
+        return Response({'type': [f'Must be one of: {", ".join(CONTACT_EXPORT_FORMATS)}.']}, status=status.HTTP_400_BAD_REQUEST)
+    since = parse_export_bound('since', request.query_params.get('since'))
+    until = parse_export_bound('until', request.query_params.get('until'))
+
+    content_type = 'text/csv; charset=utf-8' if export_format == 'csv' else 'application/x-ndjson; charset=utf-8'
+    response = StreamingHttpResponse(
+        iter_contact_export(get_export_queryset(since, until), export_format),
+        content_type=content_type,
+    )
+    response['Content-Disposition'] = f'attachment; filename="contacts.{export_format}"'
+    return response
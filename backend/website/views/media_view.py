@@ -0,0 +1,171 @@
+import hashlib
+import mimetypes
+import posixpath
+import re
+import stat
+from pathlib import Path
+from urllib.parse import quote
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+from django.views.decorators.http import require_safe
+from website.storages.content_addressed_storage import is_content_addressed
+
+# Single byte range: bytes=<first>-<last>, bytes=<first>- or bytes=-<suffix length>
+BYTE_RANGE = re.compile(r'^bytes=(\d*)-(\d*)$')
+# Values of MEDIA_SENDFILE and the header handed to the front server
+SENDFILE_HEADERS = {'x-sendfile': 'X-Sendfile', 'x-accel-redirect': 'X-Accel-Redirect'}
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+class _FileRange:
+    """
+    File-like view of the next `length` bytes of an open file. It has no
+    fileno() on purpose: a sendfile-based wsgi.file_wrapper (gunicorn) would
+    send the file up to its end instead of stopping after the range, so
+    partial bodies are always copied through read().
+    """
+
+    def __init__(self, file, length):
+        self.file = file
+        self.name = file.name
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def parse_byte_range(header, size):
+    """
+    Return the inclusive (first, last) byte positions requested by a Range
+    header, or None when the response should ignore it (no header, several
+    ranges, other units or invalid syntax). Raises RangeNotSatisfiable when the
+    range lies outside the file.
+    """
+    match = BYTE_RANGE.match(header.replace(' ', ''))
+    if not match or match.group(1) == match.group(2) == '':
+        return None
+    first, last = match.groups()
+    if first == '':
+        suffix = int(last)
+        if suffix == 0 or size == 0:
+            raise RangeNotSatisfiable
+        return max(0, size - suffix), size - 1
+    first = int(first)
+    if last != '' and int(last) < first:
+        return None
+    if first >= size:
+        raise RangeNotSatisfiable
+    return first, size - 1 if last == '' else min(int(last), size - 1)
+
+
+def media_etag(name, file_stat):
+    """
+    Strong ETag of a media file. Content-addressed names already carry the
+    content hash; other (legacy) files get a validator derived from their
+    name, modification time and size, so no request has to read a whole file.
+    """
+    if is_content_addressed(name):
+        return '"%s"' % posixpath.basename(name).split('.')[0]
+    fingerprint = f'{name}:{file_stat.st_mtime_ns}:{file_stat.st_size}'
+    return '"%s"' % hashlib.md5(fingerprint.encode(), usedforsecurity=False).hexdigest()
+
+
+def _if_range_passes(request, etag, last_modified):
+    """
+    Whether a Range request may be answered with a partial response
+    (If-Range absent, or naming the current strong ETag or modification date).
+    """
+    if_range = request.META.get('HTTP_IF_RANGE', '').strip()
+    if not if_range:
+        return True
+    if if_range.startswith('"'):
+        return if_range == etag
+    return parse_http_date_safe(if_range) == last_modified
+
+
+@require_safe
+def serve_media(request, path):
+    """
+    Serve a file from MEDIA_ROOT with a strong ETag, Last-Modified and
+    Cache-Control (MEDIA_IMMUTABLE_CACHE_CONTROL for content-addressed names,
+    MEDIA_CACHE_CONTROL otherwise). If-None-Match / If-Modified-Since are
+    answered with 304 and If-Match / If-Unmodified-Since with 412 without
+    opening the file. The bytes themselves are handed to the front server
+    when MEDIA_SENDFILE is 'x-sendfile' (Apache, lighttpd) or
+    'x-accel-redirect' (nginx, internal location MEDIA_ACCEL_REDIRECT_LOCATION),
+    which then also handles Range requests. Otherwise a FileResponse is
+    returned, which WSGI servers with a sendfile-capable file_wrapper send
+    without copying, and a single byte Range is answered with 206 (copied
+    through Python, see _FileRange).
+    """
+    name = posixpath.normpath(path).lstrip('/')
+    full_path = Path(safe_join(settings.MEDIA_ROOT, name))
+    try:
+        file_stat = full_path.stat()
+    except (FileNotFoundError, NotADirectoryError):
+        raise Http404('Media file not found')
+    if not stat.S_ISREG(file_stat.st_mode):
+        raise Http404('Media file not found')
+
+    etag = media_etag(name, file_stat)
+    last_modified = int(file_stat.st_mtime)
+    headers = {
+        'ETag': etag,
+        'Last-Modified': http_date(last_modified),
+        'Cache-Control': (
+            settings.MEDIA_IMMUTABLE_CACHE_CONTROL if is_content_addressed(name) else settings.MEDIA_CACHE_CONTROL
+        ),
+        'Accept-Ranges': 'bytes',
+    }
+    conditional = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if conditional is not None:
+        for header, value in headers.items():
+            conditional[header] = value
+        return conditional
+
+    content_type, encoding = mimetypes.guess_type(name)
+    content_type = content_type if content_type and not encoding else 'application/octet-stream'
+
+    sendfile = settings.MEDIA_SENDFILE
+    if sendfile:
+        response = HttpResponse(content_type=content_type, headers=headers)
+        if sendfile == 'x-accel-redirect':
+            response[SENDFILE_HEADERS[sendfile]] = settings.MEDIA_ACCEL_REDIRECT_LOCATION + quote(name)
+        else:
+            response[SENDFILE_HEADERS[sendfile]] = str(full_path)
+        return response
+
+    size = file_stat.st_size
+    byte_range = None
+    range_header = request.META.get('HTTP_RANGE')
+    if range_header and _if_range_passes(request, etag, last_modified):
+        try:
+            byte_range = parse_byte_range(range_header, size)
+        except RangeNotSatisfiable:
+            response = HttpResponse(status=416, headers=headers)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+
+    handle = full_path.open('rb')
+    if byte_range is None:
+        return FileResponse(handle, content_type=content_type, headers=headers)
+
+    first, last = byte_range
+    handle.seek(first)
+    response = FileResponse(_FileRange(handle, last - first + 1), status=206, content_type=content_type, headers=headers)
+    response['Content-Length'] = last - first + 1
+    response['Content-Range'] = f'bytes {first}-{last}/{size}'
+    return response
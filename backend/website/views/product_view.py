@@ -1,33 +1,331 @@
+import hashlib
+import math
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.dateparse import parse_datetime
+from django.utils.http import http_date
 from website.models.product_model import Product
 from website.models.product_series_comparison_image_model import ProductSeriesComparisonImage
+from website.renderers.fast_json_renderer import FastJSONRenderer
 from website.serializers.product_serializer import ProductSerializer
 from website.serializers.product_series_comparison_image_serializer import ProductSeriesComparisonImageSerializer
+from website.serializers.catalog_fast_serializer import serialize_comparison_images, serialize_products
+from website.services.catalog_cache import (
+    get_cached_catalog,
+    get_cached_product,
+    get_catalog_cache_stats,
+    get_catalog_version,
+    get_or_build_versioned,
+    get_product_version,
+    incr_catalog_stat,
+    set_cached_catalog,
+    set_cached_product,
+    track_catalog_rebuild,
+)
+from website.services.catalog_filters import apply_spec_filters, has_spec_filters
+from website.services.catalog_pagination import (
+    PAGINATION_PARAMS,
+    PRODUCT_KEYSET,
+    after_cursor,
+    encode_cursor,
+    parse_page_size,
+    parse_product_fields,
+)
+from website.services.comparison_matrix import get_comparison_matrix
+from website.services.recommender import recommend_products
+from website.services.request_timing import timed
+from website.services.spec_values import parse_number
+from website.services.catalog_sync import SYNC_PARAMS, build_catalog_delta, parse_sync_point
+from website.services.catalog_validators import get_catalog_validators
 
-@api_view(['GET'])
-def products_list(request):
+
+def build_catalog_data(request, engine=None):
     """
-    API view to retrieve all products with their specifications and comparison images.
-    Returns a complete overview of all available product information.
+    Build the full catalog payload returned by products_list.
+    `engine` is 'fast' (plain dicts from values() rows) or 'drf' (model
+    serializers); both produce identical output. Defaults to CATALOG_SERIALIZER_ENGINE.
     """
+    engine = engine or settings.CATALOG_SERIALIZER_ENGINE
+
     # Get all active products ordered by their display order
-    products = Product.objects.filter(is_active=True).prefetch_related('specifications__specification_type')
-    
+    products = Product.objects.filter(is_active=True)
+
     # Get all active comparison images
     comparison_images = ProductSeriesComparisonImage.objects.filter(is_active=True)
-    
+
     # Serialize the data
-    products_serializer = ProductSerializer(products, many=True, context={'request': request})
-    comparison_images_serializer = ProductSeriesComparisonImageSerializer(comparison_images, many=True, context={'request': request})
-    
-    # Prepare the response data
+    with timed('serialize'):
+        if engine == 'fast':
+            products_data = serialize_products(products, request)
+            comparison_images_data = serialize_comparison_images(comparison_images, request)
+        else:
+            products = products.prefetch_related('specifications__specification_type')
+            products_data = ProductSerializer(products, many=True, context={'request': request}).data
+            comparison_images_data = ProductSeriesComparisonImageSerializer(comparison_images, many=True, context={'request': request}).data
+
+    # The querysets are already evaluated, so count the serialized rows
+    # instead of issuing two extra COUNT queries
+    return {
+        'products': products_data,
+        'comparison_images': comparison_images_data,
+        'total_products': len(products_data),
+        'total_comparison_images': len(comparison_images_data)
+    }
+
+
+def build_product_data(request, slug, engine=None):
+    """
+    Build the detail representation of one active product, or return None.
+    Same shape as the entries of products_list.
+    """
+    engine = engine or settings.CATALOG_SERIALIZER_ENGINE
+    products = Product.objects.filter(is_active=True, slug=slug)
+    with timed('serialize'):
+        if engine == 'fast':
+            data = serialize_products(products, request)
+            return data[0] if data else None
+        product = products.prefetch_related('specifications__specification_type').first()
+        return ProductSerializer(product, context={'request': request}).data if product else None
+
+
+def _set_validator_headers(response, etag, last_modified):
+    """
+    Attach the catalog validators and force clients to revalidate before reuse.
+    """
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    patch_cache_control(response, no_cache=True)
+    return response
+
+
+def _not_modified_response(request, etag, last_modified):
+    """
+    Return a 304 response when the client's copy is still current, otherwise None.
+    """
+    response = get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=int(last_modified.timestamp()) if last_modified is not None else None,
+    )
+    if response is not None:
+        _set_validator_headers(response, etag, last_modified)
+        # A 304 carries the Vary of the 200 it stands for
+        patch_vary_headers(response, ['Accept-Encoding'])
+    return response
+
+
+def _catalog_response(request, entry):
+    """
+    Serve the precompressed catalog body when the JSON renderer was negotiated,
+    so cache hits skip rendering and compression entirely.
+    """
+    renderer = request.accepted_renderer
+    if isinstance(renderer, FastJSONRenderer) and renderer.get_indent(request.accepted_media_type, {}) is None:
+        content, encoding = entry['payload'].for_request(request)
+        response = HttpResponse(content, content_type=renderer.media_type, status=status.HTTP_200_OK)
+        if encoding:
+            response['Content-Encoding'] = encoding
+        patch_vary_headers(response, ['Accept-Encoding'])
+        return response
+    # Browsable API or indented JSON
+    return Response(entry['data'], status=status.HTTP_200_OK)
+
+
+def products_page(request):
+    """
+    Return one keyset-paginated page of active products with the requested fields.
+    Query parameters: cursor, limit, fields (comma separated), expand=specifications,
+    include_total=1 for the (cached) number of active products, and numeric
+    specification filters such as spec[Caudal máximo]__gte=200.
+    """
+    params = request.query_params
+    limit = parse_page_size(params.get('limit'))
+    fields = parse_product_fields(params.get('fields'), params.get('expand'))
+
+    products = apply_spec_filters(Product.objects.filter(is_active=True), params).order_by(*PRODUCT_KEYSET)
+    if params.get('cursor'):
+        products = after_cursor(products, params['cursor'])
+
+    # The keyset columns are always read so the next cursor can be built
+    keyset_extra = [field for field in PRODUCT_KEYSET if field not in fields]
+    with timed('serialize'):
+        page = serialize_products(products[:limit + 1], request, fields=fields + tuple(keyset_extra))
+    has_next = len(page) > limit
+    page = page[:limit]
+    next_cursor = encode_cursor(page[-1]) if has_next else None
+    for product in page:
+        for field in keyset_extra:
+            del product[field]
+
     response_data = {
-        'products': products_serializer.data,
-        'comparison_images': comparison_images_serializer.data,
-        'total_products': products.count(),
-        'total_comparison_images': comparison_images.count()
+        'products': page,
+        'next_cursor': next_cursor,
     }
-    
-    return Response(response_data, status=status.HTTP_200_OK) 
\ No newline at end of file
+    if params.get('include_total') in ('1', 'true'):
+        if has_spec_filters(params):
+            response_data['total_products'] = apply_spec_filters(Product.objects.filter(is_active=True), params).count()
+        else:
+            response_data['total_products'] = get_or_build_versioned(
+                'total_products', Product.objects.filter(is_active=True).count
+            )
+    return Response(response_data, status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+def products_list(request):
+    """
+    API view to retrieve all products with their specifications and comparison images.
+    Returns a complete overview of all available product information.
+    The payload is cached per catalog version, so a cache hit does no database
+    or serializer work. Conditional requests (If-None-Match / If-Modified-Since)
+    are answered with 304 before anything is serialized.
+    Any of the pagination parameters (cursor, limit, fields, expand,
+    include_total) or a spec[...] filter switches to a keyset-paginated page
+    instead (see products_page),
+    and updated_since / since_version return only the changes since a previous sync.
+    """
+    if any(param in request.query_params for param in SYNC_PARAMS):
+        since = parse_sync_point(request.query_params)
+        with timed('serialize'):
+            data = build_catalog_delta(request, since)
+        return Response(data, status=status.HTTP_200_OK)
+    if any(param in request.query_params for param in PAGINATION_PARAMS) or has_spec_filters(request.query_params):
+        return products_page(request)
+
+    version = get_catalog_version()
+    # Image URLs are absolute, so entries are kept apart per scheme and host
+    base_url = request.build_absolute_uri('/')
+
+    entry = get_cached_catalog(version, base_url)
+    if entry is not None:
+        incr_catalog_stat('hits')
+        cache_status = 'HIT'
+        etag, last_modified = entry['etag'], entry['last_modified']
+        not_modified = _not_modified_response(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+    else:
+        # A single aggregate query decides whether the client copy is current
+        etag, last_modified = get_catalog_validators(base_url)
+        not_modified = _not_modified_response(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        with track_catalog_rebuild():
+            data = build_catalog_data(request)
+            entry = {
+                'data': data,
+                # Rendered and compressed once per catalog version
+                'payload': FastJSONRenderer().precompress(data),
+                'etag': etag,
+                'last_modified': last_modified,
+            }
+            set_cached_catalog(version, base_url, entry)
+        cache_status = 'MISS'
+
+    response = _catalog_response(request, entry)
+    response['X-Catalog-Cache'] = cache_status
+    return _set_validator_headers(response, etag, last_modified)
+
+
+@api_view(['GET'])
+def product_detail(request, slug):
+    """
+    API view to retrieve a single active product by its slug.
+    Each product has its own cache entry, evicted only when that product or
+    its specifications change.
+    """
+    base_url = request.build_absolute_uri('/')
+
+    entry = get_cached_product(slug, base_url)
+    if entry is not None:
+        incr_catalog_stat('product_hits')
+        cache_status = 'HIT'
+    else:
+        incr_catalog_stat('product_misses')
+        product_id = Product.objects.filter(is_active=True, slug=slug).values_list('pk', flat=True).first()
+        if product_id is None:
+            return Response({'detail': 'Product not found.'}, status=status.HTTP_404_NOT_FOUND)
+        # Read before building, like get_or_build_versioned
+        version = get_product_version(product_id)
+        data = build_product_data(request, slug)
+        if data is None:
+            return Response({'detail': 'Product not found.'}, status=status.HTTP_404_NOT_FOUND)
+        fingerprint = f"{base_url}|{data['id']}|{data['updated_at']}"
+        entry = {
+            'data': data,
+            'payload': FastJSONRenderer().precompress(data),
+            'etag': 'W/"%s"' % hashlib.md5(fingerprint.encode(), usedforsecurity=False).hexdigest(),
+            'last_modified': parse_datetime(data['updated_at']),
+        }
+        set_cached_product(slug, base_url, entry, version)
+        cache_status = 'MISS'
+
+    not_modified = _not_modified_response(request, entry['etag'], entry['last_modified'])
+    if not_modified is not None:
+        return not_modified
+
+    response = _catalog_response(request, entry)
+    response['X-Catalog-Cache'] = cache_status
+    return _set_validator_headers(response, entry['etag'], entry['last_modified'])
+
+
+@api_view(['GET'])
+def products_compare(request):
+    """
+    API view returning the comparison table as a matrix of specification rows
+    by product columns. ?slugs=a,b limits it to those products (400 when one
+    of them is not an active product or there are more than COMPARE_MAX_PRODUCTS).
+    """
+    slugs = request.query_params.get('slugs')
+    if slugs is not None:
+        slugs = [slug.strip() for slug in slugs.split(',') if slug.strip()]
+    return Response(get_comparison_matrix(slugs), status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+def products_recommend(request):
+    """
+    API view ranking products by how well they fit a roof:
+    ?area=<m²>&intensity=<mm/h>&limit=<n>. Served from an in-memory capacity
+    index rebuilt only when the catalog version changes.
+    """
+    errors = {}
+    values = {}
+    for name, required in (('area', True), ('intensity', False)):
+        raw_value = request.query_params.get(name)
+        if raw_value is None:
+            if required:
+                errors[name] = ['This parameter is required.']
+            continue
+        number = parse_number(raw_value.strip())
+        # parse_number rejects NaN / Infinity; a huge literal still overflows float()
+        if number is None or number <= 0 or not math.isfinite(float(number)):
+            errors[name] = ['A positive number is required.']
+        else:
+            values[name] = float(number)
+    limit = request.query_params.get('limit')
+    if limit is not None:
+        try:
+            values['limit'] = max(1, min(int(limit), settings.RECOMMENDER_MAX_RESULTS))
+        except ValueError:
+            errors['limit'] = ['A valid integer is required.']
+    if errors:
+        return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response(recommend_products(request, **values), status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def catalog_cache_stats(request):
+    """
+    API view exposing the catalog cache counters (staff only).
+    """
+    return Response(get_catalog_cache_stats(), status=status.HTTP_200_OK)